@@ -1,6 +1,29 @@
 """
 KALDRA-ALPHA v0.6 — módulo kindra_drift
 
-Stub inicial. A lógica será implementada na fase seguinte.
+Monitor de drift cultural/arquetípico online do kernel financeiro-narrativo: estatísticas
+incrementais de Δ12 por locale e por plano (comunicados e notícias de mercado), com PSI/KL por
+janela contra uma referência e callbacks para alertas.
+
+Adaptador fino sobre o motor compartilhado (`kernel/core/src/kindra_drift.py`).
 """
-# TODO: implementar kindra_drift para o kernel financeiro-narrativo.
+
+from __future__ import annotations
+
+from typing import Optional
+
+from ...core.src.kindra_drift import DriftMonitor, DriftReference
+
+WINDOW_SIZE = 1000
+PSI_THRESHOLD = 0.2
+KL_THRESHOLD = 0.1
+
+
+def new_drift_monitor(reference: Optional[DriftReference] = None) -> DriftMonitor:
+    """Monitor com os limiares do kernel; alimente-o com `observe(delta12, labels, locales, plans)`."""
+    return DriftMonitor(
+        window_size=WINDOW_SIZE,
+        psi_threshold=PSI_THRESHOLD,
+        kl_threshold=KL_THRESHOLD,
+        reference=reference,
+    )
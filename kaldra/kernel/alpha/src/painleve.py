@@ -1,6 +1,28 @@
 """
 KALDRA-ALPHA v0.6 — módulo painleve
 
-Stub inicial. A lógica será implementada na fase seguinte.
+Sinal `painleve_curvature` do kernel financeiro-narrativo (estabilização
+narrativa e dissipação de ruído): posição do comunicado no perfil da
+solução de Hastings–McLeod de Painlevé II.
+
+Adaptador fino sobre o motor compartilhado (`kernel/core/src/painleve.py`),
+que interpola uma grade pré-calculada em vez de resolver a EDO.
 """
-# TODO: implementar painleve para o kernel financeiro-narrativo.
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from ...core.src.painleve import PainleveState, painleve_batch
+
+
+def painleve_state(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> PainleveState:
+    """Posição s, q, q', q'' e curvatura de um lote Δ12 (N, 12)."""
+    return painleve_batch(delta12, coupling=coupling)
+
+
+def curvature_signal(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> np.ndarray:
+    """Apenas o sinal `painleve_curvature` (N,), em [0, 1]."""
+    return painleve_state(delta12, coupling).curvature
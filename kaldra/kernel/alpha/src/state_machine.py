@@ -1,6 +1,44 @@
 """
 KALDRA-ALPHA v0.6 — módulo state_machine
 
-Stub inicial. A lógica será implementada na fase seguinte.
+Executive State Machine do kernel financeiro-narrativo: o estado de cada
+ticker evolui via 3 → 6 → 9 a cada comunicado analisado.
+
+- 3 (entropia narrativa): o discurso acalma e a empresa volta a crescer;
+- 6 (modulação): o crescimento vira conservação e depois transição;
+- 9 (colapso de verdade narrativa): qualquer estado cai em CRISIS.
+
+Apenas estados e transições são definidos aqui; os milhares de tickers são
+mantidos e avançados em lote pelo motor compartilhado
+(`kernel/core/src/state_machine.py`).
 """
-# TODO: implementar state_machine para o kernel financeiro-narrativo.
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Union
+
+from ...core.src.state_machine import StateMachine, StateMachineSpec
+
+STATES = ("GROWTH", "CONSERVATION", "TRANSITION", "CRISIS", "REBUILD")
+
+TRANSITIONS = {
+    3: {"CONSERVATION": "GROWTH", "TRANSITION": "CONSERVATION", "CRISIS": "REBUILD", "REBUILD": "GROWTH"},
+    6: {"GROWTH": "CONSERVATION", "CONSERVATION": "TRANSITION", "REBUILD": "TRANSITION"},
+    9: {state: "CRISIS" for state in STATES},
+}
+
+# Uma crise dura pelo menos dois comunicados
+MIN_DWELL = {"CRISIS": 2}
+
+SPEC = StateMachineSpec.from_transitions(STATES, TRANSITIONS, MIN_DWELL)
+
+
+def new_state_machine() -> StateMachine:
+    """Máquina vazia; entidades novas começam em GROWTH."""
+    return StateMachine(SPEC)
+
+
+def load_state_machine(path: Union[str, Path]) -> StateMachine:
+    """Restaura um snapshot salvo com `StateMachine.save`."""
+    return StateMachine.load(path, SPEC)
@@ -0,0 +1,92 @@
+"""
+Lazy asset registry shared by the KALDRA kernels.
+
+Models and data files (archetype JSONs, scoring models) are registered with
+a loader at import time but only read on first use. Each asset is loaded
+exactly once, even under concurrent first access, and `warmup()` lets a
+readiness probe pay the loading cost before traffic arrives.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class LazyAsset:
+    """A resource produced by `loader` on the first `get()` and cached afterwards."""
+
+    _UNSET = object()
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self.loader = loader
+        self._value: Any = self._UNSET
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not self._UNSET
+
+    def get(self) -> Any:
+        """Returns the asset, loading it on first access."""
+        value = self._value
+        if value is self._UNSET:
+            with self._lock:
+                if self._value is self._UNSET:
+                    self._value = self.loader()
+                value = self._value
+        return value
+
+    def reset(self) -> None:
+        """Drops the cached value; the next `get()` reloads it."""
+        with self._lock:
+            self._value = self._UNSET
+
+
+_REGISTRY: Dict[str, LazyAsset] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register_asset(name: str, loader: Callable[[], Any]) -> LazyAsset:
+    """
+    Registers a lazily loaded asset. Registering an existing name returns the
+    existing asset, so re-importing a module does not trigger a reload.
+    """
+    with _REGISTRY_LOCK:
+        asset = _REGISTRY.get(name)
+        if asset is None:
+            asset = LazyAsset(name, loader)
+            _REGISTRY[name] = asset
+        return asset
+
+
+def get_asset(name: str) -> Any:
+    """Returns the value of a registered asset, loading it if needed."""
+    try:
+        asset = _REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"Unknown asset: {name}") from None
+    return asset.get()
+
+
+def loaded_assets() -> List[str]:
+    """Names of the assets that have already been loaded."""
+    return [name for name, asset in _REGISTRY.items() if asset.loaded]
+
+
+def warmup(names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Loads the given assets (all registered ones by default) and returns the
+    time spent on each, in seconds. Already loaded assets report ~0.
+    """
+    if names is None:
+        names = list(_REGISTRY)
+
+    timings: Dict[str, float] = {}
+    for name in names:
+        start = time.perf_counter()
+        get_asset(name)
+        timings[name] = time.perf_counter() - start
+    return timings
@@ -1,12 +1,5 @@
 import numpy as np
-
-def _softmax(x: np.ndarray) -> np.ndarray:
-    """
-    Computes the softmax of a vector, a numerically stable version.
-    """
-    # Subtract the max for numerical stability
-    e_x = np.exp(x - np.max(x))
-    return e_x / e_x.sum(axis=0)
+from numpy.typing import DTypeLike
 
 def project_to_delta12(embedding: list[float]) -> list[float]:
     """
@@ -24,21 +17,52 @@ def project_to_delta12(embedding: list[float]) -> list[float]:
         A 12-dimensional vector as a list of floats, where each value is
         between 0 and 1, and the sum of all values is 1.
     """
-    if not isinstance(embedding, list) or not all(isinstance(i, float) for i in embedding):
+    if not isinstance(embedding, list):
         raise TypeError("Input embedding must be a list of floats.")
 
-    # Convert the list to a NumPy array for efficient computation
-    embedding_array = np.array(embedding)
+    # A single array conversion replaces the per-element isinstance checks
+    embedding_array = np.asarray(embedding)
+    if embedding_array.dtype.kind != "f":
+        raise TypeError("Input embedding must be a list of floats.")
+
+    return project_to_delta12_batch(embedding_array.reshape(1, -1))[0].tolist()
+
+def project_to_delta12_batch(
+    embeddings: np.ndarray, dtype: DTypeLike = np.float64
+) -> np.ndarray:
+    """
+    Projects a batch of embeddings into the 12-dimensional archetypal space.
+
+    Vectorized counterpart of `project_to_delta12`: the same 12 blocks are
+    averaged for every row at once and the softmax is applied row-wise.
+    No Python lists are created along the way.
+
+    Args:
+        embeddings: A 2-D array of shape (N, D), one embedding per row.
+        dtype: Floating dtype used for the computation and the result.
 
-    # 1. Split the embedding into 12 equal-sized chunks
-    # numpy.array_split handles cases where the length is not perfectly divisible by 12
-    chunks = np.array_split(embedding_array, 12)
+    Returns:
+        A C-contiguous array of shape (N, 12) whose rows sum to 1.
+    """
+    embeddings = np.asarray(embeddings, dtype=dtype)
+    if embeddings.ndim != 2:
+        raise ValueError("Input embeddings must be a 2-D array of shape (N, D).")
 
-    # 2. Calculate the mean of each chunk to get the 12 archetypal weights
-    mean_vector = np.array([chunk.mean() for chunk in chunks])
+    n_rows, dim = embeddings.shape
+    if dim < 12:
+        raise ValueError("Input embeddings must have at least 12 dimensions.")
+    if n_rows == 0:
+        return np.empty((0, 12), dtype=dtype)
 
-    # 3. Apply softmax to normalize the vector into a probability distribution
-    delta12_vector = _softmax(mean_vector)
+    # Same block boundaries as numpy.array_split(embedding, 12)
+    base, extra = divmod(dim, 12)
+    sizes = np.array([base + 1] * extra + [base] * (12 - extra))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    mean_matrix = np.add.reduceat(embeddings, starts, axis=1)
+    mean_matrix /= sizes
 
-    # 4. Convert the final NumPy array back to a list of floats
-    return delta12_vector.tolist()
+    # Row-wise softmax, computed in place
+    mean_matrix -= mean_matrix.max(axis=1, keepdims=True)
+    np.exp(mean_matrix, out=mean_matrix)
+    mean_matrix /= mean_matrix.sum(axis=1, keepdims=True)
+    return mean_matrix
@@ -0,0 +1,132 @@
+"""
+Dynamic Δ144 coupling field shared by the KALDRA kernels.
+
+`delta144_mapping.map_to_delta144` places a document on the Δ144 grid by
+its dominant archetype alone. The dynamic operator keeps the whole 12×12
+field: every cell (i, j) is the coupling between archetypes i and j, built
+from the excess of each archetype over the uniform share, d = 12·δ - 1:
+
+    C_ij = d_i·d_j / √12     (i ≠ j, co-activation of the pair)
+    C_ii = √2·d_i / √12      (self-coupling)
+
+This is the same symmetric coupling the Tracy–Widom engine diagonalizes
+(`tracy_widom.coupling_matrices` is its float64 view), so a field computed
+here can be handed to the later operators unchanged. A uniform Δ12 gives
+the zero field.
+
+The whole batch is one broadcast, `(N, 12) -> (N, 12, 12)`, in float32.
+Most callers only need the strongest couplings, so `delta144_topk` works
+on the 78 distinct cells of the upper triangle without materializing the
+dense tensor and returns k (row, col, value) triples per document.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+N_ARCHETYPES = 12
+N_CELLS = N_ARCHETYPES * N_ARCHETYPES
+DEFAULT_TOP_K = 8
+
+# Distinct cells of a symmetric field: upper triangle, diagonal included
+_UPPER_ROWS, _UPPER_COLS = np.triu_indices(N_ARCHETYPES)
+_UPPER_DIAGONAL = _UPPER_ROWS == _UPPER_COLS
+
+
+def _excess(delta12: np.ndarray, dtype: DTypeLike) -> np.ndarray:
+    delta12 = np.asarray(delta12)
+    if delta12.ndim != 2 or delta12.shape[1] != N_ARCHETYPES:
+        raise ValueError("delta12 must be a 2-D array of shape (N, 12).")
+    excess = delta12.astype(dtype, copy=True)
+    excess *= N_ARCHETYPES
+    excess -= 1
+    return excess
+
+
+def coupling_field(delta12: np.ndarray, dtype: DTypeLike = np.float32) -> np.ndarray:
+    """
+    Dense Δ144 coupling field of a Δ12 batch.
+
+    Args:
+        delta12: A 2-D array of shape (N, 12).
+        dtype: Floating dtype of the computation and the result.
+
+    Returns:
+        A symmetric array of shape (N, 12, 12).
+    """
+    excess = _excess(delta12, dtype)
+    field = excess[:, :, None] * excess[:, None, :]
+    diagonal = np.arange(N_ARCHETYPES)
+    field[:, diagonal, diagonal] = np.sqrt(2.0).astype(dtype) * excess
+    field *= np.asarray(1.0 / np.sqrt(N_ARCHETYPES), dtype=dtype)
+    return field
+
+
+@dataclass(frozen=True)
+class SparseDelta144:
+    """
+    The k strongest couplings of each document, arrays of shape (N, k).
+
+    Cells come from the upper triangle (row <= col) and are sorted by
+    decreasing |value|; the mirrored cell (col, row) has the same value.
+    """
+
+    rows: np.ndarray
+    cols: np.ndarray
+    values: np.ndarray
+
+    @property
+    def k(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def cells(self) -> np.ndarray:
+        """Flat Δ144 cell index, row·12 + col."""
+        return self.rows.astype(np.int16) * N_ARCHETYPES + self.cols
+
+    def to_dense(self) -> np.ndarray:
+        """(N, 12, 12) field with only the kept couplings (mirrored), zeros elsewhere."""
+        n_docs = self.values.shape[0]
+        dense = np.zeros((n_docs, N_ARCHETYPES, N_ARCHETYPES), dtype=self.values.dtype)
+        docs = np.arange(n_docs)[:, None]
+        dense[docs, self.rows, self.cols] = self.values
+        dense[docs, self.cols, self.rows] = self.values
+        return dense
+
+
+def delta144_topk(delta12: np.ndarray, k: int = DEFAULT_TOP_K) -> SparseDelta144:
+    """
+    Top-k couplings of a Δ12 batch by absolute strength.
+
+    Only the 78 distinct cells are computed, `(N, 12) -> (N, 78)`, and the
+    selection is one `argpartition` plus a sort of k columns per row.
+
+    Args:
+        delta12: A 2-D array of shape (N, 12).
+        k: Number of couplings kept per document (1..78).
+    """
+    n_distinct = _UPPER_ROWS.size
+    if not 1 <= k <= n_distinct:
+        raise ValueError(f"k must be between 1 and {n_distinct}.")
+
+    excess = _excess(delta12, np.float32)
+    upper = excess[:, _UPPER_ROWS] * excess[:, _UPPER_COLS]
+    upper[:, _UPPER_DIAGONAL] = np.float32(np.sqrt(2.0)) * excess
+    upper *= np.float32(1.0 / np.sqrt(N_ARCHETYPES))
+
+    strength = np.abs(upper)
+    if k < n_distinct:
+        keep = np.argpartition(-strength, k - 1, axis=1)[:, :k]
+    else:
+        keep = np.broadcast_to(np.arange(n_distinct), upper.shape)
+    order = np.argsort(-np.take_along_axis(strength, keep, axis=1), axis=1, kind="stable")
+    keep = np.take_along_axis(keep, order, axis=1)
+
+    return SparseDelta144(
+        rows=_UPPER_ROWS[keep].astype(np.uint8),
+        cols=_UPPER_COLS[keep].astype(np.uint8),
+        values=np.take_along_axis(upper, keep, axis=1),
+    )
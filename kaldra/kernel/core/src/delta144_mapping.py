@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 
+from .assets import register_asset
+
 # --- Constants and Data Loading ---
 DATA_PATH = Path(__file__).parent.parent / "data" / "archetypes"
 DELTA144_GRID_PATH = DATA_PATH / "delta144_grid.json"
@@ -16,7 +18,14 @@ def _load_delta144_grid():
     # Create a dictionary for O(1) average time complexity lookups
     return {item["jung"]: item for item in grid_data}
 
-DELTA144_MAP = _load_delta144_grid()
+# Loaded on first use (see assets.py)
+_DELTA144_MAP = register_asset("delta144_grid", _load_delta144_grid)
+
+def __getattr__(name: str):
+    # Backwards-compatible access to the former module-level DELTA144_MAP
+    if name == "DELTA144_MAP":
+        return _DELTA144_MAP.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- Main Function ---
 
@@ -35,7 +44,7 @@ def map_to_delta144(archetype_name: str) -> dict:
         A dictionary containing the Δ144 grid information for the archetype.
     """
     # Find the corresponding entry in the map
-    result = DELTA144_MAP.get(archetype_name)
+    result = _DELTA144_MAP.get().get(archetype_name)
 
     if result:
         return result
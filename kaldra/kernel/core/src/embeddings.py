@@ -4,8 +4,12 @@ from __future__ import annotations
 
 import hashlib
 import numpy as np
+from numpy.typing import DTypeLike
 
 _EMBEDDING_SIZE = 384
+# Bump whenever the vectors produced for a given text change (invalidates
+# materialized features, e.g. the safeguard feature store).
+EMBEDDING_VERSION = "sha256-384-v1"
 
 
 def _hash_embedding(text: str) -> np.ndarray:
@@ -25,7 +29,28 @@ def _hash_embedding(text: str) -> np.ndarray:
 
 
 def get_embedding(text: str) -> list[float]:
-    """Return a deterministic embedding vector for the provided text."""
+    """Return a deterministic embedding vector for the provided text.
 
-    embedding = _hash_embedding(text)
-    return embedding.tolist()
+    Thin list wrapper around ``get_embeddings`` kept for existing callers.
+    """
+
+    return get_embeddings([text])[0].tolist()
+
+
+def get_embeddings(texts: list[str], dtype: DTypeLike = np.float32) -> np.ndarray:
+    """Return the embeddings of ``texts`` as a C-contiguous ``(N, 384)`` matrix.
+
+    All digests are concatenated into a single buffer and expanded to the
+    embedding size with array operations, so no per-item array or list is
+    created. With the default ``float32`` dtype the rows are identical to
+    ``_hash_embedding``.
+    """
+
+    digest_size = hashlib.sha256().digest_size
+    buffer = b"".join(hashlib.sha256(text.encode("utf-8")).digest() for text in texts)
+    digests = np.frombuffer(buffer, dtype=np.uint8).reshape(len(texts), digest_size)
+
+    repeats = (_EMBEDDING_SIZE + digest_size - 1) // digest_size
+    values = np.tile(digests, (1, repeats))[:, :_EMBEDDING_SIZE].astype(dtype)
+    values /= 255.0
+    return np.ascontiguousarray(values)
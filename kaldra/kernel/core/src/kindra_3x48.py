@@ -1,6 +1,9 @@
 import json
+import numpy as np
 from pathlib import Path
-from typing import Tuple, List
+from typing import List, Sequence, Tuple
+
+from .assets import register_asset
 
 # --- Paths ---
 
@@ -8,6 +11,11 @@ DATA_PATH = Path(__file__).parent.parent / "data" / "archetypes"
 LOCALES_MAP_PATH = DATA_PATH / "locales_map.json"
 CULTURAL_3X48_PATH = DATA_PATH / "cultural_3x48.json"
 
+N_ARCHETYPES = 12
+# Plano usado quando nem o locale nem o fallback "en" estão no mapa
+DEFAULT_PLAN = 3
+FALLBACK_LOCALE = "en"
+
 
 def _load_json_data() -> Tuple[dict, dict]:
     """
@@ -28,8 +36,80 @@ def _load_json_data() -> Tuple[dict, dict]:
     return locales_map, cultural_weights
 
 
-# Carregamento único em import
-_LOCALES_MAP, _CULTURAL_WEIGHTS = _load_json_data()
+# --- Índice compilado ---
+
+class KindraIndex:
+    """
+    Artefatos Kindra compilados para consulta vetorizada.
+
+    - `plans`: vetor (P,) com os planos 3/6/9 conhecidos;
+    - `weights`: matriz (P, 12) de pesos por plano (linha de 1.0 quando o
+      plano não tem pesos compatíveis com Δ12, isto é, modulação neutra);
+    - `plan_rows`: plano → linha de `plans`/`weights`;
+    - `locale_rows`: locale → linha; locales fora do mapa usam a linha do
+      fallback "en" (ou do plano 3), como em `_resolve_plan_for_locale`.
+    """
+
+    def __init__(self, locales_map: dict, cultural_weights: dict):
+        plans = {DEFAULT_PLAN}
+        for culture_info in locales_map.values():
+            plans.add(int(culture_info.get("plan", DEFAULT_PLAN)))
+        for key in cultural_weights:
+            if key.startswith("plan_") and key[5:].isdigit():
+                plans.add(int(key[5:]))
+
+        self.plans = np.array(sorted(plans), dtype=np.int16)
+        self.plan_rows = {int(plan): row for row, plan in enumerate(self.plans)}
+        self.weights = np.ones((len(self.plans), N_ARCHETYPES))
+        for plan, row in self.plan_rows.items():
+            plan_weights = cultural_weights.get(f"plan_{plan}", [])
+            # Pesos ausentes ou de tamanho incompatível: linha neutra
+            if isinstance(plan_weights, list) and len(plan_weights) == N_ARCHETYPES:
+                self.weights[row] = np.asarray(plan_weights, dtype=np.float64)
+        self.neutral = bool(np.all(self.weights == 1.0))
+
+        self.locale_rows = {
+            locale: self.plan_rows[int(info.get("plan", DEFAULT_PLAN))]
+            for locale, info in locales_map.items()
+        }
+        fallback = locales_map.get(FALLBACK_LOCALE, {"plan": DEFAULT_PLAN})
+        self._fallback_row = self.plan_rows[int(fallback.get("plan", DEFAULT_PLAN))]
+
+    def row_for(self, locale: str) -> int:
+        return self.locale_rows.get(locale, self._fallback_row)
+
+    def plan_for(self, locale: str) -> int:
+        return int(self.plans[self.row_for(locale)])
+
+    def rows_for(self, locales: Sequence[str]) -> np.ndarray:
+        """Linha do plano de cada item (N,); o dicionário é consultado uma vez por locale distinto."""
+        lookup = {locale: self.row_for(locale) for locale in set(locales)}
+        return np.fromiter(map(lookup.__getitem__, locales), dtype=np.intp, count=len(locales))
+
+    def modulate(self, delta12: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Gather + multiplicação sobre a matriz Δ12 (N, 12): cada linha é
+        multiplicada pelos pesos do seu plano e renormalizada para somar 1.
+        Com pesos neutros a matriz é devolvida sem cópia.
+        """
+        delta12 = np.asarray(delta12)
+        if self.neutral:
+            return delta12
+        modulated = delta12 * self.weights[rows]
+        modulated /= modulated.sum(axis=1, keepdims=True)
+        return modulated
+
+
+def _load_index() -> KindraIndex:
+    return KindraIndex(*_load_json_data())
+
+
+# Carregamento e compilação únicos, no primeiro uso (ver assets.py)
+_KINDRA_INDEX = register_asset("kindra_3x48", _load_index)
+
+
+def get_kindra_index() -> KindraIndex:
+    return _KINDRA_INDEX.get()
 
 
 def _resolve_plan_for_locale(locale: str) -> int:
@@ -39,40 +119,30 @@ def _resolve_plan_for_locale(locale: str) -> int:
     Se o locale não existir no mapa, cai no fallback "en" e,
     em último caso, no plano 3.
     """
-    fallback = {"plan": 3}
-    culture_info = _LOCALES_MAP.get(locale) or _LOCALES_MAP.get("en", fallback)
-    plan = culture_info.get("plan", 3)
-    return int(plan)
+    return _KINDRA_INDEX.get().plan_for(locale)
 
 
 def _get_plan_weights(plan: int) -> List[float]:
     """
     Retorna os pesos culturais associados ao plano.
 
-    Em v0.5, `cultural_3x48.json` pode estar vazio ou apenas com chaves
-    `plan_3`, `plan_6`, `plan_9` sem conteúdo. Neste caso, retornamos
-    uma lista vazia e a modulação é efetivamente neutra (no-op).
-
-    Esta função existe para preparar o terreno para a v0.6, onde os
-    pesos terão efeito real sobre o vetor Δ12.
+    Lista vazia quando `cultural_3x48.json` não traz pesos compatíveis com
+    Δ12 para o plano (modulação neutra).
     """
-    key = f"plan_{plan}"
-    weights = _CULTURAL_WEIGHTS.get(key, [])
-    # Garantir tipo list mesmo se vier algo inesperado.
-    if not isinstance(weights, list):
+    index = _KINDRA_INDEX.get()
+    row = index.plan_rows.get(int(plan))
+    if row is None or np.all(index.weights[row] == 1.0):
         return []
-    return weights
+    return index.weights[row].tolist()
 
 
 def apply_kindra(delta12: List[float], locale: str) -> Tuple[List[float], int]:
     """
     Aplica a camada Kindra (3×48) a um vetor Δ12.
 
-    v0.5 (infra de drift):
     - Resolve o plano cultural (3/6/9) com base no locale.
-    - Carrega os pesos correspondentes ao plano, se existirem.
-    - Se não houver pesos ou o tamanho não for compatível, retorna
-      o vetor original (no-op) + o plano, mantendo estabilidade.
+    - Multiplica o vetor pelos pesos do plano e renormaliza; sem pesos
+      compatíveis, devolve uma cópia do vetor original (no-op).
 
     Args:
         delta12: vetor Δ12 (12 dimensões arquetípicas).
@@ -81,12 +151,42 @@ def apply_kindra(delta12: List[float], locale: str) -> Tuple[List[float], int]:
     Returns:
         (delta12_modulado, plan)
     """
-    plan = _resolve_plan_for_locale(locale)
-    plan_weights = _get_plan_weights(plan)
+    modulated, plan = apply_kindra_batch(np.asarray([delta12], dtype=np.float64), locale)
+    return modulated[0].tolist(), plan
+
+
+def apply_kindra_batch(delta12: np.ndarray, locale: str) -> Tuple[np.ndarray, int]:
+    """
+    Versão em lote de `apply_kindra` para uma matriz Δ12 de shape (N, 12).
+
+    Como todos os itens compartilham o locale, o plano é resolvido uma única
+    vez. Com modulação neutra a matriz é devolvida sem cópia.
+
+    Returns:
+        (delta12_modulado, plan)
+    """
+    index = _KINDRA_INDEX.get()
+    row = index.row_for(locale)
+    delta12 = np.asarray(delta12)
+    modulated = index.modulate(delta12, np.full(len(delta12), row, dtype=np.intp))
+    return modulated, int(index.plans[row])
+
+
+def apply_kindra_locales(
+    delta12: np.ndarray, locales: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Camada Kindra com um locale por item, para lotes de tráfego misto.
 
-    # v0.5: modulação neutra. Apenas preparamos a infra.
-    # Quando os pesos forem calibrados (v0.6), a lógica de multiplicação
-    # entrará aqui, respeitando o tamanho de delta12.
-    modulated_delta12 = list(delta12)
+    O plano de cada linha vem do índice compilado e a modulação do lote
+    inteiro é um único gather + multiplicação sobre a matriz (N, 12).
 
-    return modulated_delta12, plan
+    Returns:
+        (delta12_modulado, plans) com plans de shape (N,).
+    """
+    delta12 = np.asarray(delta12)
+    if len(locales) != len(delta12):
+        raise ValueError("locales must have one entry per row of delta12.")
+    index = _KINDRA_INDEX.get()
+    rows = index.rows_for(locales)
+    return index.modulate(delta12, rows), index.plans[rows]
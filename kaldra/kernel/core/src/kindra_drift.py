@@ -0,0 +1,453 @@
+"""
+Online drift monitor over Δ12 outputs, shared by the KALDRA kernels.
+
+The pipeline feeds every analyzed batch into a `DriftMonitor`, which keeps
+incremental statistics per key, one key per locale and one per cultural
+plan (`("locale", "pt-BR")`, `("plan", "6")`):
+
+- count, mean and covariance of the Δ12 rows (Welford, merged batch-wise
+  with Chan's update);
+- histogram of dominant archetypes;
+- label counts, from which the inconclusive and label rates follow.
+
+Every key holds a cumulative `DriftStats` plus a tumbling window of at
+least `window_size` items, so memory is O(1) per key whatever the traffic.
+When a window closes it is compared with the reference snapshot of the
+same key:
+
+    PSI = Σ (w_i - r_i)·ln(w_i / r_i)      over the archetype histogram
+    KL  = Σ w_i·ln(w_i / r_i)              of the mean Δ12 (a distribution)
+
+and the resulting `DriftReport` is stored as the key's current drift and
+handed to the registered callbacks. References are frozen snapshots of
+the cumulative statistics (`snapshot()`), saved as JSON.
+
+Batch summaries (`summarize_batch`) are plain mergeable values, so they
+can be computed where the batch is analyzed (e.g. a worker process) and
+merged into the monitor elsewhere.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .logging_config import get_logger
+
+N_ARCHETYPES = 12
+INCONCLUSIVE_LABEL = "inconclusive"
+# Keys per monitor: locales come from clients, so their number is bounded
+MAX_KEYS = 1000
+OVERFLOW_VALUE = "other"
+# Floor of the probabilities compared by PSI/KL (empty bins)
+EPSILON = 1e-6
+REFERENCE_FORMAT_VERSION = 1
+
+DriftKey = Tuple[str, str]
+
+
+# --- Incremental statistics ---
+
+class DriftStats:
+    """Mergeable count/mean/covariance of Δ12, archetype histogram and label counts."""
+
+    __slots__ = ("count", "mean", "m2", "archetype_counts", "label_counts")
+
+    def __init__(
+        self,
+        count: int = 0,
+        mean: Optional[np.ndarray] = None,
+        m2: Optional[np.ndarray] = None,
+        archetype_counts: Optional[np.ndarray] = None,
+        label_counts: Optional[Dict[str, int]] = None,
+    ):
+        self.count = int(count)
+        self.mean = np.zeros(N_ARCHETYPES) if mean is None else np.asarray(mean, dtype=np.float64)
+        self.m2 = np.zeros((N_ARCHETYPES, N_ARCHETYPES)) if m2 is None else np.asarray(m2, dtype=np.float64)
+        self.archetype_counts = (
+            np.zeros(N_ARCHETYPES, dtype=np.int64)
+            if archetype_counts is None
+            else np.asarray(archetype_counts, dtype=np.int64)
+        )
+        self.label_counts = dict(label_counts or {})
+
+    @classmethod
+    def from_rows(cls, delta12: np.ndarray, labels: Sequence[str]) -> "DriftStats":
+        """Statistics of a block of Δ12 rows (N, 12) and their labels."""
+        delta12 = np.asarray(delta12, dtype=np.float64)
+        if len(delta12) == 0:
+            return cls()
+        mean = delta12.mean(axis=0)
+        centred = delta12 - mean
+        categories, counts = np.unique(np.asarray(labels, dtype=object).astype(str), return_counts=True)
+        return cls(
+            count=len(delta12),
+            mean=mean,
+            m2=centred.T @ centred,
+            archetype_counts=np.bincount(np.argmax(delta12, axis=1), minlength=N_ARCHETYPES),
+            label_counts=dict(zip(categories.tolist(), counts.tolist())),
+        )
+
+    def merge(self, other: "DriftStats") -> "DriftStats":
+        """Adds `other` in place (Chan's parallel update) and returns self."""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 = self.m2 + other.m2 + np.outer(delta, delta) * (self.count * other.count / total)
+        self.mean = self.mean + delta * (other.count / total)
+        self.count = total
+        self.archetype_counts = self.archetype_counts + other.archetype_counts
+        for label, count in other.label_counts.items():
+            self.label_counts[label] = self.label_counts.get(label, 0) + count
+        return self
+
+    def copy(self) -> "DriftStats":
+        return DriftStats(
+            self.count, self.mean.copy(), self.m2.copy(), self.archetype_counts.copy(), self.label_counts
+        )
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Sample covariance of the Δ12 rows (zeros below two items)."""
+        if self.count < 2:
+            return np.zeros_like(self.m2)
+        return self.m2 / (self.count - 1)
+
+    @property
+    def archetype_distribution(self) -> np.ndarray:
+        return self.archetype_counts / max(self.count, 1)
+
+    @property
+    def label_rates(self) -> Dict[str, float]:
+        total = sum(self.label_counts.values())
+        return {label: count / total for label, count in self.label_counts.items()} if total else {}
+
+    @property
+    def inconclusive_rate(self) -> float:
+        return self.label_rates.get(INCONCLUSIVE_LABEL, 0.0)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean.tolist(),
+            "m2": self.m2.tolist(),
+            "archetype_counts": self.archetype_counts.tolist(),
+            "label_counts": dict(self.label_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DriftStats":
+        return cls(
+            data["count"], data["mean"], data["m2"], data["archetype_counts"], data.get("label_counts")
+        )
+
+
+def _group_rows(values: Union[str, Sequence], n_rows: int) -> Iterable[Tuple[str, np.ndarray]]:
+    """(value, row indices) for each distinct value; a scalar covers every row."""
+    if isinstance(values, str) or np.ndim(values) == 0:
+        yield str(values), np.arange(n_rows)
+        return
+    distinct, inverse = np.unique(np.asarray(values).astype(str), return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(len(distinct) + 1))
+    for position, value in enumerate(distinct.tolist()):
+        yield value, order[bounds[position]:bounds[position + 1]]
+
+
+def summarize_batch(
+    delta12: np.ndarray,
+    labels: Sequence[str],
+    locales: Union[str, Sequence[str]],
+    plans: Union[int, Sequence[int]],
+) -> Dict[DriftKey, DriftStats]:
+    """
+    Per-key statistics of one analyzed batch.
+
+    Args:
+        delta12: (N, 12) modulated Δ12 matrix.
+        labels: label of each row.
+        locales: one locale for the batch or one per row.
+        plans: one plan for the batch or one per row.
+    """
+    delta12 = np.asarray(delta12, dtype=np.float64)
+    labels = np.asarray(labels, dtype=object)
+    if len(labels) != len(delta12):
+        raise ValueError("labels must have one entry per row of delta12.")
+
+    summary: Dict[DriftKey, DriftStats] = {}
+    for kind, values in (("locale", locales), ("plan", plans)):
+        for value, rows in _group_rows(values, len(delta12)):
+            summary[(kind, value)] = DriftStats.from_rows(delta12[rows], labels[rows])
+    return summary
+
+
+def merge_summaries(summaries: Iterable[Dict[DriftKey, DriftStats]]) -> Dict[DriftKey, DriftStats]:
+    """Merges batch summaries key by key (the inputs are left untouched)."""
+    merged: Dict[DriftKey, DriftStats] = {}
+    for summary in summaries:
+        for key, stats in summary.items():
+            if key in merged:
+                merged[key].merge(stats)
+            else:
+                merged[key] = stats.copy()
+    return merged
+
+
+# --- Divergences ---
+
+def _smoothed(distribution: np.ndarray) -> np.ndarray:
+    distribution = np.maximum(np.asarray(distribution, dtype=np.float64), EPSILON)
+    return distribution / distribution.sum()
+
+
+def population_stability_index(current: np.ndarray, reference: np.ndarray) -> float:
+    """PSI between two discrete distributions (smoothed for empty bins)."""
+    current, reference = _smoothed(current), _smoothed(reference)
+    return float(np.sum((current - reference) * np.log(current / reference)))
+
+
+def kl_divergence(current: np.ndarray, reference: np.ndarray) -> float:
+    """KL(current ‖ reference) between two discrete distributions."""
+    current, reference = _smoothed(current), _smoothed(reference)
+    return float(np.sum(current * np.log(current / reference)))
+
+
+# --- Reference snapshots ---
+
+def _key_name(key: DriftKey) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def _parse_key(name: str) -> DriftKey:
+    kind, _, value = name.partition(":")
+    return kind, value
+
+
+class DriftReference:
+    """Frozen per-key statistics that windows are compared against."""
+
+    def __init__(self, stats: Dict[DriftKey, DriftStats]):
+        self.stats = stats
+
+    def get(self, key: DriftKey) -> Optional[DriftStats]:
+        return self.stats.get(key)
+
+    def to_dict(self) -> dict:
+        return {
+            "format_version": REFERENCE_FORMAT_VERSION,
+            "keys": {_key_name(key): stats.to_dict() for key, stats in self.stats.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DriftReference":
+        version = data.get("format_version")
+        if version != REFERENCE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported drift reference format version: {version}")
+        return cls({_parse_key(name): DriftStats.from_dict(stats) for name, stats in data["keys"].items()})
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Writes the snapshot as JSON (atomically: temporary file + rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "DriftReference":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+# --- Monitor ---
+
+@dataclass(frozen=True)
+class DriftReport:
+    """Drift of one closed window against the reference of its key."""
+
+    key: DriftKey
+    window_count: int
+    psi: Optional[float]
+    kl: Optional[float]
+    inconclusive_rate: float
+    reference_inconclusive_rate: Optional[float]
+    drifted: bool
+
+    def to_dict(self) -> dict:
+        return {
+            "key": _key_name(self.key),
+            "window_count": self.window_count,
+            "psi": self.psi,
+            "kl": self.kl,
+            "inconclusive_rate": self.inconclusive_rate,
+            "reference_inconclusive_rate": self.reference_inconclusive_rate,
+            "drifted": self.drifted,
+        }
+
+
+class _KeyState:
+    __slots__ = ("total", "window", "report")
+
+    def __init__(self):
+        self.total = DriftStats()
+        self.window = DriftStats()
+        self.report: Optional[DriftReport] = None
+
+
+DriftCallback = Callable[[DriftReport], None]
+
+
+class DriftMonitor:
+    """
+    Thread-safe online drift monitor (see the module docstring).
+
+    Callbacks run in the thread that closed the window, after the lock is
+    released; an exception in one callback is logged and does not reach
+    the pipeline.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 1000,
+        psi_threshold: float = 0.2,
+        kl_threshold: float = 0.1,
+        reference: Optional[DriftReference] = None,
+        max_keys: int = MAX_KEYS,
+    ):
+        self.window_size = max(1, int(window_size))
+        self.psi_threshold = psi_threshold
+        self.kl_threshold = kl_threshold
+        self.max_keys = max_keys
+        self._reference = reference
+        self._states: Dict[DriftKey, _KeyState] = {}
+        self._callbacks: List[DriftCallback] = []
+        self._lock = threading.Lock()
+
+    # Callbacks
+
+    def add_callback(self, callback: DriftCallback) -> None:
+        """Registers `callback(report)`, called whenever a window closes."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: DriftCallback) -> None:
+        with self._lock:
+            self._callbacks.remove(callback)
+
+    # Feeding
+
+    def observe(
+        self,
+        delta12: np.ndarray,
+        labels: Sequence[str],
+        locales: Union[str, Sequence[str]],
+        plans: Union[int, Sequence[int]],
+    ) -> List[DriftReport]:
+        """Feeds one analyzed batch; returns the reports of the windows it closed."""
+        return self.merge(summarize_batch(delta12, labels, locales, plans))
+
+    def merge(self, summary: Dict[DriftKey, DriftStats]) -> List[DriftReport]:
+        """Feeds precomputed batch statistics (see `summarize_batch`)."""
+        reports: List[DriftReport] = []
+        with self._lock:
+            for key, stats in summary.items():
+                if stats.count == 0:
+                    continue
+                state = self._state_for(key)
+                state.total.merge(stats)
+                state.window.merge(stats)
+                if state.window.count >= self.window_size:
+                    state.report = self._compare(key, state.window)
+                    state.window = DriftStats()
+                    reports.append(state.report)
+            callbacks = list(self._callbacks) if reports else []
+
+        for report in reports:
+            for callback in callbacks:
+                try:
+                    callback(report)
+                except Exception:
+                    # The monitor never breaks the analysis it observes
+                    get_logger().exception("Drift callback failed for {}", _key_name(report.key))
+        return reports
+
+    def _state_for(self, key: DriftKey) -> _KeyState:
+        """State of `key`; call with the lock held."""
+        state = self._states.get(key)
+        if state is None:
+            if len(self._states) >= self.max_keys:
+                key = (key[0], OVERFLOW_VALUE)
+                state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _KeyState()
+        return state
+
+    def _compare(self, key: DriftKey, window: DriftStats) -> DriftReport:
+        reference = self._reference.get(key) if self._reference is not None else None
+        if reference is None or reference.count == 0:
+            return DriftReport(key, window.count, None, None, window.inconclusive_rate, None, False)
+        psi = population_stability_index(window.archetype_distribution, reference.archetype_distribution)
+        kl = kl_divergence(window.mean, reference.mean)
+        return DriftReport(
+            key, window.count, psi, kl, window.inconclusive_rate, reference.inconclusive_rate,
+            psi >= self.psi_threshold or kl >= self.kl_threshold,
+        )
+
+    # Reference
+
+    @property
+    def reference(self) -> Optional[DriftReference]:
+        return self._reference
+
+    def set_reference(self, reference: Optional[DriftReference]) -> None:
+        """Replaces the reference; current reports are kept until their next window."""
+        with self._lock:
+            self._reference = reference
+
+    def snapshot(self) -> DriftReference:
+        """Cumulative statistics of every key, usable as a future reference."""
+        with self._lock:
+            return DriftReference({key: state.total.copy() for key, state in self._states.items()})
+
+    def reset(self) -> None:
+        """Drops every key (the reference and callbacks are kept)."""
+        with self._lock:
+            self._states.clear()
+
+    # Reporting
+
+    def reports(self) -> Dict[DriftKey, Optional[DriftReport]]:
+        """Latest report of every key (None until its first window closes)."""
+        with self._lock:
+            return {key: state.report for key, state in self._states.items()}
+
+    def describe(self) -> dict:
+        """JSON-ready view of every key: totals, open window and current drift."""
+        with self._lock:
+            keys = {
+                _key_name(key): {
+                    "count": state.total.count,
+                    "window_count": state.window.count,
+                    "inconclusive_rate": state.total.inconclusive_rate,
+                    "label_rates": state.total.label_rates,
+                    "mean_delta12": state.total.mean.tolist(),
+                    "archetype_distribution": state.total.archetype_distribution.tolist(),
+                    "drift": state.report.to_dict() if state.report is not None else None,
+                }
+                for key, state in sorted(self._states.items())
+            }
+            has_reference = self._reference is not None
+        return {
+            "window_size": self.window_size,
+            "psi_threshold": self.psi_threshold,
+            "kl_threshold": self.kl_threshold,
+            "has_reference": has_reference,
+            "drifted": sorted(name for name, key in keys.items() if (key["drift"] or {}).get("drifted")),
+            "keys": keys,
+        }
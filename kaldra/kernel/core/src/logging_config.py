@@ -3,12 +3,32 @@ Configuração de logging estruturado para o KALDRA.
 
 - Usa loguru como backend.
 - Fornece uma função get_logger() para uso consistente em todo o kernel.
+- Dois formatos de saída: `text` (colorido, para desenvolvimento) e `json`
+  (uma linha JSON por evento, para produção).
+- Sink opcionalmente enfileirado (`enqueue`): a escrita acontece em uma thread
+  de fundo e não bloqueia o caminho quente. A fila é limitada; com ela cheia,
+  as mensagens excedentes são descartadas e contadas (`dropped_log_count`).
+- `should_log()` combina o nível mínimo com taxas de amostragem por evento,
+  para que o chamador nem monte a mensagem/`extra` de eventos descartados.
+
+Variáveis de ambiente (lidas na primeira chamada a get_logger()):
+    KALDRA_LOG_LEVEL         nível mínimo (padrão INFO)
+    KALDRA_LOG_FORMAT        text | json (padrão text)
+    KALDRA_LOG_ENQUEUE       1/0 (padrão: ligado no formato json)
+    KALDRA_LOG_QUEUE_SIZE    capacidade da fila do sink de fundo (padrão 10000)
+    KALDRA_LOG_SAMPLE_RATES  ex.: "analyze_batch_item=0.01,analyze_text_end=0.1"
 """
 
 from __future__ import annotations
 
+import atexit
+import json
+import os
+import queue
+import random
 import sys
-from typing import Optional
+import threading
+from typing import Any, Callable, Dict, Optional, TextIO
 
 from loguru import logger as _logger
 
@@ -17,39 +37,220 @@ _LOGGER = _logger
 
 _CONFIGURED: bool = False
 
+# Estado usado pelas checagens rápidas (is_enabled / should_log)
+_MIN_LEVEL_NO: int = 20
+_SAMPLE_RATES: Dict[str, float] = {}
+_LEVEL_NOS: Dict[str, int] = {}
+_ATEXIT_REGISTERED: bool = False
+_BACKGROUND_SINK: Optional[_BackgroundSink] = None
+_DEFAULT_QUEUE_SIZE = 10000
 
-def _configure_logger() -> None:
+_TEXT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "{extra[app]: <12} | "
+    "{extra[env]: <8} | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level>"
+)
+
+
+def _parse_sample_rates(raw: Optional[str]) -> Dict[str, float]:
+    """Converte "evento=taxa,evento=taxa" em um dicionário."""
+    rates: Dict[str, float] = {}
+    if not raw:
+        return rates
+    for item in raw.split(","):
+        event, _, rate = item.partition("=")
+        if event.strip() and rate.strip():
+            rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+def _render_json(message) -> str:
+    """Uma linha JSON compacta a partir do record do loguru."""
+    record = message.record
+    payload: Dict[str, Any] = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+    }
+    for key, value in record["extra"].items():
+        # `extra={...}` dos chamadores chega aninhado; é achatado aqui
+        if key == "extra" and isinstance(value, dict):
+            payload.update(value)
+        else:
+            payload[key] = value
+    if record["exception"] is not None:
+        # O texto formatado traz o traceback logo após a mensagem
+        payload["exception"] = str(message)[len(record["message"]):].strip()
+    return json.dumps(payload, ensure_ascii=False, default=str) + "\n"
+
+
+def _render_text(message) -> str:
+    return str(message)
+
+
+class _BackgroundSink:
     """
-    Aplica a configuração padrão do logger.
+    Sink enfileirado: o chamador só faz um `put` em uma fila em memória; a
+    renderização (JSON) e a escrita acontecem em uma thread de fundo, que
+    agrupa as mensagens pendentes em uma única escrita.
 
-    - Remove handlers default do loguru.
-    - Adiciona saída para stdout.
+    Diferente do `enqueue=True` do loguru, não há pickling nem pipe entre
+    processos, então o custo no caminho quente é mínimo.
+
+    A fila guarda no máximo `maxsize` mensagens: se a escrita não acompanha
+    (stdout lento, pipe cheio), as excedentes são descartadas e contadas em
+    `dropped`, em vez de a memória crescer sem limite ou o chamador bloquear.
     """
-    global _CONFIGURED, _LOGGER
 
-    if _CONFIGURED:
-        return
+    def __init__(self, stream: TextIO, render: Callable[[Any], str], maxsize: int = _DEFAULT_QUEUE_SIZE):
+        self.stream = stream
+        self.render = render
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._start()
+
+    def _start(self) -> None:
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.maxsize)
+        self._thread = threading.Thread(target=self._run, name="kaldra-log-writer", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        while True:
+            items = [get()]
+            try:
+                while len(items) < 1024:
+                    items.append(get_nowait())
+            except queue.Empty:
+                pass
+
+            chunks = []
+            for item in items:
+                if isinstance(item, threading.Event):
+                    if chunks:
+                        self._write("".join(chunks))
+                        chunks = []
+                    item.set()
+                elif item is None:
+                    if chunks:
+                        self._write("".join(chunks))
+                    return
+                else:
+                    chunks.append(self.render(item))
+            if chunks:
+                self._write("".join(chunks))
+
+    def _write(self, data: str) -> None:
+        try:
+            self.stream.write(data)
+            self.stream.flush()
+        except Exception:
+            # Logging nunca deve derrubar o processo
+            pass
+
+    def flush(self, timeout: Optional[float] = 5.0) -> None:
+        """Bloqueia até tudo o que já foi enfileirado ser escrito."""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        try:
+            # Marcadores de controle esperam vaga na fila em vez de serem descartados
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def stop(self) -> None:
+        """Escreve o que está pendente e encerra a thread (usado pelo loguru.remove)."""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=5.0)
+            except queue.Full:
+                return
+            self._thread.join(timeout=5.0)
+
+
+def _restart_after_fork() -> None:
+    """
+    Um processo filho (ex.: workers de parallel.py) herda a fila, mas não a
+    thread de escrita: começa com fila e thread novas.
+    """
+    if _BACKGROUND_SINK is not None:
+        _BACKGROUND_SINK._start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def configure_logging(
+    level: str = "INFO",
+    fmt: str = "text",
+    enqueue: Optional[bool] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    sink: Optional[TextIO] = None,
+    app_name: str = "kaldra-core",
+    env: str = "local",
+    queue_size: int = _DEFAULT_QUEUE_SIZE,
+) -> None:
+    """
+    (Re)configura o logger global.
 
-    # Remove qualquer configuração anterior
+    Args:
+        level: nível mínimo (ex.: "INFO", "WARNING").
+        fmt: "text" (colorido) ou "json" (uma linha JSON por evento).
+        enqueue: escreve em uma thread de fundo; padrão: True para "json".
+        sample_rates: fração de cada evento a registrar (ver should_log).
+        sink: stream de saída (padrão: stdout).
+        queue_size: capacidade da fila do sink de fundo (excedentes são descartados).
+    """
+    global _CONFIGURED, _LOGGER, _MIN_LEVEL_NO, _SAMPLE_RATES, _LEVEL_NOS
+    global _ATEXIT_REGISTERED, _BACKGROUND_SINK
+
+    # Remove qualquer configuração anterior (escreve mensagens enfileiradas)
     _logger.remove()
+    if _BACKGROUND_SINK is not None:
+        _BACKGROUND_SINK.stop()
+        _BACKGROUND_SINK = None
 
-    level = "INFO"
-    env: Optional[str] = "local"
-    app_name: str = "kaldra-core"
-
-    # Sink principal: stdout, formato estruturado
-    _logger.add(
-        sys.stdout,
-        level=level,
-        format=(
-            "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-            "<level>{level: <8}</level> | "
-            "{extra[app]: <12} | "
-            "{extra[env]: <8} | "
-            "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-            "<level>{message}</level>"
-        ),
-    )
+    stream = sink if sink is not None else sys.stdout
+    if enqueue is None:
+        enqueue = fmt == "json"
+
+    render = _render_json if fmt == "json" else _render_text
+    log_format = "{message}" if fmt == "json" else _TEXT_FORMAT
+    if enqueue:
+        _BACKGROUND_SINK = _BackgroundSink(stream, render, maxsize=queue_size)
+        # Cores só fazem sentido em um terminal
+        colorize = fmt != "json" and getattr(stream, "isatty", lambda: False)()
+        _logger.add(_BACKGROUND_SINK, level=level, format=log_format, colorize=colorize)
+        if not _ATEXIT_REGISTERED:
+            atexit.register(flush_logs)
+            _ATEXIT_REGISTERED = True
+    elif fmt == "json":
+        _logger.add(lambda message: stream.write(_render_json(message)), level=level, format=log_format)
+    else:
+        _logger.add(stream, level=level, format=log_format)
+
+    _LEVEL_NOS = {name: _logger.level(name).no for name in
+                  ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")}
+    _MIN_LEVEL_NO = _logger.level(level.upper()).no
+    _SAMPLE_RATES = dict(sample_rates or {})
 
     # Bind de campos padrão
     _LOGGER = _logger.bind(app=app_name, env=env)
@@ -57,6 +258,27 @@ def _configure_logger() -> None:
     _CONFIGURED = True
 
 
+def _configure_logger() -> None:
+    """
+    Aplica a configuração padrão do logger, a partir das variáveis de ambiente.
+
+    - Remove handlers default do loguru.
+    - Adiciona saída para stdout.
+    """
+    if _CONFIGURED:
+        return
+
+    fmt = os.environ.get("KALDRA_LOG_FORMAT", "text").strip().lower() or "text"
+    enqueue_raw = os.environ.get("KALDRA_LOG_ENQUEUE", "").strip().lower()
+    configure_logging(
+        level=os.environ.get("KALDRA_LOG_LEVEL", "INFO").strip().upper() or "INFO",
+        fmt=fmt,
+        enqueue=None if not enqueue_raw else enqueue_raw in ("1", "true", "yes", "on"),
+        sample_rates=_parse_sample_rates(os.environ.get("KALDRA_LOG_SAMPLE_RATES")),
+        queue_size=int(os.environ.get("KALDRA_LOG_QUEUE_SIZE", "") or _DEFAULT_QUEUE_SIZE),
+    )
+
+
 def get_logger():
     """
     Retorna o logger global configurado.
@@ -64,3 +286,38 @@ def get_logger():
     if not _CONFIGURED:
         _configure_logger()
     return _LOGGER
+
+
+def is_enabled(level: str = "INFO") -> bool:
+    """
+    True se mensagens de `level` seriam registradas. Permite pular a montagem
+    de mensagens e payloads `extra` caros quando o nível está filtrado.
+    """
+    if not _CONFIGURED:
+        _configure_logger()
+    level_no = _LEVEL_NOS.get(level)
+    if level_no is None:
+        level_no = _logger.level(level).no
+    return level_no >= _MIN_LEVEL_NO
+
+
+def should_log(event: str, level: str = "INFO") -> bool:
+    """
+    Combina `is_enabled(level)` com a taxa de amostragem configurada para
+    `event` (1.0 quando não configurada).
+    """
+    if not is_enabled(level):
+        return False
+    rate = _SAMPLE_RATES.get(event, 1.0)
+    return rate >= 1.0 or random.random() < rate
+
+
+def flush_logs() -> None:
+    """Aguarda a escrita das mensagens ainda na fila do sink de fundo."""
+    if _BACKGROUND_SINK is not None:
+        _BACKGROUND_SINK.flush()
+
+
+def dropped_log_count() -> int:
+    """Mensagens descartadas porque a fila do sink de fundo estava cheia."""
+    return _BACKGROUND_SINK.dropped if _BACKGROUND_SINK is not None else 0
@@ -0,0 +1,255 @@
+"""
+Painlevé II curvature signal shared by the KALDRA kernels.
+
+The Hastings–McLeod solution of Painlevé II,
+
+    q''(s) = s·q(s) + 2·q(s)³,   q(s) ~ Ai(s) (s → +∞),   q(s) ~ √(-s/2) (s → -∞),
+
+is the profile of the transition between the bulk (s ≪ 0) and the edge
+(s ≫ 0) of the spectrum; F_2(s) = exp(-∫_s^∞ (x - s)·q(x)² dx) is the
+Tracy–Widom distribution. Documents are placed on this axis by their
+Tracy–Widom edge statistic (see `tracy_widom.py`), and the
+`painleve_curvature` signal measures how sharply the profile bends from
+the bulk regime into the edge regime at that point:
+
+    κ(s) = |q'(s)| / |q'(s*)|,   s* the inflection point (q''(s*) = 0)
+
+κ is moderate in the calm bulk, reaches 1 at s* ≈ -0.7, just below the
+edge ("crise iminente"), and vanishes past it, where the Tracy–Widom
+anomaly takes over.
+
+The ODE is never solved at request time. `build_grid` solves the
+boundary-value problem once, offline, and stores q and q' on a dense
+uniform grid in `core/data/operators/painleve_hm_grid.npz`. At runtime q
+and q' come from cubic Hermite interpolation of that grid (q'' from the
+equation itself), for the whole batch at once; outside the grid the
+asymptotic expansions are used. Regenerate the artifact with
+`python -m kaldra.kernel.core.src.painleve` (needs SciPy).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .assets import register_asset
+from .tracy_widom import tracy_widom_batch
+
+GRID_PATH = Path(__file__).parent.parent / "data" / "operators" / "painleve_hm_grid.npz"
+FORMAT_VERSION = 1
+
+# Stored grid
+GRID_START = -12.0
+GRID_STOP = 8.0
+GRID_STEP = 0.01
+# The boundary-value problem is solved on a wider interval, where the
+# asymptotic boundary conditions are accurate
+SOLVE_START = -24.0
+SOLVE_STOP = 10.0
+
+# Tracy–Widom scale on which documents are placed (F_2 is built from q)
+EDGE_BETA = 2
+
+
+# --- Asymptotics ---
+
+def _left_asymptotic(s: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """q and q' for s → -∞: √(-s/2)·(1 + s⁻³/8 - 73·s⁻⁶/128)."""
+    root = np.sqrt(-s / 2.0)
+    correction = 1.0 + s ** -3 / 8.0 - 73.0 * s ** -6 / 128.0
+    d_root = -0.25 / root
+    d_correction = -3.0 * s ** -4 / 8.0 + 438.0 * s ** -7 / 128.0
+    return root * correction, d_root * correction + root * d_correction
+
+
+def _right_asymptotic(s: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """q ≈ Ai(s) and q' ≈ Ai'(s) for s → +∞ (leading order)."""
+    decay = np.exp(-(2.0 / 3.0) * s ** 1.5) / (2.0 * np.sqrt(np.pi))
+    return decay * s ** -0.25, -decay * s ** 0.25
+
+
+# --- Grid ---
+
+class HastingsMcLeodGrid:
+    """q and q' of the Hastings–McLeod solution on a uniform grid."""
+
+    def __init__(self, start: float, step: float, q: np.ndarray, dq: np.ndarray):
+        self.start = float(start)
+        self.step = float(step)
+        self.q = np.asarray(q, dtype=np.float64)
+        self.dq = np.asarray(dq, dtype=np.float64)
+        self.stop = self.start + self.step * (len(self.q) - 1)
+        # Continuity of the asymptotic branches with the grid ends
+        left_q, left_dq = _left_asymptotic(np.float64(self.start))
+        right_q, right_dq = _right_asymptotic(np.float64(self.stop))
+        self._left_scale = (self.q[0] / left_q, self.dq[0] / left_dq)
+        self._right_scale = (self.q[-1] / right_q, self.dq[-1] / right_dq)
+        # |q'| peaks at the inflection point of q
+        peak = int(np.argmax(np.abs(self.dq)))
+        self.inflection = self.start + self.step * peak
+        self.slope_peak = float(abs(self.dq[peak]))
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = GRID_PATH) -> "HastingsMcLeodGrid":
+        with np.load(path, allow_pickle=False) as artifact:
+            version = int(artifact["format_version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported Painlevé grid format version: {version}")
+            return cls(float(artifact["start"]), float(artifact["step"]), artifact["q"], artifact["dq"])
+
+    def save(self, path: Union[str, Path] = GRID_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            format_version=np.array(FORMAT_VERSION),
+            start=np.array(self.start),
+            step=np.array(self.step),
+            q=self.q,
+            dq=self.dq,
+        )
+        return path
+
+    def evaluate(self, s: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(q, q', q'') at every point of `s`."""
+        s = np.asarray(s, dtype=np.float64)
+        position = (np.clip(s, self.start, self.stop) - self.start) / self.step
+        index = np.minimum(position.astype(np.intp), len(self.q) - 2)
+        t = position - index
+        h = self.step
+        q0, q1 = self.q[index], self.q[index + 1]
+        d0, d1 = self.dq[index], self.dq[index + 1]
+
+        # Cubic Hermite interpolation from values and slopes
+        t2, t3 = t * t, t * t * t
+        q = (2 * t3 - 3 * t2 + 1) * q0 + (t3 - 2 * t2 + t) * h * d0 + (-2 * t3 + 3 * t2) * q1 + (t3 - t2) * h * d1
+        dq = ((6 * t2 - 6 * t) * (q0 - q1)) / h + (3 * t2 - 4 * t + 1) * d0 + (3 * t2 - 2 * t) * d1
+
+        below, above = s < self.start, s > self.stop
+        if np.any(below):
+            left_q, left_dq = _left_asymptotic(np.minimum(s, self.start))
+            q = np.where(below, left_q * self._left_scale[0], q)
+            dq = np.where(below, left_dq * self._left_scale[1], dq)
+        if np.any(above):
+            right_q, right_dq = _right_asymptotic(np.maximum(s, self.stop))
+            q = np.where(above, right_q * self._right_scale[0], q)
+            dq = np.where(above, right_dq * self._right_scale[1], dq)
+        return q, dq, s * q + 2.0 * q ** 3
+
+
+def build_grid(
+    start: float = GRID_START,
+    stop: float = GRID_STOP,
+    step: float = GRID_STEP,
+    tolerance: float = 1e-12,
+) -> HastingsMcLeodGrid:
+    """Solves the Hastings–McLeod boundary-value problem and samples it on the grid."""
+    from scipy.integrate import solve_bvp
+    from scipy.special import airy
+
+    def equation(s, y):
+        return np.vstack([y[1], s * y[0] + 2.0 * y[0] ** 3])
+
+    def boundary(ya, yb):
+        return np.array([ya[0] - _left_asymptotic(np.float64(SOLVE_START))[0], yb[0] - airy(SOLVE_STOP)[0]])
+
+    mesh = np.linspace(SOLVE_START, SOLVE_STOP, 4001)
+    # Initial guess: the two asymptotic regimes glued at 0
+    guess = np.sqrt(np.maximum(-mesh / 2.0, 0.0)) + np.where(mesh > 0, airy(mesh)[0], 0.0)
+    solution = solve_bvp(
+        equation, boundary, mesh, np.vstack([guess, np.gradient(guess, mesh)]),
+        tol=tolerance, max_nodes=1_000_000,
+    )
+    if not solution.success:
+        raise RuntimeError(f"Hastings–McLeod solve failed: {solution.message}")
+
+    grid = np.round(np.arange(start, stop + step / 2, step), 10)
+    q, dq = solution.sol(grid)
+    return HastingsMcLeodGrid(start, step, q, dq)
+
+
+def _load_grid() -> HastingsMcLeodGrid:
+    if GRID_PATH.exists():
+        return HastingsMcLeodGrid.load(GRID_PATH)
+    # Missing artifact: solve once (needs SciPy) and keep it
+    grid = build_grid()
+    try:
+        grid.save(GRID_PATH)
+    except OSError:
+        pass
+    return grid
+
+
+# Loaded on first use (see assets.py)
+_GRID = register_asset("painleve_hm_grid", _load_grid)
+
+
+def get_grid() -> HastingsMcLeodGrid:
+    return _GRID.get()
+
+
+def hastings_mcleod(s: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(q, q', q'') of the Hastings–McLeod solution, vectorized over `s`."""
+    return get_grid().evaluate(s)
+
+
+def painleve_curvature(s: np.ndarray) -> np.ndarray:
+    """Normalized curvature κ(s) ∈ [0, 1] of the Hastings–McLeod profile."""
+    _, dq, _ = hastings_mcleod(s)
+    return _normalized_curvature(dq)
+
+
+def _normalized_curvature(dq: np.ndarray) -> np.ndarray:
+    return np.minimum(np.abs(dq) / get_grid().slope_peak, 1.0)
+
+
+# --- Batch engine ---
+
+@dataclass(frozen=True)
+class PainleveState:
+    """Position on the Painlevé II axis and the curvature signal; arrays of shape (N,)."""
+
+    s: np.ndarray
+    q: np.ndarray
+    dq: np.ndarray
+    d2q: np.ndarray
+
+    @property
+    def curvature(self) -> np.ndarray:
+        """The `painleve_curvature` signal, in [0, 1]."""
+        return _normalized_curvature(self.dq)
+
+
+def painleve_batch(
+    delta12: Optional[np.ndarray] = None,
+    statistic: Optional[np.ndarray] = None,
+    coupling: Optional[np.ndarray] = None,
+) -> PainleveState:
+    """
+    Painlevé II state of a batch.
+
+    Args:
+        delta12: (N, 12) Δ12 matrix, placed on the axis by its Tracy–Widom
+            edge statistic (TW_2 scale).
+        statistic: precomputed edge statistics (N,), used instead of delta12
+            (e.g. `TWAnomaly.statistic` of a β=2 run).
+        coupling: optional coupling stack forwarded to the Tracy–Widom engine.
+    """
+    if statistic is None:
+        if delta12 is None and coupling is None:
+            raise ValueError("Either delta12, coupling or statistic must be given.")
+        statistic = tracy_widom_batch(delta12, coupling=coupling, beta=EDGE_BETA).statistic
+    s = np.asarray(statistic, dtype=np.float64)
+    q, dq, d2q = hastings_mcleod(s)
+    return PainleveState(s, q, dq, d2q)
+
+
+if __name__ == "__main__":
+    import sys
+
+    destination = Path(sys.argv[1]) if len(sys.argv) > 1 else GRID_PATH
+    out = build_grid().save(destination)
+    print(f"Hastings–McLeod grid saved to: {out}")
@@ -0,0 +1,302 @@
+"""
+Vectorized 3–6–9 state-machine engine shared by the KALDRA kernels.
+
+Every kernel tracks entities (tickers, regions, brands) whose narrative
+state evolves through the 3–6–9 motor: each new observation of an entity
+falls in one phase,
+
+    3 — entropy (calm bulk of the spectrum)
+    6 — modulation (steep Painlevé II profile just below the edge)
+    9 — collapse (significant Tracy–Widom anomaly)
+
+and the phase moves the entity along its kernel's transition table. A
+kernel only supplies a `StateMachineSpec`: its state names, the next state
+for every (phase, state) pair and an optional minimum dwell per state
+(steps an entity must stay in a state before leaving it, a hysteresis
+against flapping).
+
+`StateMachine` keeps the entities in compact arrays (int8 state, uint32
+dwell and step counters) indexed by a dict of entity ids, and advances a
+whole batch of observations with array operations: a batch that mentions
+an entity several times is applied in order, one vectorized round per
+repetition. Snapshots are a single `.npz` file and restore in one read.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .painleve import painleve_batch
+from .tracy_widom import get_tables, tracy_widom_batch
+
+PHASES = (3, 6, 9)
+FORMAT_VERSION = 1
+
+# Defaults of `phases_from_delta12`
+SIGNIFICANCE = 0.01
+CURVATURE_THRESHOLD = 0.95
+
+_INITIAL_CAPACITY = 256
+
+
+# --- Phases ---
+
+def phase_indices(phases: Union[Sequence[int], np.ndarray]) -> np.ndarray:
+    """Maps phases 3/6/9 to rows 0/1/2 of the transition table."""
+    phases = np.asarray(phases)
+    indices = phases // 3 - 1
+    if phases.size and (np.any(phases % 3 != 0) or indices.min() < 0 or indices.max() >= len(PHASES)):
+        raise ValueError(f"Phases must be in {PHASES}.")
+    return indices.astype(np.intp)
+
+
+def phases_from_signals(
+    p_value: np.ndarray,
+    curvature: np.ndarray,
+    significance: float = SIGNIFICANCE,
+    curvature_threshold: float = CURVATURE_THRESHOLD,
+) -> np.ndarray:
+    """Phase of each observation from its Tracy–Widom p-value and Painlevé curvature."""
+    phases = np.full(np.shape(p_value), 3, dtype=np.int8)
+    phases[np.asarray(curvature) >= curvature_threshold] = 6
+    phases[np.asarray(p_value) < significance] = 9
+    return phases
+
+
+def phases_from_delta12(
+    delta12: np.ndarray,
+    significance: float = SIGNIFICANCE,
+    curvature_threshold: float = CURVATURE_THRESHOLD,
+) -> np.ndarray:
+    """
+    Phases of a Δ12 batch (N, 12). The spectrum is computed once: the TW_1
+    p-value and the TW_2 position used by the Painlevé curvature both come
+    from the same λ_max.
+    """
+    edge = tracy_widom_batch(delta12, beta=1)
+    statistic = get_tables().delta12_edge(beta=2).standardize(edge.lambda_max)
+    curvature = painleve_batch(statistic=statistic).curvature
+    return phases_from_signals(edge.p_value, curvature, significance, curvature_threshold)
+
+
+# --- Specification ---
+
+@dataclass(frozen=True)
+class StateMachineSpec:
+    """
+    States and transition parameters of one kernel.
+
+    `transitions[p, s]` is the state that phase PHASES[p] leads to from
+    state s, shape (3, S); `min_dwell[s]` the steps an entity must spend in
+    s before any transition out of it. New entities start in `states[0]`.
+    """
+
+    states: Tuple[str, ...]
+    transitions: np.ndarray
+    min_dwell: np.ndarray
+
+    def __post_init__(self):
+        n_states = len(self.states)
+        if not 0 < n_states <= np.iinfo(np.int8).max:
+            raise ValueError("A state machine needs between 1 and 127 states.")
+        if self.transitions.shape != (len(PHASES), n_states):
+            raise ValueError(f"transitions must have shape ({len(PHASES)}, {n_states}).")
+        if self.transitions.min() < 0 or self.transitions.max() >= n_states:
+            raise ValueError("transitions reference an unknown state.")
+        if self.min_dwell.shape != (n_states,):
+            raise ValueError(f"min_dwell must have shape ({n_states},).")
+
+    @classmethod
+    def from_transitions(
+        cls,
+        states: Sequence[str],
+        transitions: Mapping[int, Mapping[str, str]],
+        min_dwell: Optional[Mapping[str, int]] = None,
+    ) -> "StateMachineSpec":
+        """
+        Compiles a readable spec: `transitions[phase][state] = next_state`.
+        Pairs left out keep the entity in its current state.
+        """
+        states = tuple(states)
+        index = {state: position for position, state in enumerate(states)}
+        table = np.tile(np.arange(len(states), dtype=np.int8), (len(PHASES), 1))
+        for phase, moves in transitions.items():
+            row = int(phase_indices([phase])[0])
+            for source, target in moves.items():
+                table[row, index[source]] = index[target]
+        dwell = np.zeros(len(states), dtype=np.uint32)
+        for state, steps in (min_dwell or {}).items():
+            dwell[index[state]] = steps
+        return cls(states, table, dwell)
+
+    def state_index(self, state: str) -> int:
+        return self.states.index(state)
+
+
+# --- Engine ---
+
+class StateMachine:
+    """Current state of many entities, advanced in vectorized batches."""
+
+    def __init__(self, spec: StateMachineSpec, capacity: int = _INITIAL_CAPACITY):
+        self.spec = spec
+        self._index: Dict[str, int] = {}
+        self._ids: list = []
+        capacity = max(1, capacity)
+        self._state = np.zeros(capacity, dtype=np.int8)
+        self._dwell = np.zeros(capacity, dtype=np.uint32)
+        self._steps = np.zeros(capacity, dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._index
+
+    @property
+    def entity_ids(self) -> Tuple[str, ...]:
+        return tuple(self._ids)
+
+    # Entity rows
+
+    def _grow(self, size: int) -> None:
+        capacity = len(self._state)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_state", "_dwell", "_steps"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def rows_for(self, entity_ids: Sequence[str], create: bool = True) -> np.ndarray:
+        """Row of each entity (N,); unknown entities are added (or get -1 with create=False)."""
+        lookup = {}
+        for entity_id in set(entity_ids):
+            row = self._index.get(entity_id)
+            if row is None and create:
+                row = self._index[entity_id] = len(self._ids)
+                self._ids.append(entity_id)
+            lookup[entity_id] = -1 if row is None else row
+        self._grow(len(self._ids))
+        return np.fromiter(map(lookup.__getitem__, entity_ids), dtype=np.intp, count=len(entity_ids))
+
+    # Stepping
+
+    def step(
+        self, entity_ids: Sequence[str], phases: Union[Sequence[int], np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Applies one observation per item, in order.
+
+        Args:
+            entity_ids: entity of each observation (N,); repetitions allowed.
+            phases: phase 3/6/9 of each observation (N,).
+
+        Returns:
+            (states, changed): state index after each observation (int8) and
+            whether that observation moved the entity to another state.
+        """
+        if len(entity_ids) != len(phases):
+            raise ValueError("entity_ids and phases must have the same length.")
+        phase_rows = phase_indices(phases)
+        rows = self.rows_for(entity_ids)
+        states = np.empty(len(rows), dtype=np.int8)
+        changed = np.zeros(len(rows), dtype=bool)
+        if not len(rows):
+            return states, changed
+
+        # Occurrence number of each item among the items of the same entity
+        order = np.argsort(rows, kind="stable")
+        sorted_rows = rows[order]
+        group_start = np.r_[0, np.flatnonzero(np.diff(sorted_rows)) + 1]
+        group_sizes = np.diff(np.r_[group_start, len(rows)])
+        occurrence = np.empty(len(rows), dtype=np.intp)
+        occurrence[order] = np.arange(len(rows)) - np.repeat(group_start, group_sizes)
+
+        spec = self.spec
+        for round_number in range(int(group_sizes.max())):
+            items = np.flatnonzero(occurrence == round_number) if group_sizes.max() > 1 else slice(None)
+            round_rows = rows[items]
+            current = self._state[round_rows]
+            proposed = spec.transitions[phase_rows[items], current]
+            moves = (proposed != current) & (self._dwell[round_rows] >= spec.min_dwell[current])
+            new_states = np.where(moves, proposed, current)
+
+            self._state[round_rows] = new_states
+            self._dwell[round_rows] = np.where(moves, 0, self._dwell[round_rows] + 1)
+            self._steps[round_rows] += 1
+            states[items] = new_states
+            changed[items] = moves
+        return states, changed
+
+    def step_delta12(
+        self, entity_ids: Sequence[str], delta12: np.ndarray, **phase_options
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """`step` with the phases derived from a Δ12 batch (see `phases_from_delta12`)."""
+        return self.step(entity_ids, phases_from_delta12(delta12, **phase_options))
+
+    # Queries
+
+    def states_of(self, entity_ids: Sequence[str]) -> np.ndarray:
+        """Current state index of each entity (-1 for unknown ones)."""
+        rows = self.rows_for(entity_ids, create=False)
+        states = np.full(len(rows), -1, dtype=np.int8)
+        known = rows >= 0
+        states[known] = self._state[rows[known]]
+        return states
+
+    def state_names(self, entity_ids: Sequence[str]) -> list:
+        names = np.asarray(self.spec.states + (None,), dtype=object)
+        return names[self.states_of(entity_ids)].tolist()
+
+    def counts(self) -> Dict[str, int]:
+        """Number of entities in each state."""
+        counts = np.bincount(self._state[:len(self)], minlength=len(self.spec.states))
+        return dict(zip(self.spec.states, counts.tolist()))
+
+    # Snapshots
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Writes every entity's state to one `.npz` (atomically: temporary file + rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = len(self)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                format_version=np.array(FORMAT_VERSION),
+                states=np.array(self.spec.states),
+                entity_ids=np.array(self._ids, dtype=str),
+                state=self._state[:size],
+                dwell=self._dwell[:size],
+                steps=self._steps[:size],
+            )
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], spec: StateMachineSpec) -> "StateMachine":
+        """Restores a snapshot written by `save` for the same state set."""
+        with np.load(path, allow_pickle=False) as snapshot:
+            version = int(snapshot["format_version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported state-machine snapshot format version: {version}")
+            if tuple(snapshot["states"].tolist()) != spec.states:
+                raise ValueError("Snapshot was saved with a different state set.")
+            entity_ids = snapshot["entity_ids"].tolist()
+            machine = cls(spec, capacity=max(len(entity_ids), _INITIAL_CAPACITY))
+            size = len(entity_ids)
+            machine._state[:size] = snapshot["state"]
+            machine._dwell[:size] = snapshot["dwell"]
+            machine._steps[:size] = snapshot["steps"]
+        machine._ids = entity_ids
+        machine._index = {entity_id: row for row, entity_id in enumerate(entity_ids)}
+        return machine
@@ -0,0 +1,357 @@
+"""
+Batched Tracy–Widom anomaly engine shared by the KALDRA kernels.
+
+Every document gets a symmetric 12×12 coupling matrix built from its Δ12
+vector (or a coupling supplied by the caller, e.g. a Δ144 field). The
+largest eigenvalues of the whole batch come from one stacked `eigvalsh`
+over `(N, 12, 12)`, are centred and scaled at the spectral edge and turned
+into p-values with the Tracy–Widom distribution:
+
+    s = (λ_max - location) / scale
+    p = 1 - F_β(s)
+
+F_1 and F_2 are never integrated at request time. `build_tables` evaluates
+them once, offline, as Fredholm determinants of the Airy kernels
+(Bornemann's Gauss–Legendre method) on a dense grid, and the log-CDF and
+log-survival tables are stored in `core/data/operators/tracy_widom_tables.npz`.
+Lookups are linear interpolations on the uniform grid; beyond its upper
+end the survival function follows the Tracy–Widom tail asymptotics.
+
+The same artifact stores the edge location and scale of the default Δ12
+coupling, matched to the Tracy–Widom mean and variance under an
+uninformative null (Δ12 drawn uniformly from the simplex). Regenerate it
+with `python -m kaldra.kernel.core.src.tracy_widom` (needs SciPy).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from .assets import register_asset
+from .delta144_dynamic import coupling_field
+
+N_ARCHETYPES = 12
+TABLES_PATH = Path(__file__).parent.parent / "data" / "operators" / "tracy_widom_tables.npz"
+FORMAT_VERSION = 1
+
+# Grid of the precomputed tables
+TABLE_START = -12.0
+TABLE_STOP = 10.0
+TABLE_STEP = 0.01
+
+# Mean and variance of TW_β (Bornemann 2010)
+TW_MOMENTS = {
+    1: (-1.2065335745820, 1.6077810345810),
+    2: (-1.7710868074116, 0.8131947928329),
+}
+SUPPORTED_BETAS = (1, 2)
+
+# Null sample used to calibrate the edge of the default coupling
+NULL_SAMPLE_SIZE = 200_000
+NULL_SEED = 0
+
+
+# --- Coupling matrices and spectra ---
+
+def coupling_matrices(delta12: np.ndarray) -> np.ndarray:
+    """
+    Symmetric coupling matrices of a Δ12 batch, shape (N, 12, 12).
+
+    With d = 12·δ - 1 (each archetype's excess over the uniform share), the
+    off-diagonal entries d_i·d_j are the co-activation of archetype pairs
+    and the diagonal √2·d_i their self-coupling, all divided by √12 (the
+    Gaussian-ensemble normalization). A uniform Δ12 gives the zero matrix.
+    This is the float64 view of the Δ144 field (see `delta144_dynamic.py`).
+    """
+    return coupling_field(delta12, dtype=np.float64)
+
+
+def largest_eigenvalues(matrices: np.ndarray) -> np.ndarray:
+    """Largest eigenvalue of each symmetric matrix in an (N, n, n) stack."""
+    matrices = np.asarray(matrices)
+    if matrices.ndim != 3 or matrices.shape[1] != matrices.shape[2]:
+        raise ValueError("matrices must be a stack of square matrices, shape (N, n, n).")
+    if matrices.shape[0] == 0:
+        return np.empty(0, dtype=np.float64)
+    return np.linalg.eigvalsh(matrices)[:, -1]
+
+
+@dataclass(frozen=True)
+class EdgeScaling:
+    """Centring and scaling of λ_max onto the Tracy–Widom variable."""
+
+    location: float
+    scale: float
+
+    @classmethod
+    def gaussian(cls, n: int, sigma: float = 1.0) -> "EdgeScaling":
+        """Soft edge of an n×n Gaussian ensemble with off-diagonal variance σ²."""
+        return cls(2.0 * np.sqrt(n) * sigma, n ** (-1.0 / 6.0) * sigma)
+
+    @classmethod
+    def fit(cls, reference: np.ndarray, beta: int = 1) -> "EdgeScaling":
+        """Matches the mean and variance of reference λ_max values to TW_β."""
+        mean, variance = TW_MOMENTS[_check_beta(beta)]
+        reference = np.asarray(reference, dtype=np.float64)
+        scale = reference.std() / np.sqrt(variance)
+        return cls(float(reference.mean() - mean * scale), float(scale))
+
+    def standardize(self, lambda_max: np.ndarray) -> np.ndarray:
+        return (np.asarray(lambda_max, dtype=np.float64) - self.location) / self.scale
+
+
+def _check_beta(beta: int) -> int:
+    if beta not in SUPPORTED_BETAS:
+        raise ValueError(f"Unsupported beta {beta!r}; use one of {SUPPORTED_BETAS}.")
+    return beta
+
+
+# --- Precomputed distribution tables ---
+
+def _log_tail_asymptotic(s: np.ndarray, beta: int) -> np.ndarray:
+    """Leading-order log(1 - F_β(s)) for large s."""
+    if beta == 1:
+        return -(2.0 / 3.0) * s ** 1.5 - 0.75 * np.log(s) - np.log(4.0 * np.sqrt(np.pi))
+    return -(4.0 / 3.0) * s ** 1.5 - 1.5 * np.log(s) - np.log(16.0 * np.pi)
+
+
+class TracyWidomTables:
+    """Interpolated log-CDF and log-survival functions of TW_1 and TW_2."""
+
+    def __init__(
+        self,
+        start: float,
+        step: float,
+        log_cdf: np.ndarray,
+        log_sf: np.ndarray,
+        edge_location: np.ndarray,
+        edge_scale: np.ndarray,
+    ):
+        self.start = float(start)
+        self.step = float(step)
+        # Row β-1 holds the table of TW_β
+        self.log_cdf = np.asarray(log_cdf, dtype=np.float64)
+        self.log_sf = np.asarray(log_sf, dtype=np.float64)
+        self.edge_location = np.asarray(edge_location, dtype=np.float64)
+        self.edge_scale = np.asarray(edge_scale, dtype=np.float64)
+        self.stop = self.start + self.step * (self.log_cdf.shape[1] - 1)
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = TABLES_PATH) -> "TracyWidomTables":
+        with np.load(path, allow_pickle=False) as artifact:
+            version = int(artifact["format_version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported Tracy–Widom table format version: {version}")
+            return cls(
+                float(artifact["start"]),
+                float(artifact["step"]),
+                artifact["log_cdf"],
+                artifact["log_sf"],
+                artifact["edge_location"],
+                artifact["edge_scale"],
+            )
+
+    def save(self, path: Union[str, Path] = TABLES_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            format_version=np.array(FORMAT_VERSION),
+            start=np.array(self.start),
+            step=np.array(self.step),
+            log_cdf=self.log_cdf,
+            log_sf=self.log_sf,
+            edge_location=self.edge_location,
+            edge_scale=self.edge_scale,
+        )
+        return path
+
+    def _interpolate(self, table: np.ndarray, s: np.ndarray) -> np.ndarray:
+        # Uniform grid: the cell index is computed directly, no search
+        position = (np.clip(s, self.start, self.stop) - self.start) / self.step
+        index = np.minimum(position.astype(np.intp), table.shape[0] - 2)
+        weight = position - index
+        return table[index] * (1.0 - weight) + table[index + 1] * weight
+
+    def log_survival(self, s: np.ndarray, beta: int = 1) -> np.ndarray:
+        """log(1 - F_β(s))."""
+        s = np.asarray(s, dtype=np.float64)
+        row = self.log_sf[_check_beta(beta) - 1]
+        result = self._interpolate(row, s)
+        above = s > self.stop
+        if np.any(above):
+            # Tail asymptotics, anchored to the last tabulated value
+            anchor = row[-1] - _log_tail_asymptotic(np.float64(self.stop), beta)
+            result = np.where(above, _log_tail_asymptotic(np.maximum(s, self.stop), beta) + anchor, result)
+        return np.where(s < self.start, 0.0, result)
+
+    def cdf(self, s: np.ndarray, beta: int = 1) -> np.ndarray:
+        """F_β(s)."""
+        s = np.asarray(s, dtype=np.float64)
+        result = np.exp(self._interpolate(self.log_cdf[_check_beta(beta) - 1], s))
+        result = np.where(s < self.start, 0.0, result)
+        return np.where(s > self.stop, -np.expm1(self.log_survival(s, beta)), result)
+
+    def sf(self, s: np.ndarray, beta: int = 1) -> np.ndarray:
+        """1 - F_β(s), accurate deep into the upper tail."""
+        return np.exp(self.log_survival(s, beta))
+
+    def delta12_edge(self, beta: int = 1) -> EdgeScaling:
+        """Edge scaling of `coupling_matrices` under the uninformative null."""
+        row = _check_beta(beta) - 1
+        return EdgeScaling(float(self.edge_location[row]), float(self.edge_scale[row]))
+
+
+def _fredholm_log_det(kernel: np.ndarray, weights: np.ndarray) -> float:
+    """log det(I - K) of a symmetric kernel discretized with quadrature `weights`."""
+    root = np.sqrt(weights)
+    eigenvalues = np.linalg.eigvalsh(root[:, None] * kernel * root[None, :])
+    return float(np.sum(np.log1p(-eigenvalues)))
+
+
+def _gauss_legendre(nodes: int, a: float, b: float):
+    x, w = np.polynomial.legendre.leggauss(nodes)
+    return 0.5 * (b - a) * x + 0.5 * (a + b), 0.5 * (b - a) * w
+
+
+def tw_log_cdf_exact(s: float, beta: int, nodes: int = 128) -> float:
+    """
+    log F_β(s) by quadrature of the Fredholm determinant (offline use only).
+
+    F_2(s) = det(I - K_Ai) on L²(s, ∞), K_Ai the Airy kernel;
+    F_1(s) = det(I - K_1) on L²(0, ∞), K_1(x, y) = Ai((x + y)/2 + s)/2.
+    """
+    from scipy.special import airy
+
+    # The Airy functions are negligible beyond ~12; the window always covers it
+    if _check_beta(beta) == 2:
+        x, w = _gauss_legendre(nodes, s, max(s + 16.0, 12.0))
+        ai, aip, _, _ = airy(x)
+        difference = x[:, None] - x[None, :]
+        np.fill_diagonal(difference, 1.0)
+        kernel = (ai[:, None] * aip[None, :] - aip[:, None] * ai[None, :]) / difference
+        np.fill_diagonal(kernel, aip ** 2 - x * ai ** 2)
+    else:
+        x, w = _gauss_legendre(nodes, 0.0, max(16.0, 12.0 - s))
+        kernel = 0.5 * airy(0.5 * (x[:, None] + x[None, :]) + s)[0]
+    return _fredholm_log_det(kernel, w)
+
+
+def build_tables(
+    start: float = TABLE_START,
+    stop: float = TABLE_STOP,
+    step: float = TABLE_STEP,
+    null_size: int = NULL_SAMPLE_SIZE,
+) -> TracyWidomTables:
+    """Evaluates F_1 and F_2 on the grid and calibrates the default edge."""
+    grid = np.round(np.arange(start, stop + step / 2, step), 10)
+    log_cdf = np.empty((len(SUPPORTED_BETAS), len(grid)))
+    for row, beta in enumerate(SUPPORTED_BETAS):
+        nodes = 128 if beta == 2 else 192
+        log_cdf[row] = [tw_log_cdf_exact(s, beta, nodes) for s in grid]
+    # log(1 - F) from log F without cancellation in the upper tail
+    log_sf = np.log(-np.expm1(np.minimum(log_cdf, -np.finfo(float).tiny)))
+
+    rng = np.random.default_rng(NULL_SEED)
+    null_lambda = largest_eigenvalues(coupling_matrices(rng.dirichlet(np.ones(N_ARCHETYPES), null_size)))
+    edges = [EdgeScaling.fit(null_lambda, beta) for beta in SUPPORTED_BETAS]
+    return TracyWidomTables(
+        start, step, log_cdf, log_sf,
+        np.array([edge.location for edge in edges]),
+        np.array([edge.scale for edge in edges]),
+    )
+
+
+def _load_tables() -> TracyWidomTables:
+    if TABLES_PATH.exists():
+        return TracyWidomTables.load(TABLES_PATH)
+    # Missing artifact: build it once (slow, needs SciPy) and keep it
+    tables = build_tables()
+    try:
+        tables.save(TABLES_PATH)
+    except OSError:
+        pass
+    return tables
+
+
+# Loaded on first use (see assets.py)
+_TABLES = register_asset("tracy_widom_tables", _load_tables)
+
+
+def get_tables() -> TracyWidomTables:
+    return _TABLES.get()
+
+
+def tw_cdf(s: np.ndarray, beta: int = 1) -> np.ndarray:
+    """Tracy–Widom CDF F_β(s), from the precomputed tables."""
+    return get_tables().cdf(s, beta)
+
+
+def tw_sf(s: np.ndarray, beta: int = 1) -> np.ndarray:
+    """Tracy–Widom survival function 1 - F_β(s), from the precomputed tables."""
+    return get_tables().sf(s, beta)
+
+
+# --- Batch engine ---
+
+@dataclass(frozen=True)
+class TWAnomaly:
+    """Tracy–Widom edge statistics of a batch; all arrays have shape (N,)."""
+
+    lambda_max: np.ndarray
+    statistic: np.ndarray
+    p_value: np.ndarray
+
+    @property
+    def anomaly(self) -> np.ndarray:
+        """The `anomaly_TW` signal: F_β(s) = 1 - p, in [0, 1]."""
+        return 1.0 - self.p_value
+
+    def flags(self, significance: float) -> np.ndarray:
+        """Documents whose spectral edge is significant at `significance`."""
+        return self.p_value < significance
+
+
+def tracy_widom_batch(
+    delta12: Optional[np.ndarray] = None,
+    coupling: Optional[np.ndarray] = None,
+    beta: int = 1,
+    edge: Optional[EdgeScaling] = None,
+) -> TWAnomaly:
+    """
+    Tracy–Widom anomaly statistics for a batch.
+
+    Args:
+        delta12: (N, 12) Δ12 matrix; its `coupling_matrices` are used unless
+            `coupling` is given.
+        coupling: optional (N, n, n) stack of symmetric coupling matrices.
+        beta: 1 (real symmetric couplings, GOE) or 2 (GUE).
+        edge: edge centring and scaling. Defaults to the calibrated edge of
+            the Δ12 coupling, or to the Gaussian-ensemble edge for an
+            external coupling.
+    """
+    tables = get_tables()
+    if coupling is None:
+        if delta12 is None:
+            raise ValueError("Either delta12 or coupling must be given.")
+        coupling = coupling_matrices(delta12)
+        if edge is None:
+            edge = tables.delta12_edge(beta)
+    elif edge is None:
+        edge = EdgeScaling.gaussian(np.shape(coupling)[-1])
+
+    lambda_max = largest_eigenvalues(coupling)
+    statistic = edge.standardize(lambda_max)
+    return TWAnomaly(lambda_max, statistic, tables.sf(statistic, beta))
+
+
+if __name__ == "__main__":
+    import sys
+
+    destination = Path(sys.argv[1]) if len(sys.argv) > 1 else TABLES_PATH
+    out = build_tables().save(destination)
+    print(f"Tracy–Widom tables saved to: {out}")
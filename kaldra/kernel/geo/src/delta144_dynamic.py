@@ -1,6 +1,27 @@
 """
 KALDRA-GEO v0.6 — módulo delta144_dynamic
 
-Stub inicial. A lógica será implementada na fase seguinte do desenvolvimento.
+Campo de acoplamento Δ144 dinâmico do kernel geopolítico: para cada documento, as
+TOP_K células 12×12 mais fortes, em forma esparsa.
+
+Adaptador fino sobre o operador compartilhado
+(`kernel/core/src/delta144_dynamic.py`), vetorizado sobre o lote inteiro.
 """
-# TODO: implementar lógica do módulo delta144_dynamic para o kernel geopolítico.
+
+from __future__ import annotations
+
+import numpy as np
+
+from ...core.src.delta144_dynamic import SparseDelta144, coupling_field, delta144_topk
+
+TOP_K = 8
+
+
+def delta144_field(delta12: np.ndarray) -> np.ndarray:
+    """Campo denso (N, 12, 12) em float32."""
+    return coupling_field(delta12)
+
+
+def delta144_couplings(delta12: np.ndarray, k: int = TOP_K) -> SparseDelta144:
+    """Os k acoplamentos mais fortes de cada documento, arrays (N, k)."""
+    return delta144_topk(delta12, k)
@@ -1,6 +1,50 @@
 """
 KALDRA-GEO v0.6 — módulo geo_state_machine
 
-Stub inicial. A lógica será implementada na fase seguinte do desenvolvimento.
+Máquina de estados geopolítica: o estado de cada região evolui via
+3 → 6 → 9 a cada declaração analisada, ao longo da escada
+COOPERATION → TENSION → COMPETITION → HOSTILITY → CRISIS → REORDERING.
+
+- 3 (entropia do discurso): desescalada de um degrau; a crise se reordena;
+- 6 (modulação simbólica): escalada de um degrau até a competição;
+- 9 (colapso narrativo): escalada brusca em direção à crise.
+
+Apenas estados e transições são definidos aqui; as regiões são mantidas e
+avançadas em lote pelo motor compartilhado (`kernel/core/src/state_machine.py`).
 """
-# TODO: implementar máquina de estados geopolítica (cooperation/tension/competition/hostility/crisis/reordering).
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Union
+
+from ...core.src.state_machine import StateMachine, StateMachineSpec
+
+STATES = ("COOPERATION", "TENSION", "COMPETITION", "HOSTILITY", "CRISIS", "REORDERING")
+
+TRANSITIONS = {
+    3: {
+        "TENSION": "COOPERATION", "COMPETITION": "TENSION", "HOSTILITY": "COMPETITION",
+        "CRISIS": "REORDERING", "REORDERING": "COOPERATION",
+    },
+    6: {"COOPERATION": "TENSION", "TENSION": "COMPETITION", "REORDERING": "TENSION"},
+    9: {
+        "COOPERATION": "COMPETITION", "TENSION": "HOSTILITY", "COMPETITION": "HOSTILITY",
+        "HOSTILITY": "CRISIS", "REORDERING": "CRISIS",
+    },
+}
+
+# Crises e reordenações não se desfazem na declaração seguinte
+MIN_DWELL = {"CRISIS": 2, "REORDERING": 1}
+
+SPEC = StateMachineSpec.from_transitions(STATES, TRANSITIONS, MIN_DWELL)
+
+
+def new_state_machine() -> StateMachine:
+    """Máquina vazia; entidades novas começam em COOPERATION."""
+    return StateMachine(SPEC)
+
+
+def load_state_machine(path: Union[str, Path]) -> StateMachine:
+    """Restaura um snapshot salvo com `StateMachine.save`."""
+    return StateMachine.load(path, SPEC)
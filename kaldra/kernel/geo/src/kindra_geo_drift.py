@@ -1,6 +1,29 @@
 """
 KALDRA-GEO v0.6 — módulo kindra_geo_drift
 
-Stub inicial. A lógica será implementada na fase seguinte do desenvolvimento.
+Monitor de drift cultural/arquetípico online do kernel geopolítico: estatísticas
+incrementais de Δ12 por locale e por plano (declarações e coberturas por região), com PSI/KL por
+janela contra uma referência e callbacks para alertas.
+
+Adaptador fino sobre o motor compartilhado (`kernel/core/src/kindra_drift.py`).
 """
-# TODO: implementar lógica do módulo kindra_geo_drift para o kernel geopolítico.
+
+from __future__ import annotations
+
+from typing import Optional
+
+from ...core.src.kindra_drift import DriftMonitor, DriftReference
+
+WINDOW_SIZE = 1000
+PSI_THRESHOLD = 0.2
+KL_THRESHOLD = 0.1
+
+
+def new_drift_monitor(reference: Optional[DriftReference] = None) -> DriftMonitor:
+    """Monitor com os limiares do kernel; alimente-o com `observe(delta12, labels, locales, plans)`."""
+    return DriftMonitor(
+        window_size=WINDOW_SIZE,
+        psi_threshold=PSI_THRESHOLD,
+        kl_threshold=KL_THRESHOLD,
+        reference=reference,
+    )
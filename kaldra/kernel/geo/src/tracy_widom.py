@@ -1,6 +1,37 @@
 """
 KALDRA-GEO v0.6 — módulo tracy_widom
 
-Stub inicial. A lógica será implementada na fase seguinte do desenvolvimento.
+Sinal `anomaly_TW` do kernel geopolítico: rupturas, declarações extremas
+e mudanças abruptas aparecem como um autovalor dominante da matriz de
+acoplamento acima da borda Tracy–Widom.
+
+Adaptador fino sobre o motor compartilhado (`kernel/core/src/tracy_widom.py`).
 """
-# TODO: implementar lógica do módulo tracy_widom para o kernel geopolítico.
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from ...core.src.tracy_widom import TWAnomaly, tracy_widom_batch
+
+# Acoplamentos reais simétricos: ensemble ortogonal (β=1)
+BETA = 1
+# Declarações com p-valor abaixo deste nível são sinalizadas
+SIGNIFICANCE = 0.01
+
+
+def anomaly_tw(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> TWAnomaly:
+    """Estatística TW, p-valor e sinal `anomaly_TW` de um lote Δ12 (N, 12)."""
+    return tracy_widom_batch(delta12, coupling=coupling, beta=BETA)
+
+
+def anomaly_signal(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> np.ndarray:
+    """Apenas o sinal `anomaly_TW` (N,), em [0, 1]."""
+    return anomaly_tw(delta12, coupling).anomaly
+
+
+def anomaly_flags(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> np.ndarray:
+    """Máscara (N,) dos itens com p-valor TW abaixo de SIGNIFICANCE."""
+    return anomaly_tw(delta12, coupling).flags(SIGNIFICANCE)
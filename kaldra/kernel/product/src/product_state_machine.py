@@ -1,6 +1,42 @@
 """
 KALDRA-FOR-PRODUCT v0.6 — módulo product_state_machine
 
-Stub inicial. A lógica será implementada em etapas posteriores.
+Máquina de estados de marca: o estado de cada marca evolui via 3 → 6 → 9 a
+cada texto analisado (campanhas, avaliações, menções).
+
+- 3 (entropia): a narrativa da marca se estabiliza ou se recupera;
+- 6 (modulação): a marca entra em evidência (BUZZ);
+- 9 (colapso): desgaste e, se persistir, crise de marca.
+
+Apenas estados e transições são definidos aqui; as marcas são mantidas e
+avançadas em lote pelo motor compartilhado (`kernel/core/src/state_machine.py`).
 """
-# TODO: implementar product_state_machine para o kernel de produto & marca.
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Union
+
+from ...core.src.state_machine import StateMachine, StateMachineSpec
+
+STATES = ("STABLE", "BUZZ", "EROSION", "CRISIS", "RECOVERY")
+
+TRANSITIONS = {
+    3: {"BUZZ": "STABLE", "EROSION": "RECOVERY", "CRISIS": "RECOVERY", "RECOVERY": "STABLE"},
+    6: {"STABLE": "BUZZ"},
+    9: {"STABLE": "EROSION", "BUZZ": "EROSION", "EROSION": "CRISIS", "RECOVERY": "EROSION"},
+}
+
+MIN_DWELL = {"CRISIS": 2}
+
+SPEC = StateMachineSpec.from_transitions(STATES, TRANSITIONS, MIN_DWELL)
+
+
+def new_state_machine() -> StateMachine:
+    """Máquina vazia; entidades novas começam em STABLE."""
+    return StateMachine(SPEC)
+
+
+def load_state_machine(path: Union[str, Path]) -> StateMachine:
+    """Restaura um snapshot salvo com `StateMachine.save`."""
+    return StateMachine.load(path, SPEC)
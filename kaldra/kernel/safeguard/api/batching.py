@@ -0,0 +1,150 @@
+"""
+Micro-batching assíncrono para o endpoint /bias/detect.
+
+Requisições concorrentes de um único texto são acumuladas por uma janela
+curta (alguns milissegundos) ou até atingir o tamanho máximo do lote, e então
+processadas por uma única chamada vetorizada da pipeline em um executor.
+Cada requisição recebe apenas o seu próprio resultado.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..src.cache import cached_analyze_batch
+from ...core.src.logging_config import get_logger
+from ..src.pipeline import normalize_fields
+from ..src.settings import BiasSettings, get_settings
+
+# (text, locale, fields, future)
+_PendingItem = Tuple[str, str, Optional[frozenset], "asyncio.Future[dict]"]
+
+
+class MicroBatcher:
+    """
+    Despachante que transforma N chamadas unitárias em poucos lotes.
+
+    O worker é iniciado na primeira submissão, dentro do event loop ativo.
+    """
+
+    def __init__(
+        self,
+        window_ms: float = 5.0,
+        max_batch_size: int = 64,
+        workers: int = 2,
+        settings: Optional[BiasSettings] = None,
+    ):
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.settings = settings
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+
+    @classmethod
+    def from_settings(cls, settings: Optional[BiasSettings] = None) -> "MicroBatcher":
+        if settings is None:
+            settings = get_settings()
+        return cls(
+            window_ms=settings.microbatch_window_ms,
+            max_batch_size=settings.microbatch_max_size,
+            workers=settings.microbatch_workers,
+            settings=settings,
+        )
+
+    def _ensure_started(self) -> None:
+        if self._worker is None or self._worker.done():
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="kaldra-microbatch"
+                )
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._collect_forever())
+
+    async def submit(
+        self, text: str, locale: str = "pt-BR", fields: Optional[Iterable[str]] = None
+    ) -> dict:
+        """Enfileira um texto e aguarda o resultado do lote correspondente."""
+        fields = normalize_fields(fields)
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, locale, fields, future))
+        return await future
+
+    async def _collect_batch(self) -> List[_PendingItem]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.window_seconds
+
+        while len(batch) < self.max_batch_size:
+            # Drena o que já está na fila sem ceder o loop
+            while not self._queue.empty() and len(batch) < self.max_batch_size:
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - loop.time()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _collect_forever(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            # O próximo lote é coletado enquanto este roda no executor
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    def _run_batch(self, texts: List[str], locales: List[str], fields: Optional[frozenset]) -> List[dict]:
+        return cached_analyze_batch(texts, locale=locales, settings=self.settings, fields=fields)
+
+    async def _dispatch(self, batch: List[_PendingItem]) -> None:
+        loop = asyncio.get_running_loop()
+
+        # analyze_batch aceita um locale por item, mas uma única seleção de campos
+        groups: Dict[Optional[frozenset], List[_PendingItem]] = {}
+        for item in batch:
+            groups.setdefault(item[2], []).append(item)
+
+        for fields, items in groups.items():
+            # Requisições canceladas (cliente desconectou) não são processadas
+            items = [item for item in items if not item[3].done()]
+            if not items:
+                continue
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._run_batch,
+                    [item[0] for item in items], [item[1] for item in items], fields,
+                )
+            except Exception as exc:
+                get_logger().exception("Error in KALDRA-Bias micro-batch dispatch")
+                for *_, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            for (*_, future), result in zip(items, results):
+                result.pop("input_index", None)
+                if not future.done():
+                    future.set_result(result)
+
+    async def stop(self) -> None:
+        """Interrompe o coletor, aguarda lotes em andamento e libera o executor."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
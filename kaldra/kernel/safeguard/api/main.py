@@ -1,28 +1,55 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any, List
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
-from ..src.pipeline import analyze_text, analyze_batch
-from ..src.logging_config import get_logger
+from ..src.cache import cached_analyze_batch
+from ...core.src.logging_config import get_logger
+from ..src.model_registry import get_registry
+from ..src.metrics import render_metrics
+from ..src.kindra_drift import freeze_reference, get_drift_monitor
+from ..src.longdoc import LongDocumentAnalyzer
+from ..src.parallel import shutdown_pool
+from ..src.pipeline import batch_locale_label, normalize_fields, normalize_locales, warmup
+from .batching import MicroBatcher
+from .streaming import NDJSONStreamingResponse, stream_batch_results
+
+logger = get_logger()
+
+# Groups concurrent /bias/detect calls into vectorized pipeline batches
+microbatcher = MicroBatcher.from_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await microbatcher.stop()
+    # Process pool used by large batches (KALDRA_PARALLEL_WORKERS > 1)
+    shutdown_pool()
 
 app = FastAPI(
     title="KALDRA-Bias API",
     description="API for detecting bias in text using the KALDRA-Bias model.",
     version="0.5.0",
+    lifespan=lifespan,
 )
 
-logger = get_logger()
-
 # --- Pydantic Models ---
 
 class InputPayload(BaseModel):
     text: str
     locale: str = "pt-BR"
+    # Subset of the output fields to compute and return (default: all)
+    fields: Optional[List[str]] = None
 
 class BatchInputPayload(BaseModel):
     texts: List[str]
     locale: str = "pt-BR"
+    # One locale per text (mixed-language batches); overrides `locale`
+    locales: Optional[List[str]] = None
+    fields: Optional[List[str]] = None
 
 class ExplanationLayers(BaseModel):
     human: str
@@ -35,17 +62,40 @@ class Signals(BaseModel):
     emotion_hint: str
     attack_target: str
 
+# Every field is optional so that `fields=` selections validate; the endpoints
+# use response_model_exclude_unset, so only the computed keys are serialized.
 class OutputPayload(BaseModel):
     input_index: Optional[int] = None
-    bias_score: Optional[float]
-    label: str
-    confidence: float
-    risk_level: str
-    dominant_archetype: str
-    plan: int
-    archetype_detail: Dict[str, Any]
-    explanation_layers: ExplanationLayers
-    signals: Signals
+    bias_score: Optional[float] = None
+    label: Optional[str] = None
+    confidence: Optional[float] = None
+    risk_level: Optional[str] = None
+    dominant_archetype: Optional[str] = None
+    plan: Optional[int] = None
+    archetype_detail: Optional[Dict[str, Any]] = None
+    explanation_layers: Optional[ExplanationLayers] = None
+    signals: Optional[Signals] = None
+    model_version: Optional[str] = None
+
+class DocumentOutputPayload(OutputPayload):
+    document: Dict[str, Any]
+    windows: Optional[List[Dict[str, Any]]] = None
+
+# --- Helpers ---
+
+def _validated_fields(fields: Optional[List[str]]) -> Optional[frozenset]:
+    try:
+        return normalize_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+def _validated_locales(payload: BatchInputPayload):
+    if payload.locales is None:
+        return payload.locale
+    try:
+        return normalize_locales(payload.locales, len(payload.texts))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
 
 # --- API Endpoints ---
 
@@ -53,8 +103,44 @@ class OutputPayload(BaseModel):
 def healthcheck():
     return {"status": "ok"}
 
-@app.post("/bias/detect", response_model=OutputPayload)
-def detect_bias(payload: InputPayload):
+@app.get("/ready")
+def readiness():
+    """Readiness probe: loads models and archetype assets on the first call."""
+    return {"status": "ready", **warmup()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Per-stage latency histograms and analysis counters (Prometheus text format)."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/drift")
+def drift():
+    """Online Δ12 drift per locale and plan: totals, open window and latest PSI/KL."""
+    return get_drift_monitor().describe()
+
+@app.post("/drift/reference")
+def freeze_drift_reference():
+    """Freezes the statistics accumulated so far as the drift reference."""
+    reference = freeze_reference()
+    return {"status": "frozen", "keys": len(reference.stats)}
+
+@app.get("/models")
+def list_models():
+    """Active scoring model and the versioned artifacts available on disk."""
+    return get_registry().describe()
+
+@app.post("/models/reload", status_code=202)
+def reload_models():
+    """
+    Loads the newest model artifact in the background and swaps it in once
+    ready; requests keep being served by the current model meanwhile.
+    """
+    get_registry().refresh_in_background()
+    return {"status": "reloading", **get_registry().describe()}
+
+@app.post("/bias/detect", response_model=OutputPayload, response_model_exclude_unset=True)
+async def detect_bias(payload: InputPayload):
+    fields = _validated_fields(payload.fields)
     text_preview = payload.text[:120] if payload.text else ""
     logger.info(
         "KALDRA-Bias /bias/detect called",
@@ -62,7 +148,7 @@ def detect_bias(payload: InputPayload):
     )
 
     try:
-        analysis_result = analyze_text(payload.text, locale=payload.locale)
+        analysis_result = await microbatcher.submit(payload.text, locale=payload.locale, fields=fields)
     except Exception as exc:
         logger.exception("Error in /bias/detect KALDRA-Bias analysis")
         raise HTTPException(
@@ -81,15 +167,17 @@ def detect_bias(payload: InputPayload):
 
     return OutputPayload(**analysis_result)
 
-@app.post("/bias/batch_detect", response_model=List[OutputPayload])
+@app.post("/bias/batch_detect", response_model=List[OutputPayload], response_model_exclude_unset=True)
 def detect_bias_batch(payload: BatchInputPayload):
+    fields = _validated_fields(payload.fields)
+    locale = _validated_locales(payload)
     logger.info(
         "KALDRA-Bias /bias/batch_detect called",
-        extra={"batch_size": len(payload.texts), "locale": payload.locale},
+        extra={"batch_size": len(payload.texts), "locale": batch_locale_label(locale)},
     )
 
     try:
-        results = analyze_batch(payload.texts, locale=payload.locale)
+        results = cached_analyze_batch(payload.texts, locale=locale, fields=fields)
     except Exception as exc:
         logger.exception("Error in /bias/batch_detect KALDRA-Bias analysis")
         raise HTTPException(
@@ -106,5 +194,52 @@ def detect_bias_batch(payload: BatchInputPayload):
 
     return [OutputPayload(**res) for res in valid_results]
 
+@app.post("/bias/batch_detect/stream")
+async def detect_bias_batch_stream(
+    request: Request, locale: str = "pt-BR", fields: Optional[List[str]] = Query(None)
+):
+    """
+    Streams NDJSON results for an NDJSON request body (one text per line),
+    keeping memory bounded to one chunk regardless of the batch size.
+    """
+    fields = _validated_fields(fields)
+    logger.info(
+        "KALDRA-Bias /bias/batch_detect/stream called",
+        extra={"locale": locale},
+    )
+
+    return NDJSONStreamingResponse(
+        stream_batch_results(request.stream(), default_locale=locale, fields=fields)
+    )
+
+@app.post("/bias/detect/document", response_model=DocumentOutputPayload)
+async def detect_bias_document(
+    request: Request, locale: str = "pt-BR", include_windows: bool = False
+):
+    """
+    Analyzes a very long plain-text (UTF-8) request body in windows, reading
+    it incrementally and stopping early once the confidence stabilizes.
+    """
+    logger.info(
+        "KALDRA-Bias /bias/detect/document called",
+        extra={"locale": locale, "include_windows": include_windows},
+    )
+
+    analyzer = LongDocumentAnalyzer(locale=locale, include_windows=include_windows)
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(analyzer.feed, chunk)
+            if analyzer.done:
+                break
+        result = await run_in_threadpool(analyzer.finish)
+    except Exception as exc:
+        logger.exception("Error in /bias/detect/document KALDRA-Bias analysis")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal error during document analysis.",
+        ) from exc
+
+    return DocumentOutputPayload(**result)
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
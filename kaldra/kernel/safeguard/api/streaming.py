@@ -0,0 +1,157 @@
+"""
+Streaming NDJSON para lotes muito grandes (/bias/batch_detect/stream).
+
+O corpo da requisição é lido incrementalmente, uma linha JSON por item, e os
+resultados são devolvidos como NDJSON assim que cada bloco termina. Apenas um
+bloco fica em memória por vez; como o corpo só é lido quando o cliente
+consome a resposta, um cliente lento desacelera também a leitura da entrada.
+
+Formato de cada linha de entrada:
+    {"text": "...", "locale": "pt-BR"}   (locale opcional)
+    "..."                                (string JSON simples)
+"""
+
+from __future__ import annotations
+
+import json
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from ..src.cache import cached_analyze_batch
+from ..src.pipeline import normalize_fields
+from ..src.settings import BiasSettings, get_settings
+
+# (input_index, text, locale, erro)
+_StreamItem = Tuple[int, Optional[str], Optional[str], Optional[str]]
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Optional[bytes]]:
+    """
+    Divide um fluxo de bytes em linhas. Linhas maiores que `max_line_bytes`
+    são descartadas e sinalizadas com None, sem acumular o excedente.
+
+    Cada bloco é dividido uma única vez; só a linha parcial final fica no
+    buffer, que portanto nunca passa de `max_line_bytes`.
+    """
+    buffer = b""
+    discarding = False
+    async for chunk in chunks:
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            if discarding:
+                discarding = False
+            elif len(line) > max_line_bytes:
+                yield None
+            else:
+                yield line
+        if len(buffer) > max_line_bytes:
+            if not discarding:
+                yield None
+            discarding = True
+            buffer = b""
+    if buffer and not discarding:
+        yield buffer
+
+
+def _parse_line(line: Optional[bytes], default_locale: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Retorna (text, locale, erro) para uma linha NDJSON."""
+    if line is None:
+        return None, None, "line_too_long"
+    try:
+        item = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None, None, "invalid_json"
+
+    if isinstance(item, str):
+        return item, default_locale, None
+    if isinstance(item, dict) and isinstance(item.get("text"), str):
+        return item["text"], str(item.get("locale") or default_locale), None
+    return None, None, "missing_text"
+
+
+async def _analyze_chunk(
+    items: List[_StreamItem], settings: BiasSettings, fields: Optional[frozenset] = None
+) -> List[dict]:
+    """Analisa um bloco (um locale por item) e devolve na ordem de entrada."""
+    results: Dict[int, dict] = {}
+    valid: List[_StreamItem] = []
+    for item in items:
+        index, text, locale, error = item
+        if error is not None:
+            results[index] = {"input_index": index, "text": text, "skipped": True, "reason": error}
+        else:
+            valid.append(item)
+
+    if valid:
+        analyzed = await run_in_threadpool(
+            cached_analyze_batch, [text for _, text, _, _ in valid],
+            locale=[locale for _, _, locale, _ in valid], settings=settings, fields=fields,
+        )
+        for (index, _, _, _), result in zip(valid, analyzed):
+            result["input_index"] = index
+            results[index] = result
+
+    return [results[item[0]] for item in items]
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse que não escuta `receive` em paralelo.
+
+    Por padrão o Starlette consome `receive` para detectar desconexões, o que
+    competiria com a leitura incremental do corpo. Aqui a desconexão aparece
+    na própria leitura do corpo ou no envio da resposta.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _encode_ndjson(results: List[dict]) -> bytes:
+    return "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results).encode("utf-8")
+
+
+async def stream_batch_results(
+    chunks: AsyncIterator[bytes],
+    default_locale: str = "pt-BR",
+    chunk_size: Optional[int] = None,
+    max_line_bytes: int = 8 * 1024 * 1024,
+    settings: Optional[BiasSettings] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Gera as linhas NDJSON de saída, um bloco de `chunk_size` itens por vez.
+
+    `fields` restringe cada resultado aos campos pedidos (ver analyze_batch).
+    """
+    if settings is None:
+        settings = get_settings()
+    fields = normalize_fields(fields)
+    if chunk_size is None:
+        chunk_size = settings.stream_chunk_size
+
+    pending: List[_StreamItem] = []
+    index = 0
+    async for line in iter_ndjson_lines(chunks, max_line_bytes):
+        if line is not None and not line.strip():
+            continue
+        text, locale, error = _parse_line(line, default_locale)
+        pending.append((index, text, locale, error))
+        index += 1
+
+        if len(pending) >= chunk_size:
+            yield _encode_ndjson(await _analyze_chunk(pending, settings, fields))
+            pending = []
+
+    if pending:
+        yield _encode_ndjson(await _analyze_chunk(pending, settings, fields))
@@ -0,0 +1,112 @@
+"""
+KALDRA-SAFEGUARD v0.6 — benchmark de logging
+
+Mede o custo de logging por item de `analyze_batch` em cada modo de
+configuração do logger, descontando a execução com logging filtrado
+(nível WARNING):
+
+- text_sync:             formato colorido, escrita síncrona (padrão antigo)
+- json_enqueued:         JSON lines em sink de fundo (thread de escrita)
+- json_enqueued_sampled: idem, com 1% dos eventos por item
+
+A saída vai para um arquivo temporário, para medir escrita real sem poluir
+o terminal. O JSON gerado segue o formato de `bench_pipeline.py`, então
+`bench_pipeline.py compare` também funciona com ele.
+
+Uso:
+    python bench_logging.py [--items 10000] [--output baselines/logging.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# --- Setup Paths ---
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BENCH_DIR.parents[3]))
+
+from kaldra.kernel.core.src.logging_config import configure_logging, flush_logs
+from kaldra.kernel.safeguard.src.pipeline import analyze_batch, warmup
+from kaldra.kernel.safeguard.src.settings import BiasSettings
+
+MODES = {
+    "off": dict(level="WARNING", fmt="text", enqueue=False),
+    "text_sync": dict(level="INFO", fmt="text", enqueue=False),
+    "json_enqueued": dict(level="INFO", fmt="json", enqueue=True),
+    "json_enqueued_sampled": dict(
+        level="INFO", fmt="json", enqueue=True,
+        sample_rates={"analyze_batch_item": 0.01, "analyze_text_end": 0.01},
+    ),
+}
+
+
+def _time_mode(mode: dict, texts: List[str], repeat: int, settings: BiasSettings) -> Dict[str, float]:
+    """Tempo de analyze_batch (chamada) e até a fila do sink esvaziar (drained)."""
+    calls, drained = [], []
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as sink:
+        configure_logging(sink=sink, **mode)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            analyze_batch(texts, settings=settings)
+            calls.append(time.perf_counter() - start)
+            flush_logs()
+            drained.append(time.perf_counter() - start)
+        configure_logging(level="WARNING", sink=sys.stderr)
+    return {"call_s": statistics.median(calls), "drained_s": statistics.median(drained)}
+
+
+def run(items: int = 10_000, repeat: int = 5) -> dict:
+    # Métricas desligadas para isolar o custo do logging
+    settings = BiasSettings(metrics_enabled=False)
+    texts = [f"Texto de benchmark número {i}." for i in range(items)]
+
+    configure_logging(level="WARNING", sink=sys.stderr)
+    warmup()
+    analyze_batch(texts[:100], settings=settings)
+
+    timings = {name: _time_mode(mode, texts, repeat, settings) for name, mode in MODES.items()}
+    base = timings["off"]["call_s"]
+
+    benchmarks = {}
+    for name, timing in timings.items():
+        overhead_us = max(0.0, timing["call_s"] - base) / items * 1e6
+        benchmarks[f"logging/{name}"] = {
+            "median_us": timing["call_s"] / items * 1e6,
+            "overhead_per_item_us": overhead_us,
+            "drained_per_item_us": max(0.0, timing["drained_s"] - base) / items * 1e6,
+        }
+    return {"meta": {"items": items, "repeat": repeat}, "benchmarks": benchmarks}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Logging overhead per analyze_batch item.")
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    report = run(args.items, args.repeat)
+    print(f"{'mode':<28} {'µs/item':>10} {'overhead':>10} {'drained':>10}")
+    for name, stats in report["benchmarks"].items():
+        print(
+            f"{name:<28} {stats['median_us']:>10.2f} "
+            f"{stats['overhead_per_item_us']:>10.2f} {stats['drained_per_item_us']:>10.2f}"
+        )
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Benchmark results saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
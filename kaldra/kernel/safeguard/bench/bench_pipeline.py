@@ -0,0 +1,243 @@
+"""
+KALDRA-SAFEGUARD v0.6 — benchmarks da pipeline
+
+Mede cada estágio de `analyze_text` isoladamente e de ponta a ponta, para
+textos curtos, típicos e muito longos, e `analyze_batch` em lotes de 1 a
+10k itens. Os resultados são salvos como baseline JSON e podem ser
+comparados com outra execução.
+
+Uso:
+    python bench_pipeline.py run [--output baselines/local.json] [--quick]
+    python bench_pipeline.py compare BASELINE CURRENT [--threshold 0.20]
+    python bench_pipeline.py run --compare-to baselines/local.json
+
+`compare` sai com código 1 se algum benchmark ficar mais lento que o
+baseline além do limiar (razão entre medianas).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# --- Setup Paths ---
+BENCH_DIR = Path(__file__).resolve().parent
+BIAS_KERNEL_DIR = BENCH_DIR.parent
+sys.path.append(str(BIAS_KERNEL_DIR.parents[2]))
+
+from kaldra.kernel.core.src.embeddings import get_embeddings
+from kaldra.kernel.core.src.delta12 import project_to_delta12_batch
+from kaldra.kernel.core.src.kindra_3x48 import apply_kindra_batch
+from kaldra.kernel.core.src.delta144_mapping import map_to_delta144
+from kaldra.kernel.safeguard.src.tau import apply_tau_policy_batch
+from kaldra.kernel.safeguard.src.scorer import compute_bias_scores
+from kaldra.kernel.safeguard.src.results import _assemble_result
+from kaldra.kernel.safeguard.src.settings import get_settings
+from kaldra.kernel.safeguard.src.model_registry import get_registry
+from kaldra.kernel.safeguard.src.pipeline import _DELTA12_META, analyze_text, analyze_batch, warmup
+
+# --- Constants ---
+DATASET_PATH = BIAS_KERNEL_DIR / "data" / "dataset" / "bias_dataset_v04.csv"
+BASELINE_DIR = BENCH_DIR / "baselines"
+DEFAULT_THRESHOLD = 0.20
+LOCALE = "pt-BR"
+
+BATCH_SIZES = (1, 10, 100, 1_000, 10_000)
+QUICK_BATCH_SIZES = (1, 10, 100, 1_000)
+
+# Tempo mínimo de cada amostra; o número de chamadas por amostra é calibrado
+MIN_SAMPLE_SECONDS = 0.02
+
+
+def load_corpus() -> List[str]:
+    """Textos do dataset v0.4, usados como entrada realista."""
+    with open(DATASET_PATH, newline="", encoding="utf-8") as f:
+        return [row["text"] for row in csv.DictReader(f) if row.get("text")]
+
+
+def text_profiles(corpus: List[str]) -> Dict[str, str]:
+    """Um texto curto, um típico (mediana do dataset) e um muito longo (~50k chars)."""
+    by_length = sorted(corpus, key=len)
+    typical = by_length[len(by_length) // 2]
+    long_text = " ".join(corpus)
+    while len(long_text) < 50_000:
+        long_text += " " + long_text
+    return {"short": "Ok.", "typical": typical, "long": long_text[:50_000]}
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Executa `func` em `repeat` amostras e devolve estatísticas por chamada,
+    em microssegundos.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    # autorange mira ~0.2s por amostra; reduz para manter a suíte curta
+    number = max(1, int(number * MIN_SAMPLE_SECONDS / 0.2))
+    samples = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    samples.sort()
+    return {
+        "median_us": statistics.median(samples),
+        "min_us": samples[0],
+        "p95_us": samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))],
+        "calls_per_sample": number,
+        "samples": len(samples),
+    }
+
+
+def bench_stages(text: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Cada estágio de analyze_text, com as mesmas funções em lote (matrizes
+    de uma linha) que a pipeline chama, recebendo a saída real do anterior.
+    """
+    tau_threshold = get_settings().tau_threshold
+    model = get_registry().current()
+    embedding = get_embeddings([text])
+    delta12 = project_to_delta12_batch(embedding)
+    delta12_modulated, plan = apply_kindra_batch(delta12, LOCALE)
+    confidences, _ = apply_tau_policy_batch(delta12_modulated, tau_threshold)
+    bias_scores, labels = compute_bias_scores(delta12_modulated, model=model)
+    # Arquétipo dominante do próprio texto, como em analyze_text
+    archetype_name = _DELTA12_META.get()[int(np.argmax(delta12_modulated[0]))]["name"]
+    delta144_info = map_to_delta144(archetype_name)
+
+    stages = {
+        "get_embeddings": lambda: get_embeddings([text]),
+        "project_to_delta12_batch": lambda: project_to_delta12_batch(embedding),
+        "apply_kindra_batch": lambda: apply_kindra_batch(delta12, LOCALE),
+        "apply_tau_policy_batch": lambda: apply_tau_policy_batch(delta12_modulated, tau_threshold),
+        "compute_bias_scores": lambda: compute_bias_scores(delta12_modulated, model=model),
+        "map_to_delta144": lambda: map_to_delta144(archetype_name),
+        "assemble_result": lambda: _assemble_result(
+            delta12_modulated[0], labels[0], float(bias_scores[0]), float(confidences[0]), plan,
+            archetype_name, delta144_info, model.version,
+        ),
+        "analyze_text": lambda: analyze_text(text, locale=LOCALE),
+    }
+    return {name: measure(func, repeat) for name, func in stages.items()}
+
+
+def bench_batches(corpus: List[str], sizes, repeat: int) -> Dict[str, Dict[str, float]]:
+    """analyze_batch por tamanho de lote; inclui o custo por item."""
+    results = {}
+    for size in sizes:
+        # Sufixo garante textos distintos mesmo quando o lote excede o corpus
+        texts = [f"{corpus[i % len(corpus)]} #{i}" for i in range(size)]
+        # Lotes grandes: menos amostras para manter a suíte curta
+        stats = measure(lambda: analyze_batch(texts, locale=LOCALE), max(3, repeat // max(1, size // 100)))
+        stats["per_item_us"] = stats["median_us"] / size
+        results[f"analyze_batch/{size}"] = stats
+    return results
+
+
+def run_suite(quick: bool = False) -> dict:
+    """Executa a suíte completa e devolve o documento de baseline."""
+    repeat = 5 if quick else 15
+    corpus = load_corpus()
+
+    start = time.perf_counter()
+    warmup_report = warmup()
+    cold_start_s = time.perf_counter() - start
+
+    benchmarks: Dict[str, Dict[str, float]] = {}
+    for profile, text in text_profiles(corpus).items():
+        for stage, stats in bench_stages(text, repeat).items():
+            benchmarks[f"{stage}/{profile}"] = stats
+    benchmarks.update(bench_batches(corpus, QUICK_BATCH_SIZES if quick else BATCH_SIZES, repeat))
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "model_version": warmup_report["model_version"],
+            "cold_start_s": cold_start_s,
+            "quick": quick,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Imprime a comparação das medianas e devolve os benchmarks que regrediram
+    além de `threshold` (0.20 = 20% mais lento).
+    """
+    regressions = []
+    print(f"{'benchmark':<40} {'baseline µs':>14} {'current µs':>14} {'ratio':>8}")
+    for name, base in sorted(baseline["benchmarks"].items()):
+        cur = current["benchmarks"].get(name)
+        if cur is None:
+            print(f"{name:<40} {base['median_us']:>14.1f} {'—':>14} {'missing':>8}")
+            continue
+        ratio = cur["median_us"] / base["median_us"] if base["median_us"] else float("inf")
+        flag = ""
+        if ratio > 1.0 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {base['median_us']:>14.1f} {cur['median_us']:>14.1f} {ratio:>8.2f}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed more than {threshold:.0%}.")
+    else:
+        print(f"\nNo regressions above {threshold:.0%}.")
+    return regressions
+
+
+def _load_json(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="KALDRA-Bias pipeline benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Run the suite and save a JSON baseline.")
+    run_parser.add_argument("--output", type=Path, default=None)
+    run_parser.add_argument("--quick", action="store_true", help="Fewer samples, batches up to 1k.")
+    run_parser.add_argument("--compare-to", type=Path, default=None)
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    cmp_parser = sub.add_parser("compare", help="Compare two saved runs.")
+    cmp_parser.add_argument("baseline", type=Path)
+    cmp_parser.add_argument("current", type=Path)
+    cmp_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        regressions = compare(_load_json(args.baseline), _load_json(args.current), args.threshold)
+        return 1 if regressions else 0
+
+    report = run_suite(quick=args.quick)
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = BASELINE_DIR / f"bench_{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to {output}")
+
+    if args.compare_to is not None:
+        regressions = compare(_load_json(args.compare_to), report, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,425 @@
+"""
+KALDRA-SAFEGUARD v0.6 — bulk scoring
+
+Pontuação offline de corpora grandes (CSV, Parquet ou JSONL) em blocos.
+
+- A entrada é lida em blocos de `--chunk-size` linhas; cada bloco passa pela
+  pipeline vetorizada (analyze_batch_columnar), opcionalmente em um pool de
+  processos (`--workers`).
+- A saída é acrescentada bloco a bloco: um arquivo CSV (separado por tab
+  se `.tsv`), ou um diretório Parquet (`saida.parquet/part-000000.parquet`,
+  ...), legível com `pandas.read_parquet`.
+- A cada `--checkpoint-every` blocos o progresso é gravado em um arquivo de
+  checkpoint (atômico). Um job interrompido, executado de novo com os
+  mesmos argumentos, retoma do último checkpoint; a saída escrita depois
+  dele é descartada, sem linhas duplicadas.
+- O progresso (linhas, linhas/s) é reportado em stderr a cada bloco.
+
+Uso:
+    python -m kaldra.kernel.safeguard.bulk arquivo.csv saida.csv
+    python -m kaldra.kernel.safeguard.bulk arquivo.parquet saida.parquet \\
+        --text-column body --keep-columns id,date --workers 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from .src.pipeline import analyze_batch_columnar, warmup
+from .src.model_registry import get_registry
+from .src.parallel import resolve_workers, shutdown_pool
+from .src.settings import BiasSettings, get_settings
+from ..core.src.logging_config import get_logger
+
+INPUT_FORMATS = {
+    ".csv": "csv", ".tsv": "csv", ".parquet": "parquet", ".pq": "parquet",
+    ".jsonl": "jsonl", ".ndjson": "jsonl",
+}
+OUTPUT_COLUMNS = ("label", "bias_score", "confidence", "plan", "dominant_archetype", "model_version")
+CHECKPOINT_VERSION = 2
+
+
+class BulkError(Exception):
+    """Erro de configuração ou de retomada de um job de bulk scoring."""
+
+
+def detect_format(path: Path) -> str:
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    # "dados.csv.gz" -> ".csv"
+    for suffix in reversed(suffixes):
+        if suffix in INPUT_FORMATS:
+            return INPUT_FORMATS[suffix]
+    raise BulkError(f"Cannot infer the format of {path}; use --input-format.")
+
+
+def _csv_separator(path: Path) -> str:
+    return "\t" if ".tsv" in [suffix.lower() for suffix in path.suffixes] else ","
+
+
+# --- Input ---
+
+def _require_pyarrow(feature: str):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise BulkError(f"{feature} requires the optional 'pyarrow' package.") from exc
+    return pq
+
+
+def iter_input_chunks(
+    path: Path,
+    fmt: str,
+    chunk_size: int,
+    skip_rows: int = 0,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Blocos de até `chunk_size` linhas, a partir da linha `skip_rows`.
+
+    Só as `columns` pedidas são lidas (quando o formato permite).
+    """
+    usecols = list(columns) if columns else None
+    if fmt == "csv":
+        # Textos podem ter quebras de linha: skiprows (linhas físicas) não serve
+        chunks = pd.read_csv(path, sep=_csv_separator(path), usecols=usecols, chunksize=chunk_size)
+    elif fmt == "jsonl":
+        chunks = pd.read_json(path, lines=True, chunksize=chunk_size)
+    elif fmt == "parquet":
+        pq = _require_pyarrow("Parquet input")
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=usecols)
+        chunks = (batch.to_pandas() for batch in batches)
+    else:
+        raise BulkError(f"Unsupported input format: {fmt!r}")
+
+    # Linhas já processadas são lidas e descartadas (só o parsing é refeito)
+    to_skip = skip_rows
+    for chunk in chunks:
+        if usecols and fmt == "jsonl":
+            # JSONL não tem schema: as colunas são conferidas em cada bloco
+            check_columns(usecols, chunk.columns, path)
+        if to_skip >= len(chunk):
+            to_skip -= len(chunk)
+            continue
+        if to_skip:
+            chunk = chunk.iloc[to_skip:]
+            to_skip = 0
+        yield chunk[usecols] if usecols and fmt == "jsonl" else chunk
+
+
+def input_columns(path: Path, fmt: str) -> Optional[List[str]]:
+    """Colunas da entrada, lidas do cabeçalho/schema (None para JSONL)."""
+    if fmt == "csv":
+        try:
+            return pd.read_csv(path, sep=_csv_separator(path), nrows=0).columns.tolist()
+        except pd.errors.EmptyDataError as exc:
+            raise BulkError(f"{path} is empty.") from exc
+    if fmt == "parquet":
+        pq = _require_pyarrow("Parquet input")
+        return pq.ParquetFile(path).schema_arrow.names
+    return None
+
+
+def check_columns(columns: Sequence[str], available: Sequence[str], path: Path) -> None:
+    missing = [column for column in columns if column not in available]
+    if missing:
+        raise BulkError(
+            f"{path.name} has no column(s) {', '.join(map(repr, missing))}; "
+            f"available: {', '.join(map(str, available))}."
+        )
+
+
+def count_input_rows(path: Path, fmt: str) -> Optional[int]:
+    """Total de linhas quando é barato saber (metadados do Parquet)."""
+    if fmt == "parquet":
+        pq = _require_pyarrow("Parquet input")
+        return pq.ParquetFile(path).metadata.num_rows
+    return None
+
+
+# --- Output ---
+
+class _CsvSink:
+    """Acrescenta os blocos a um único arquivo CSV (ou TSV, pela extensão)."""
+
+    def __init__(self, path: Path, sep: str = ","):
+        self.path = path
+        self.sep = sep
+
+    def resume(self, state: "CheckpointState") -> None:
+        # Descarta o que foi escrito depois do último checkpoint
+        if self.path.exists():
+            with open(self.path, "r+b") as f:
+                f.truncate(state.output_bytes)
+
+    def write(self, frame: pd.DataFrame, chunk_index: int) -> None:
+        header = not self.path.exists() or self.path.stat().st_size == 0
+        frame.to_csv(self.path, mode="a", header=header, index=False, sep=self.sep)
+
+    def position(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+
+class _ParquetSink:
+    """Um arquivo Parquet por bloco em um diretório de saída."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def _part(self, chunk_index: int) -> Path:
+        return self.path / f"part-{chunk_index:06d}.parquet"
+
+    def resume(self, state: "CheckpointState") -> None:
+        # Partes posteriores ao checkpoint serão reescritas
+        if self.path.is_dir():
+            for part in self.path.glob("part-*.parquet"):
+                if int(part.stem.split("-")[1]) >= state.chunks_done:
+                    part.unlink()
+
+    def write(self, frame: pd.DataFrame, chunk_index: int) -> None:
+        _require_pyarrow("Parquet output")
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self._part(chunk_index).with_suffix(".tmp")
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, self._part(chunk_index))
+
+    def position(self) -> int:
+        return 0
+
+
+def _make_sink(path: Path, fmt: str):
+    if fmt == "csv":
+        return _CsvSink(path, sep=_csv_separator(path))
+    if fmt == "parquet":
+        return _ParquetSink(path)
+    raise BulkError(f"Unsupported output format: {fmt!r} (use csv or parquet)")
+
+
+# --- Checkpoints ---
+
+@dataclass
+class CheckpointState:
+    """Progresso persistido de um job; a identidade do job vem dos argumentos."""
+
+    input_path: str
+    output_path: str
+    text_column: str
+    chunk_size: int
+    # Ausentes em checkpoints da versão 1: nunca compatíveis com um job atual
+    keep_columns: List[str] = field(default_factory=list)
+    locale: Optional[str] = None
+    rows_done: int = 0
+    chunks_done: int = 0
+    output_bytes: int = 0
+    model_version: Optional[str] = None
+    version: int = CHECKPOINT_VERSION
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, indent=2)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "CheckpointState":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def check_compatible(self, other: "CheckpointState") -> None:
+        for name in ("input_path", "output_path", "text_column", "chunk_size", "keep_columns", "locale"):
+            if getattr(self, name) != getattr(other, name):
+                raise BulkError(
+                    f"Checkpoint was written with {name}={getattr(self, name)!r}, "
+                    f"not {getattr(other, name)!r}; use --restart to start over."
+                )
+
+
+def default_checkpoint_path(output: Path) -> Path:
+    return output.with_name(output.name + ".checkpoint.json")
+
+
+# --- Job ---
+
+def _score_chunk(
+    chunk: pd.DataFrame,
+    first_row: int,
+    text_column: str,
+    keep_columns: Sequence[str],
+    locale: str,
+    settings: BiasSettings,
+    workers: int,
+) -> pd.DataFrame:
+    texts = chunk[text_column].fillna("").astype(str).tolist()
+    batch = analyze_batch_columnar(texts, locale=locale, settings=settings, workers=workers)
+    scored = batch.to_pandas()[list(OUTPUT_COLUMNS)]
+    scored.insert(0, "row", range(first_row, first_row + len(texts)))
+    for position, column in enumerate(keep_columns, start=1):
+        scored.insert(position, column, chunk[column].to_numpy())
+    return scored
+
+
+def run_bulk(
+    input_path: Path,
+    output_path: Path,
+    text_column: str = "text",
+    keep_columns: Sequence[str] = (),
+    locale: str = "pt-BR",
+    chunk_size: int = 50_000,
+    workers: Optional[int] = None,
+    checkpoint_every: int = 1,
+    checkpoint_path: Optional[Path] = None,
+    restart: bool = False,
+    max_rows: Optional[int] = None,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    settings: Optional[BiasSettings] = None,
+    progress=sys.stderr,
+) -> CheckpointState:
+    """
+    Pontua `input_path` e grava em `output_path`, retomando de um checkpoint
+    compatível se existir. `max_rows` limita as linhas desta execução.
+
+    Returns:
+        O estado final (também gravado no checkpoint).
+    """
+    logger = get_logger()
+    if settings is None:
+        settings = get_settings()
+    workers = resolve_workers(workers, settings)
+    # Cada bloco já é um lote grande: usa o pool sempre que houver workers
+    settings = replace(settings, parallel_min_batch=1)
+
+    input_format = input_format or detect_format(input_path)
+    output_format = output_format or detect_format(output_path)
+    checkpoint_path = checkpoint_path or default_checkpoint_path(output_path)
+    sink = _make_sink(output_path, output_format)
+
+    # Colunas ausentes ou em conflito falham antes de tocar na saída
+    columns = [text_column, *keep_columns]
+    available = input_columns(input_path, input_format)
+    if available is not None:
+        check_columns(columns, available, input_path)
+    reserved = [column for column in keep_columns if column in ("row", *OUTPUT_COLUMNS)]
+    if reserved:
+        raise BulkError(f"--keep-columns {', '.join(map(repr, reserved))} clash with output columns.")
+
+    state = CheckpointState(
+        input_path=str(input_path.resolve()), output_path=str(output_path.resolve()),
+        text_column=text_column, chunk_size=chunk_size,
+        keep_columns=list(keep_columns), locale=locale,
+    )
+    if checkpoint_path.exists() and not restart:
+        saved = CheckpointState.load(checkpoint_path)
+        saved.check_compatible(state)
+        state = saved
+        sink.resume(state)
+        logger.info(f"[bulk] Resuming {input_path.name} at row {state.rows_done}.")
+    else:
+        if output_format == "csv" and output_path.exists():
+            output_path.unlink()
+        sink.resume(state)
+
+    warmup()
+    model_version = get_registry().current().version
+    if state.model_version not in (None, model_version):
+        logger.warning(
+            f"[bulk] Checkpoint rows were scored with {state.model_version}; "
+            f"continuing with {model_version}."
+        )
+    state.model_version = model_version
+
+    total = count_input_rows(input_path, input_format)
+    started = time.perf_counter()
+    rows_this_run = 0
+    chunks_since_checkpoint = 0
+
+    try:
+        for chunk in iter_input_chunks(input_path, input_format, chunk_size, state.rows_done, columns):
+            if max_rows is not None:
+                chunk = chunk.iloc[:max_rows - rows_this_run]
+
+            scored = _score_chunk(
+                chunk, state.rows_done, text_column, keep_columns, locale, settings, workers
+            )
+            sink.write(scored, state.chunks_done)
+
+            state.rows_done += len(chunk)
+            state.chunks_done += 1
+            state.output_bytes = sink.position()
+            rows_this_run += len(chunk)
+            chunks_since_checkpoint += 1
+            if chunks_since_checkpoint >= checkpoint_every:
+                state.save(checkpoint_path)
+                chunks_since_checkpoint = 0
+
+            if progress is not None:
+                elapsed = time.perf_counter() - started
+                rate = rows_this_run / elapsed if elapsed > 0 else 0.0
+                of_total = f"/{total}" if total is not None else ""
+                print(
+                    f"[bulk] {state.rows_done}{of_total} rows | {rate:,.0f} rows/s | "
+                    f"chunk {state.chunks_done}",
+                    file=progress, flush=True,
+                )
+            if max_rows is not None and rows_this_run >= max_rows:
+                break
+    finally:
+        # `state` só avança depois de cada bloco escrito por inteiro; uma
+        # escrita interrompida fica além de output_bytes e é descartada
+        state.save(checkpoint_path)
+        shutdown_pool()
+
+    return state
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m kaldra.kernel.safeguard.bulk",
+        description="Score a CSV/Parquet/JSONL corpus in chunks, with resumable checkpoints.",
+    )
+    parser.add_argument("input", type=Path)
+    parser.add_argument("output", type=Path, help="CSV file or Parquet directory.")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--keep-columns", default="", help="Comma-separated input columns to copy.")
+    parser.add_argument("--locale", default="pt-BR")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=None, help="Processes (0 = all cores).")
+    parser.add_argument("--checkpoint-every", type=int, default=1, help="Chunks between checkpoints.")
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint.")
+    parser.add_argument("--max-rows", type=int, default=None, help="Stop after this many rows.")
+    parser.add_argument("--input-format", choices=sorted(set(INPUT_FORMATS.values())))
+    parser.add_argument("--output-format", choices=("csv", "parquet"))
+    args = parser.parse_args(argv)
+
+    keep_columns = [column.strip() for column in args.keep_columns.split(",") if column.strip()]
+    try:
+        state = run_bulk(
+            args.input, args.output,
+            text_column=args.text_column, keep_columns=keep_columns, locale=args.locale,
+            chunk_size=args.chunk_size, workers=args.workers,
+            checkpoint_every=args.checkpoint_every, checkpoint_path=args.checkpoint,
+            restart=args.restart, max_rows=args.max_rows,
+            input_format=args.input_format, output_format=args.output_format,
+        )
+    except BulkError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume.", file=sys.stderr)
+        return 130
+
+    print(f"Done: {state.rows_done} rows scored into {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
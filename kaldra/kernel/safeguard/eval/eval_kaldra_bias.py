@@ -1,72 +1,324 @@
-import pandas as pd
+"""
+KALDRA-Bias — avaliação vetorizada
+
+Os vetores Δ12 do gold set vêm do feature store (materializados uma vez,
+memory-mapped nas execuções seguintes). A modulação Kindra, a confiança τ e
+o score bruto do modelo são calculados em lote sobre eles. A partir daí,
+qualquer combinação de limiar τ e limiar de decisão é avaliada só com
+operações de arrays:
+
+- conclusivo[t, n] = confiança[n] >= τ[t]
+- enviesado[d, n]  = score[n] >= limiar[d]
+- TP/FP/FN/TN de toda a grade (τ × limiar) por produtos de matrizes.
+
+Textos vazios (ou só com espaços) recebem "unknown", como na pipeline: nunca
+são conclusivos, em nenhum τ.
+
+Métricas por ponto da grade: accuracy e precision/recall ("biased") sobre
+as linhas conclusivas, coverage (fração conclusiva) e MCC. Intervalos de
+confiança por bootstrap: cada reamostragem é um vetor de pesos (contagens
+multinomiais), então todas as reamostragens são avaliadas juntas.
+
+Uso:
+    python eval_kaldra_bias.py [--gold data/dataset/gold.csv]
+        [--taus 0:0.6:0.05] [--thresholds 0.3:0.7:0.05]
+        [--bootstrap 1000] [--output grid.csv]
+"""
+
+from __future__ import annotations
+
+import argparse
 import sys
+from dataclasses import dataclass
 from pathlib import Path
-from sklearn.metrics import accuracy_score, precision_score, recall_score
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
 
 # --- Setup Paths ---
-# Add the 'kaldra/kernel/bias' directory to the Python path.
-# This allows the 'src' module to be imported as a package.
 EVAL_DIR = Path(__file__).parent.resolve()
 BIAS_KERNEL_DIR = EVAL_DIR.parent
-sys.path.append(str(BIAS_KERNEL_DIR))
+sys.path.append(str(BIAS_KERNEL_DIR.parents[2]))
 
-from src.pipeline import analyze_text
+from kaldra.kernel.core.src.embeddings import get_embeddings
+from kaldra.kernel.core.src.delta12 import project_to_delta12_batch
+from kaldra.kernel.core.src.kindra_3x48 import apply_kindra_batch
+from kaldra.kernel.safeguard.src.tau import estimate_confidence_batch
+from kaldra.kernel.safeguard.src.model_registry import ModelHandle, get_registry
+from kaldra.kernel.safeguard.src.feature_store import get_feature_store
+from kaldra.kernel.safeguard.src.settings import get_settings
 
 # --- Constants ---
-DATA_DIR = BIAS_KERNEL_DIR / "data" / "datasets"
+DATA_DIR = BIAS_KERNEL_DIR / "data" / "dataset"
 GOLD_CSV_PATH = DATA_DIR / "gold.csv"
 PREDS_CSV_PATH = DATA_DIR / "preds.csv"
 
-def run_evaluation():
+METRICS = ("accuracy", "precision", "recall", "coverage", "mcc")
+DECISION_THRESHOLD = 0.5
+
+
+@dataclass
+class EvalFeatures:
+    """Saídas da pipeline necessárias para avaliar qualquer limiar."""
+
+    delta12: np.ndarray     # (N, 12) Δ12 modulado
+    confidence: np.ndarray  # (N,) confiança τ (-inf nos textos vazios)
+    scores: np.ndarray      # (N,) score "biased" do modelo, para todas as linhas
+    model_version: str
+    empty: Optional[np.ndarray] = None  # (N,) textos vazios, "unknown" na pipeline
+
+
+def compute_features(raw_delta12: np.ndarray, locale: str, model: ModelHandle) -> EvalFeatures:
+    """Roda os estágios após a projeção Δ12; o score vale para todas as linhas."""
+    delta12, _ = apply_kindra_batch(raw_delta12, locale)
+    confidence = estimate_confidence_batch(delta12)
+    scores = np.asarray(model.predict_positive(delta12), dtype=float)
+    return EvalFeatures(delta12, confidence, scores, model.version)
+
+
+def load_features(
+    texts: Sequence[str],
+    locale: str = "pt-BR",
+    model: Optional[ModelHandle] = None,
+    use_cache: bool = True,
+    name: Optional[str] = None,
+) -> EvalFeatures:
+    """
+    compute_features sobre o Δ12 do feature store (conjunto `name`); com
+    `use_cache=False` o Δ12 é recalculado sem tocar no disco.
+    """
+    if model is None:
+        model = get_registry().current()
+    if use_cache:
+        raw_delta12 = get_feature_store().materialize(texts, name=name).delta12
+    else:
+        raw_delta12 = project_to_delta12_batch(get_embeddings(list(texts)))
+    features = compute_features(raw_delta12, locale, model)
+    # A pipeline nem pontua textos vazios: ficam fora de qualquer τ
+    features.empty = np.array([not text.strip() for text in texts], dtype=bool)
+    features.confidence = np.where(features.empty, -np.inf, features.confidence)
+    return features
+
+
+# --- Vectorized sweeps ---
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Divisão com 0 onde o denominador é 0 (como zero_division=0 no sklearn)."""
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator, dtype=float), where=denominator > 0)
+
+
+def _metrics_from_counts(tp, fp, fn, tn, total) -> Dict[str, np.ndarray]:
+    conclusive = tp + fp + fn + tn
+    mcc_denominator = np.sqrt((tp + fp) * (tp + fn) * (tn + fp) * (tn + fn))
+    return {
+        "accuracy": _safe_divide(tp + tn, conclusive),
+        "precision": _safe_divide(tp, tp + fp),
+        "recall": _safe_divide(tp, tp + fn),
+        "coverage": _safe_divide(conclusive, total),
+        "mcc": _safe_divide(tp * tn - fp * fn, mcc_denominator),
+    }
+
+
+def _grid_masks(confidence, scores, y_true, taus, thresholds):
+    conclusive = (confidence[None, :] >= np.asarray(taus)[:, None]).astype(float)   # (T, N)
+    predicted = (scores[None, :] >= np.asarray(thresholds)[:, None]).astype(float)  # (D, N)
+    positive = np.asarray(y_true, dtype=float)
+    return conclusive, predicted, positive
+
+
+def sweep(
+    y_true: np.ndarray,
+    confidence: np.ndarray,
+    scores: np.ndarray,
+    taus: Sequence[float],
+    thresholds: Sequence[float],
+) -> Dict[str, np.ndarray]:
     """
-    Main function to run the evaluation pipeline.
+    Métricas de toda a grade τ × limiar de decisão.
+
+    Returns:
+        {métrica: array (len(taus), len(thresholds))}, mais as contagens
+        tp/fp/fn/tn.
+    """
+    conclusive, predicted, positive = _grid_masks(confidence, scores, y_true, taus, thresholds)
+    negative = 1.0 - positive
+    tp = conclusive @ (predicted * positive).T
+    fp = conclusive @ (predicted * negative).T
+    fn = conclusive @ ((1.0 - predicted) * positive).T
+    tn = conclusive @ ((1.0 - predicted) * negative).T
+    result = _metrics_from_counts(tp, fp, fn, tn, len(positive))
+    result.update(tp=tp, fp=fp, fn=fn, tn=tn)
+    return result
+
+
+def bootstrap_sweep(
+    y_true: np.ndarray,
+    confidence: np.ndarray,
+    scores: np.ndarray,
+    taus: Sequence[float],
+    thresholds: Sequence[float],
+    n_resamples: int = 1000,
+    alpha: float = 0.05,
+    seed: Optional[int] = 0,
+    block_size: int = 100,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Intervalos de confiança por bootstrap (percentis) para cada métrica.
+
+    Cada reamostragem com reposição equivale a pesos inteiros por linha
+    (contagens multinomiais); as contagens ponderadas de um bloco de
+    reamostragens saem de um único einsum.
+
+    Returns:
+        {métrica: {"low": (T, D), "high": (T, D)}}.
+    """
+    rng = np.random.default_rng(seed)
+    conclusive, predicted, positive = _grid_masks(confidence, scores, y_true, taus, thresholds)
+    n = len(positive)
+    outcome = {
+        "tp": predicted * positive, "fp": predicted * (1.0 - positive),
+        "fn": (1.0 - predicted) * positive, "tn": (1.0 - predicted) * (1.0 - positive),
+    }
+
+    samples: Dict[str, List[np.ndarray]] = {name: [] for name in METRICS}
+    for start in range(0, n_resamples, block_size):
+        size = min(block_size, n_resamples - start)
+        weights = rng.multinomial(n, np.full(n, 1.0 / n), size=size).astype(float)  # (B, N)
+        weighted = weights[:, None, :] * conclusive[None, :, :]                      # (B, T, N)
+        counts = {name: weighted @ mask.T for name, mask in outcome.items()}         # (B, T, D)
+        metrics = _metrics_from_counts(counts["tp"], counts["fp"], counts["fn"], counts["tn"], n)
+        for name in METRICS:
+            samples[name].append(metrics[name])
+
+    intervals = {}
+    for name in METRICS:
+        stacked = np.concatenate(samples[name])
+        low, high = np.quantile(stacked, [alpha / 2, 1 - alpha / 2], axis=0)
+        intervals[name] = {"low": low, "high": high}
+    return intervals
+
+
+def grid_to_frame(
+    taus: Sequence[float],
+    thresholds: Sequence[float],
+    metrics: Dict[str, np.ndarray],
+    intervals: Optional[Dict[str, Dict[str, np.ndarray]]] = None,
+) -> pd.DataFrame:
+    """Uma linha por ponto da grade (tau, threshold, métricas e ICs)."""
+    tau_grid, threshold_grid = np.meshgrid(taus, thresholds, indexing="ij")
+    columns = {"tau": tau_grid.ravel(), "threshold": threshold_grid.ravel()}
+    for name in METRICS:
+        columns[name] = metrics[name].ravel()
+        if intervals is not None:
+            columns[f"{name}_low"] = intervals[name]["low"].ravel()
+            columns[f"{name}_high"] = intervals[name]["high"].ravel()
+    return pd.DataFrame(columns)
+
+
+def parse_range(spec: str) -> np.ndarray:
+    """"início:fim:passo" (fim incluído) ou uma lista "a,b,c"."""
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        return np.round(np.arange(start, stop + step / 2, step), 10)
+    return np.array([float(value) for value in spec.split(",")])
+
+
+# --- Main ---
+
+def run_evaluation(
+    gold_path: Path = GOLD_CSV_PATH,
+    preds_path: Optional[Path] = PREDS_CSV_PATH,
+    taus: Optional[np.ndarray] = None,
+    thresholds: Optional[np.ndarray] = None,
+    n_resamples: int = 1000,
+    locale: str = "pt-BR",
+    use_cache: bool = True,
+    output_path: Optional[Path] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Avalia o gold set em toda a grade e devolve a tabela de métricas.
     """
-    # 1. Load the gold standard dataset
     try:
-        gold_df = pd.read_csv(GOLD_CSV_PATH)
+        gold_df = pd.read_csv(gold_path)
     except FileNotFoundError:
-        print(f"Error: Gold standard file not found at {GOLD_CSV_PATH}")
-        return
-
-    # 2. Get predictions for each text
-    predictions = []
-    print("Running analysis on gold standard dataset...")
-    for index, row in gold_df.iterrows():
-        text = row["text"]
-        result = analyze_text(text)
-        predictions.append({
-            "text": text,
-            "pred_label": result["label"],
-            "bias_score": result["bias_score"]
-        })
-    print("Analysis complete.")
-
-    # 3. Save predictions to preds.csv
-    preds_df = pd.DataFrame(predictions)
-    preds_df.to_csv(PREDS_CSV_PATH, index=False)
-    print(f"Predictions saved to {PREDS_CSV_PATH}")
-
-    # --- 4. Calculate Metrics ---
-    eval_df = pd.merge(gold_df, preds_df, on="text")
-    conclusive_df = eval_df[eval_df["pred_label"] != "inconclusive"].copy()
-
-    if conclusive_df.empty:
-        print("\nNo conclusive predictions were made. Cannot calculate metrics.")
-        return
-
-    y_true = conclusive_df["label"]
-    y_pred = conclusive_df["pred_label"]
-
-    accuracy = accuracy_score(y_true, y_pred)
-    precision_biased = precision_score(y_true, y_pred, pos_label="biased", zero_division=0)
-    recall_biased = recall_score(y_true, y_pred, pos_label="biased", zero_division=0)
-
-    # 5. Print the results
-    print("\n--- Evaluation Metrics ---")
-    print(f"Accuracy:  {accuracy:.2f}")
-    print(f"Precision (biased): {precision_biased:.2f}")
-    print(f"Recall (biased):    {recall_biased:.2f}")
-    print("--------------------------")
+        print(f"Error: Gold standard file not found at {gold_path}")
+        return None
+
+    tau_threshold = get_settings().tau_threshold
+    if taus is None:
+        taus = parse_range("0:0.6:0.05")
+    if thresholds is None:
+        thresholds = parse_range("0.3:0.7:0.05")
+    # A configuração atual sempre faz parte da grade
+    taus = np.union1d(taus, [tau_threshold])
+    thresholds = np.union1d(thresholds, [DECISION_THRESHOLD])
+
+    texts = gold_df["text"].fillna("").astype(str).tolist()
+    features = load_features(texts, locale=locale, use_cache=use_cache, name=Path(gold_path).stem)
+    print(f"Features for {len(texts)} texts ready (model {features.model_version}).")
+
+    # Predições na configuração atual, alinhadas por posição (textos podem repetir)
+    if preds_path is not None:
+        conclusive = features.confidence >= tau_threshold
+        pred_label = np.where(
+            conclusive, np.where(features.scores >= DECISION_THRESHOLD, "biased", "neutral"), "inconclusive"
+        )
+        pred_label[features.empty] = "unknown"
+        pd.DataFrame({
+            "text": texts,
+            "pred_label": pred_label,
+            "bias_score": np.where(conclusive, features.scores, np.nan),
+        }).to_csv(preds_path, index=False)
+        print(f"Predictions saved to {preds_path}")
+
+    labelled = gold_df["label"].isin(["biased", "neutral"]).to_numpy()
+    y_true = (gold_df["label"] == "biased").to_numpy()[labelled]
+    confidence, scores = features.confidence[labelled], features.scores[labelled]
+
+    metrics = sweep(y_true, confidence, scores, taus, thresholds)
+    intervals = None
+    if n_resamples > 0:
+        intervals = bootstrap_sweep(y_true, confidence, scores, taus, thresholds, n_resamples)
+    grid = grid_to_frame(taus, thresholds, metrics, intervals)
+
+    current = grid[np.isclose(grid["tau"], tau_threshold) & np.isclose(grid["threshold"], DECISION_THRESHOLD)]
+    best = grid.sort_values(["mcc", "coverage"], ascending=False).head(1)
+    for title, rows in (("Current configuration", current), ("Best MCC", best)):
+        row = rows.iloc[0]
+        print(f"\n--- {title}: tau={row['tau']:.2f}, threshold={row['threshold']:.2f} ---")
+        for name in METRICS:
+            interval = ""
+            if intervals is not None:
+                interval = f"  [{row[f'{name}_low']:.2f}, {row[f'{name}_high']:.2f}]"
+            print(f"{name.capitalize():<10} {row[name]:.2f}{interval}")
+
+    if output_path is not None:
+        grid.to_csv(output_path, index=False)
+        print(f"\nGrid ({len(grid)} points) saved to {output_path}")
+    return grid
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Threshold sweep evaluation for KALDRA-Bias.")
+    parser.add_argument("--gold", type=Path, default=GOLD_CSV_PATH)
+    parser.add_argument("--preds", type=Path, default=PREDS_CSV_PATH)
+    parser.add_argument("--taus", default="0:0.6:0.05")
+    parser.add_argument("--thresholds", default="0.3:0.7:0.05")
+    parser.add_argument("--bootstrap", type=int, default=1000, help="Resamples (0 disables CIs).")
+    parser.add_argument("--locale", default="pt-BR")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--output", type=Path, default=None, help="CSV with the whole grid.")
+    args = parser.parse_args(argv)
+
+    grid = run_evaluation(
+        gold_path=args.gold, preds_path=args.preds,
+        taus=parse_range(args.taus), thresholds=parse_range(args.thresholds),
+        n_resamples=args.bootstrap, locale=args.locale,
+        use_cache=not args.no_cache, output_path=args.output,
+    )
+    return 0 if grid is not None else 1
+
 
 if __name__ == "__main__":
-    run_evaluation()
+    sys.exit(main())
@@ -0,0 +1,458 @@
+"""
+KALDRA-SAFEGUARD v0.6 — módulo cache
+
+Cache de resultados endereçado por conteúdo para analyze_text/analyze_batch.
+
+A chave combina o digest SHA-256 do texto, o locale, a versão do modelo de
+scoring, o fingerprint das configurações, o digest dos assets da análise
+(`EMBEDDING_VERSION` e os JSON de arquétipos, Kindra 3×48 e Δ144) e os campos
+pedidos (`fields`). Trocar o modelo, um setting ou um asset que altera a
+análise muda a chave, invalidando automaticamente as entradas.
+
+- Camada em memória: LRU com limite de tamanho e TTL.
+- Camada em disco (opcional): SQLite, sobrevive a restarts do processo.
+  Limitada ao mesmo `max_entries` (saem as entradas gravadas há mais
+  tempo) e expurgada das expiradas a cada gravação; um lote é gravado em
+  uma única transação (`put_many`). O tamanho da tabela é mantido em uma
+  contagem corrente, sem `COUNT(*)` a cada gravação.
+
+Cada entrada guarda também o label, o plano e o Δ12 modulado que a análise
+registrou (`_summary`): um hit conta nas métricas de labels e no monitor de
+drift exatamente como o miss original.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .pipeline import (
+    ARCHETYPES_PATH, analyze_text, analyze_batch, analyze_batch_columnar, normalize_fields, normalize_locales,
+    _analyze_text,
+)
+from .metrics import record_labels
+from .kindra_drift import record_drift, summarize_batch
+from .model_registry import get_registry
+from .settings import get_settings, BiasSettings
+from ...core.src.assets import register_asset
+from ...core.src.delta144_mapping import DELTA144_GRID_PATH
+from ...core.src.embeddings import EMBEDDING_VERSION
+from ...core.src.kindra_3x48 import CULTURAL_3X48_PATH, LOCALES_MAP_PATH
+
+# Arquivos cujo conteúdo altera o resultado da análise
+ANALYSIS_ASSET_PATHS = (ARCHETYPES_PATH, CULTURAL_3X48_PATH, LOCALES_MAP_PATH, DELTA144_GRID_PATH)
+
+# Chaves por consulta `key IN (...)` (abaixo do limite de variáveis do SQLite)
+_SQL_BATCH = 500
+
+
+def _load_assets_digest() -> str:
+    digest = hashlib.sha256(EMBEDDING_VERSION.encode("utf-8"))
+    for path in ANALYSIS_ASSET_PATHS:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+# Calculado uma vez, como os próprios assets (ver core/src/assets.py)
+_ASSETS_DIGEST = register_asset("analysis_assets_digest", _load_assets_digest)
+
+
+def make_cache_key(
+    text: str,
+    locale: str,
+    settings: BiasSettings,
+    model_version: str,
+    fields: Optional[frozenset] = None,
+) -> str:
+    """Chave endereçada por conteúdo: (texto, locale, modelo, settings, assets, campos)."""
+    text_digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    selection = "*" if fields is None else ",".join(sorted(fields))
+    parts = (text_digest, locale, model_version, settings.fingerprint(), _ASSETS_DIGEST.get(), selection)
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+# Entradas de métricas/drift guardadas junto de cada resultado (nunca devolvidas)
+_SUMMARY_KEY = "_summary"
+
+
+def _with_summary(result: dict, label: str, plan: int, delta12: Optional[np.ndarray]) -> dict:
+    stored = dict(result)
+    stored[_SUMMARY_KEY] = {
+        "label": label,
+        "plan": int(plan),
+        "delta12": None if delta12 is None else [float(value) for value in delta12],
+    }
+    return stored
+
+
+def _record_hits(summaries: List[Optional[dict]], locales: List[str], settings: BiasSettings) -> None:
+    """
+    Registra os resultados servidos pelo cache como a pipeline registra os
+    analisados. Entradas gravadas sem resumo (versões antigas) são ignoradas.
+    """
+    known = [(summary, locale) for summary, locale in zip(summaries, locales) if summary]
+    if not known:
+        return
+    record_labels([summary["label"] for summary, _ in known], [locale for _, locale in known], settings)
+    if not settings.drift_enabled:
+        return
+    rows = [(summary, locale) for summary, locale in known if summary["delta12"] is not None]
+    if rows:
+        record_drift(summarize_batch(
+            np.array([summary["delta12"] for summary, _ in rows]),
+            [summary["label"] for summary, _ in rows],
+            [locale for _, locale in rows],
+            [summary["plan"] for summary, _ in rows],
+        ), settings)
+
+
+def _copy_result(result: dict) -> dict:
+    """
+    Cópia defensiva de um resultado armazenado.
+
+    `archetype_detail` continua compartilhado, como já acontece na pipeline.
+    """
+    copied = dict(result)
+    for key in ("explanation_layers", "signals"):
+        if isinstance(copied.get(key), dict):
+            copied[key] = dict(copied[key])
+    return copied
+
+
+class ResultCache:
+    """
+    Cache LRU + TTL com camada opcional em SQLite.
+
+    Thread-safe: a API executa a pipeline em threads do pool do FastAPI.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 50_000,
+        ttl_seconds: Optional[float] = 3600.0,
+        path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[Optional[float], dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        # Linhas na tabela e gravações desde o último COUNT(*) (outro processo
+        # pode gravar no mesmo arquivo; a contagem é refeita periodicamente)
+        self._disk_size = 0
+        self._disk_writes = 0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)")
+            self._db.commit()
+            self._recount_disk()
+
+    # --- Internal helpers ---
+
+    def _expires_at(self) -> Optional[float]:
+        return time.time() + self.ttl_seconds if self.ttl_seconds else None
+
+    def _store_memory(self, key: str, expires_at: Optional[float], result: dict) -> None:
+        self._memory[key] = (expires_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _recount_disk(self) -> None:
+        (self._disk_size,) = self._db.execute("SELECT COUNT(*) FROM results").fetchone()
+        self._disk_writes = 0
+
+    def _count_new_keys(self, keys: List[str]) -> int:
+        """Quantas das chaves (distintas) ainda não estão no disco."""
+        existing = 0
+        for start in range(0, len(keys), _SQL_BATCH):
+            chunk = keys[start:start + _SQL_BATCH]
+            (found,) = self._db.execute(
+                f"SELECT COUNT(*) FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchone()
+            existing += found
+        return len(keys) - existing
+
+    def _trim_disk(self, now: float) -> None:
+        """Expurga expiradas e aplica `max_entries` ao disco; chamar com o lock, antes do commit."""
+        cursor = self._db.execute(
+            "DELETE FROM results WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        expired = max(cursor.rowcount, 0)
+        self._counters["expirations"] += expired
+        self._disk_size -= expired
+        if self._disk_writes >= self.max_entries:
+            self._recount_disk()
+        excess = self._disk_size - self.max_entries
+        if excess > 0:
+            # INSERT OR REPLACE gera um rowid novo: rowid baixo = gravado há mais tempo
+            self._db.execute(
+                "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY rowid LIMIT ?)",
+                (excess,),
+            )
+            self._counters["evictions"] += excess
+            self._disk_size -= excess
+
+    def _get_disk(self, key: str, now: float) -> Optional[Tuple[Optional[float], dict]]:
+        row = self._db.execute(
+            "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._db.commit()
+            self._counters["expirations"] += 1
+            self._disk_size -= 1
+            return None
+        return expires_at, json.loads(value)
+
+    # --- Public API ---
+
+    def get(self, key: str) -> Optional[dict]:
+        """Retorna uma cópia do resultado em cache, ou None em caso de miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return _copy_result(result)
+                del self._memory[key]
+                self._counters["expirations"] += 1
+
+            if self._db is not None:
+                disk_entry = self._get_disk(key, now)
+                if disk_entry is not None:
+                    expires_at, result = disk_entry
+                    self._store_memory(key, expires_at, result)
+                    self._counters["hits"] += 1
+                    self._counters["disk_hits"] += 1
+                    return _copy_result(result)
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, result: dict) -> None:
+        """Armazena um resultado (sem `input_index`, que depende do lote)."""
+        self.put_many([(key, result)])
+
+    def put_many(self, items: Iterable[Tuple[str, dict]]) -> None:
+        """Armazena vários resultados; no disco, uma única transação para o lote."""
+        expires_at = self._expires_at()
+        entries = []
+        for key, result in items:
+            stored = _copy_result(result)
+            stored.pop("input_index", None)
+            entries.append((key, stored))
+        if not entries:
+            return
+
+        with self._lock:
+            for key, stored in entries:
+                self._store_memory(key, expires_at, stored)
+            if self._db is not None:
+                self._disk_size += self._count_new_keys(list(dict.fromkeys(key for key, _ in entries)))
+                self._disk_writes += len(entries)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                    [(key, json.dumps(stored, ensure_ascii=False), expires_at) for key, stored in entries],
+                )
+                self._trim_disk(time.time())
+                self._db.commit()
+
+    def prune(self) -> int:
+        """Remove entradas expiradas de ambas as camadas; retorna quantas saíram."""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            expired = [k for k, (exp, _) in self._memory.items() if exp is not None and exp <= now]
+            for key in expired:
+                del self._memory[key]
+            removed += len(expired)
+
+            if self._db is not None:
+                cursor = self._db.execute(
+                    "DELETE FROM results WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+                )
+                self._db.commit()
+                removed += cursor.rowcount
+                self._disk_size -= cursor.rowcount
+
+            self._counters["expirations"] += removed
+        return removed
+
+    def clear(self) -> None:
+        """Esvazia as duas camadas (os contadores são preservados)."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+                self._disk_size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de hit/miss/eviction e tamanho atual em memória."""
+        with self._lock:
+            return {**self._counters, "size": len(self._memory)}
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# --- Default cache (criado a partir dos settings) ---
+
+_DEFAULT_CACHE: Optional[ResultCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_cache(settings: Optional[BiasSettings] = None) -> ResultCache:
+    """Retorna o cache global, criando-o na primeira chamada."""
+    global _DEFAULT_CACHE
+    if settings is None:
+        settings = get_settings()
+
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = ResultCache(
+                max_entries=settings.cache_max_entries,
+                ttl_seconds=settings.cache_ttl_seconds,
+                path=settings.cache_path,
+            )
+        return _DEFAULT_CACHE
+
+
+def _resolve_cache(
+    settings: BiasSettings, cache: Optional[ResultCache]
+) -> Optional[ResultCache]:
+    if cache is not None:
+        return cache
+    return get_cache(settings) if settings.cache_enabled else None
+
+
+# --- Cached pipeline entry points ---
+
+def cached_analyze_text(
+    text: str,
+    locale: str = "pt-BR",
+    settings: Optional[BiasSettings] = None,
+    cache: Optional[ResultCache] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> dict:
+    """
+    analyze_text com cache. Sem `cache` explícito, usa o cache global apenas
+    se `settings.cache_enabled` for verdadeiro.
+    """
+    if settings is None:
+        settings = get_settings()
+    fields = normalize_fields(fields)
+
+    cache = _resolve_cache(settings, cache)
+    if cache is None:
+        return analyze_text(text, locale=locale, settings=settings, fields=fields)
+
+    # A chave e a análise usam o mesmo snapshot do modelo
+    model = get_registry().current()
+    key = make_cache_key(text, locale, settings, model.version, fields)
+    result = cache.get(key)
+    if result is None:
+        result, label, plan, delta12 = _analyze_text(text, locale, settings, model, fields)
+        cache.put(key, _with_summary(result, label, plan, delta12))
+    else:
+        _record_hits([result.pop(_SUMMARY_KEY, None)], [locale], settings)
+    return result
+
+
+def cached_analyze_batch(
+    texts: List[str],
+    locale: Union[str, Sequence[str]] = "pt-BR",
+    settings: Optional[BiasSettings] = None,
+    cache: Optional[ResultCache] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> List[dict]:
+    """
+    analyze_batch com cache. Apenas os textos ausentes do cache (e sem
+    repetição dentro do lote) passam pela pipeline vetorizada.
+
+    `locale` é único ou um por texto (ver analyze_batch); ele faz parte da
+    chave, então o mesmo texto em locales diferentes é analisado para cada um.
+    """
+    if settings is None:
+        settings = get_settings()
+    fields = normalize_fields(fields)
+    locale = normalize_locales(locale, len(texts))
+
+    cache = _resolve_cache(settings, cache)
+    if cache is None:
+        return analyze_batch(texts, locale=locale, settings=settings, fields=fields)
+
+    model = get_registry().current()
+    locales = [locale] * len(texts) if isinstance(locale, str) else locale
+    keys = [
+        make_cache_key(text, item_locale, settings, model.version, fields)
+        for text, item_locale in zip(texts, locales)
+    ]
+    results: List[Optional[dict]] = [cache.get(key) for key in keys]
+
+    # Textos ainda não analisados, deduplicados por chave; os demais (hits e
+    # repetições no lote) são registrados a partir do resumo guardado
+    pending: Dict[str, List[int]] = {}
+    hits: List[int] = []
+    summaries: List[Optional[dict]] = [None] * len(texts)
+    for idx, (key, result) in enumerate(zip(keys, results)):
+        if result is None:
+            pending.setdefault(key, []).append(idx)
+        else:
+            summaries[idx] = result.pop(_SUMMARY_KEY, None)
+            hits.append(idx)
+
+    if pending:
+        pending_keys = list(pending)
+        first = [pending[key][0] for key in pending_keys]
+        batch = analyze_batch_columnar(
+            [texts[idx] for idx in first],
+            locale=locale if isinstance(locale, str) else [locales[idx] for idx in first],
+            settings=settings, model=model, fields=fields, keep_delta12=True,
+        )
+        fresh = batch.to_dicts()
+        labels, plans = batch.labels.tolist(), batch.plans.tolist()
+        stored = [
+            _with_summary(
+                result, labels[row], plans[row],
+                None if batch.delta12 is None or batch.archetype_indices[row] < 0 else batch.delta12[row],
+            )
+            for row, result in enumerate(fresh)
+        ]
+        cache.put_many(zip(pending_keys, stored))
+        for key, result, entry in zip(pending_keys, fresh, stored):
+            for idx in pending[key]:
+                results[idx] = _copy_result(result)
+            for idx in pending[key][1:]:
+                summaries[idx] = entry[_SUMMARY_KEY]
+                hits.append(idx)
+
+    _record_hits([summaries[idx] for idx in hits], [locales[idx] for idx in hits], settings)
+    for idx, result in enumerate(results):
+        result["input_index"] = idx
+    return results
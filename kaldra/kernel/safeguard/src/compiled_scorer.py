@@ -0,0 +1,209 @@
+"""
+KALDRA-SAFEGUARD v0.6 — módulo compiled_scorer
+
+Closed-form export of the calibrated v0.4 scoring model.
+
+`model_v04.joblib` is a `CalibratedClassifierCV` (sigmoid / Platt scaling)
+wrapping one `LogisticRegression` per calibration fold. Its positive-class
+probability has a closed form:
+
+    decision_k = X @ w_k + c_k
+    p_k        = 1 / (1 + exp(a_k * decision_k + b_k))
+    p          = mean_k(p_k)
+
+where p is the probability of `classes_[1]`. `export_compiled_scorer`
+extracts (w_k, c_k, a_k, b_k) and the class labels into a small `.npz`
+artifact and `CompiledScorer` evaluates the formula with NumPy only, so
+sklearn stays off the request hot path.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# Labels of the positive class, by priority: v0.4 uses 0/1 labels, v0.2 text
+POSITIVE_LABELS = ("biased", 1, True)
+
+
+def positive_class_index(classes: Sequence[Any]) -> int:
+    """Index of the positive ("biased") class among a model's `classes_`."""
+    classes = list(classes)
+    for positive in POSITIVE_LABELS:
+        if positive in classes:
+            return classes.index(positive)
+    raise ValueError(f"Cannot find the 'biased' class among {classes!r}.")
+
+
+def export_compiled_scorer(
+    model: Any, path: Union[str, Path], source_digest: Optional[str] = None
+) -> Path:
+    """
+    Extracts the per-fold logistic and Platt-sigmoid parameters of a fitted
+    binary `CalibratedClassifierCV` and saves them as a `.npz` artifact.
+
+    Args:
+        model: fitted CalibratedClassifierCV with `method="sigmoid"` over
+            linear estimators exposing `coef_` and `intercept_`.
+        path: destination of the artifact.
+        source_digest: optional digest of the source model file, stored so
+            the compiled scorer reports the same model version.
+
+    Raises:
+        ValueError: if the model cannot be expressed in closed form.
+    """
+    calibrated = getattr(model, "calibrated_classifiers_", None)
+    if not calibrated:
+        raise ValueError("Model must be a fitted CalibratedClassifierCV.")
+    if len(model.classes_) != 2:
+        raise ValueError("Only binary calibrated models can be compiled.")
+
+    coefs, intercepts, slopes, offsets = [], [], [], []
+    for fold in calibrated:
+        estimator = fold.estimator
+        if not hasattr(estimator, "coef_") or not hasattr(estimator, "intercept_"):
+            raise ValueError(
+                f"Unsupported base estimator {type(estimator).__name__}: a linear model is required."
+            )
+        if fold.method != "sigmoid":
+            raise ValueError(
+                f"Unsupported calibration method '{fold.method}': only 'sigmoid' has a closed form."
+            )
+
+        calibrator = fold.calibrators[0]
+        coefs.append(np.asarray(estimator.coef_, dtype=np.float64).ravel())
+        intercepts.append(float(np.ravel(estimator.intercept_)[0]))
+        slopes.append(float(calibrator.a_))
+        offsets.append(float(calibrator.b_))
+
+    classes = np.asarray(model.classes_)
+    positive_class_index(classes.tolist())
+
+    # Written to a temporary file and renamed: a registry refresh never
+    # loads a partial artifact
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            format_version=np.array(FORMAT_VERSION),
+            coef=np.vstack(coefs),
+            intercept=np.array(intercepts),
+            sigmoid_a=np.array(slopes),
+            sigmoid_b=np.array(offsets),
+            classes=classes,
+            source_digest=np.array(source_digest or ""),
+        )
+    os.replace(tmp_path, path)
+    return path
+
+
+class CompiledScorer:
+    """
+    Pure-NumPy evaluation of an exported calibrated logistic model.
+
+    All folds are evaluated at once: one (N, F) x (F, K) product, the
+    sigmoid over (N, K) and a mean over the K calibrators.
+    """
+
+    def __init__(
+        self,
+        coef: np.ndarray,
+        intercept: np.ndarray,
+        sigmoid_a: np.ndarray,
+        sigmoid_b: np.ndarray,
+        source_digest: str = "",
+        classes: Sequence[Any] = (0, 1),
+    ):
+        # Stored transposed and contiguous for the (N, F) @ (F, K) product
+        self.coef_t = np.ascontiguousarray(np.asarray(coef, dtype=np.float64).T)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.sigmoid_a = np.asarray(sigmoid_a, dtype=np.float64)
+        self.sigmoid_b = np.asarray(sigmoid_b, dtype=np.float64)
+        self.source_digest = source_digest
+        self.classes = tuple(classes)
+        if len(self.classes) != 2:
+            raise ValueError("A compiled scorer needs exactly two classes.")
+        # The closed form gives P(classes[1]); P(positive) is its complement
+        # when the positive class comes first
+        self.positive_index = positive_class_index(self.classes)
+
+    @property
+    def n_features(self) -> int:
+        return self.coef_t.shape[0]
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CompiledScorer":
+        """
+        Loads a `.npz` artifact written by `export_compiled_scorer`.
+
+        Raises:
+            ValueError: for another format version, or classes without a
+                positive ("biased") label.
+        """
+        with np.load(path, allow_pickle=False) as artifact:
+            version = int(artifact["format_version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported compiled scorer format version: {version}")
+            return cls(
+                artifact["coef"],
+                artifact["intercept"],
+                artifact["sigmoid_a"],
+                artifact["sigmoid_b"],
+                source_digest=str(artifact["source_digest"]),
+                classes=artifact["classes"].tolist(),
+            )
+
+    def _predict_second_class(self, X: np.ndarray) -> np.ndarray:
+        """Calibrated probability of `classes[1]`, shape (N,)."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Input must be an (N, {self.n_features}) array.")
+
+        decision = X @ self.coef_t
+        decision += self.intercept
+        # Platt scaling, as in sklearn's _SigmoidCalibration: 1 / (1 + exp(a*f + b))
+        decision *= self.sigmoid_a
+        decision += self.sigmoid_b
+        # computed as exp(-log(1 + exp(z))) to avoid overflow warnings
+        proba = np.exp(-np.logaddexp(0.0, decision))
+
+        return proba.mean(axis=1)
+
+    def predict_proba_positive(self, X: np.ndarray) -> np.ndarray:
+        """Calibrated probability of the positive ("biased") class, shape (N,)."""
+        second = self._predict_second_class(X)
+        return second if self.positive_index == 1 else 1.0 - second
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """sklearn-compatible (N, 2) probabilities, columns in `classes` order."""
+        second = self._predict_second_class(X)
+        return np.column_stack((1.0 - second, second))
+
+
+def compile_joblib_model(
+    source: Union[str, Path], destination: Optional[Union[str, Path]] = None
+) -> Path:
+    """Exports a `.joblib` calibrated model next to it as `<name>.npz`."""
+    import joblib
+
+    source = Path(source)
+    destination = Path(destination) if destination else source.with_suffix(".npz")
+    digest = hashlib.sha256(source.read_bytes()).hexdigest()[:12]
+    return export_compiled_scorer(joblib.load(source), destination, source_digest=digest)
+
+
+if __name__ == "__main__":
+    import sys
+
+    MODEL_V04_PATH = Path(__file__).resolve().parent.parent / "data" / "model_v04.joblib"
+    src = Path(sys.argv[1]) if len(sys.argv) > 1 else MODEL_V04_PATH
+    dst = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    out = compile_joblib_model(src, dst)
+    print(f"Compiled scorer saved to: {out}")
@@ -1,10 +1,14 @@
 import json
 import numpy as np
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
+from ...core.src.assets import register_asset
+
 # --- Constants and Data Loading ---
-DATA_PATH = Path(__file__).parent.parent / "data" / "archetypes"
+# The archetype JSON files are shared with the other kernels in core/data
+DATA_PATH = Path(__file__).resolve().parents[2] / "core" / "data" / "archetypes"
 ARCHETYPES_PATH = DATA_PATH / "delta12_archetypes.json"
 
 def _load_archetypes():
@@ -13,7 +17,14 @@ def _load_archetypes():
         archetypes_data = json.load(f)
     return [item["name"] for item in sorted(archetypes_data, key=lambda x: x["id"])]
 
-ARCHETYPE_NAMES = _load_archetypes()
+# Loaded on first use (see core/src/assets.py)
+_ARCHETYPE_NAMES = register_asset("delta12_archetype_names", _load_archetypes)
+
+def __getattr__(name: str):
+    # Backwards-compatible access to the former module-level ARCHETYPE_NAMES
+    if name == "ARCHETYPE_NAMES":
+        return _ARCHETYPE_NAMES.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- V1 Explanation Function (Legacy) ---
 
@@ -32,7 +43,7 @@ def build_explanation(
         return explanation, dominant_archetype
 
     dominant_index = np.argmax(delta12)
-    dominant_archetype = ARCHETYPE_NAMES[dominant_index]
+    dominant_archetype = _ARCHETYPE_NAMES.get()[dominant_index]
 
     if label == "neutral":
         explanation = f"O texto não apresenta sinais fortes de viés. Arquétipo dominante: {dominant_archetype}."
@@ -45,41 +56,34 @@ def build_explanation(
 
 # --- V2 Layered Explanation Function ---
 
-def build_explanation_layers(
-    delta12: list[float],
-    label: str,
-    bias_score: Optional[float],
-    confidence: float,
-    archetype_name: str,
-    delta144_info: Dict[str, Any],
-    plan: int
-) -> Dict[str, str]:
+_HUMAN_BY_LABEL = {
+    "inconclusive": "O sistema preferiu não concluir sobre este texto devido à baixa confiança na análise.",
+    "neutral": "O texto não apresenta sinais fortes de viés.",
+}
+_HUMAN_BIASED = "O texto sugere viés na forma como se refere a pessoas ou grupos."
+
+@lru_cache(maxsize=4096)
+def _explanation_templates(label: str, archetype_name: str, hero_stage: str, plan: int) -> tuple[str, str, str]:
     """
-    Builds a multi-layered explanation of the analysis result.
+    Precompiled (human, technical template, symbolic) texts for a given
+    (label, archetype, hero_stage, plan). Only the technical layer still has
+    placeholders, for the per-call confidence and bias_score.
     """
     # --- Human Layer ---
-    if label == "inconclusive":
-        human_exp = "O sistema preferiu não concluir sobre este texto devido à baixa confiança na análise."
-    elif label == "neutral":
-        human_exp = "O texto não apresenta sinais fortes de viés."
-    else: # biased
-        human_exp = "O texto sugere viés na forma como se refere a pessoas ou grupos."
+    human_exp = _HUMAN_BY_LABEL.get(label, _HUMAN_BIASED)
 
     # --- Technical Layer ---
-    tech_exp = f"Confiança da análise: {confidence:.2f}. "
+    tech_template = "Confiança da análise: {confidence:.2f}. "
     if label == "inconclusive":
-        tech_exp += "A confiança não atingiu o limiar mínimo (τ-layer) para uma conclusão."
+        tech_template += "A confiança não atingiu o limiar mínimo (τ-layer) para uma conclusão."
     else:
-        # bias_score should not be None here, but we check for safety
-        score_str = f"{bias_score:.2f}" if bias_score is not None else "N/A"
-        tech_exp += f"O modelo estimou um bias_score de ≈ {score_str}, "
+        tech_template += "O modelo estimou um bias_score de ≈ {score}, "
         if label == "biased":
-            tech_exp += "ultrapassando o limiar de decisão de 0.5."
+            tech_template += "ultrapassando o limiar de decisão de 0.5."
         else:
-            tech_exp += "permanecendo abaixo do limiar de decisão de 0.5."
+            tech_template += "permanecendo abaixo do limiar de decisão de 0.5."
 
     # --- Symbolic Layer ---
-    hero_stage = delta144_info.get("hero_stage", "etapa desconhecida")
     symbolic_exp = (
         f"O texto ressoa com o arquétipo {archetype_name}, "
         f"na etapa '{hero_stage}' da jornada, "
@@ -87,8 +91,33 @@ def build_explanation_layers(
         f"Isso sugere um enquadramento simbólico relacionado a {archetype_name.lower()}."
     )
 
+    return human_exp, tech_template, symbolic_exp
+
+def build_explanation_layers(
+    delta12: list[float],
+    label: str,
+    bias_score: Optional[float],
+    confidence: float,
+    archetype_name: str,
+    delta144_info: Dict[str, Any],
+    plan: int
+) -> Dict[str, str]:
+    """
+    Builds a multi-layered explanation of the analysis result.
+
+    The texts come from templates cached per (label, archetype, hero_stage,
+    plan); only the confidence and bias_score are formatted on each call.
+    """
+    hero_stage = delta144_info.get("hero_stage", "etapa desconhecida")
+    human_exp, tech_template, symbolic_exp = _explanation_templates(
+        label, archetype_name, hero_stage, plan
+    )
+
+    # bias_score should not be None for conclusive labels, but we check for safety
+    score_str = f"{bias_score:.2f}" if bias_score is not None else "N/A"
+
     return {
         "human": human_exp,
-        "technical": tech_exp,
+        "technical": tech_template.format(confidence=confidence, score=score_str),
         "symbolic": symbolic_exp,
     }
@@ -0,0 +1,233 @@
+"""
+KALDRA-SAFEGUARD v0.6 — módulo feature_store
+
+Features materializadas (embeddings e Δ12) para treino e avaliação.
+
+Cada dataset vira um diretório com três arquivos `.npy` alinhados por linha
+e um manifesto:
+
+- embeddings.npy  (N, 384) float32
+- delta12.npy     (N, 12)  float64, Δ12 antes da modulação Kindra
+- digests.npy     (N, 16)  uint8, SHA-256 truncado de cada texto
+- manifest.json   versão das features, número de linhas válidas e hash do
+  conteúdo
+
+Os arrays são abertos com `mmap_mode="r"`: carregar um dataset de milhões
+de linhas não copia nada para a memória do processo.
+
+Quando o dataset cresce por acréscimo no fim (o caso do CSV rotulado), os
+digests das linhas já materializadas batem com o início do dataset novo e
+só as linhas novas são calculadas e anexadas aos arquivos. Qualquer outra
+mudança (linhas editadas, removidas ou reordenadas, ou uma nova versão dos
+embeddings) refaz o diretório inteiro.
+
+O manifesto só é atualizado depois que os dados de um bloco estão no disco;
+linhas além de `rows` (de uma execução interrompida) são ignoradas e
+sobrescritas na próxima.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+from ...core.src.embeddings import EMBEDDING_VERSION, get_embeddings
+from ...core.src.delta12 import project_to_delta12_batch
+from .settings import get_settings
+from ...core.src.logging_config import get_logger
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / "data" / "features"
+
+# Muda quando embeddings ou a projeção Δ12 mudam
+FEATURE_VERSION = f"{EMBEDDING_VERSION}+delta12-v1"
+# Linhas calculadas (e gravadas) por vez; limita a memória em datasets grandes
+COMPUTE_BLOCK_SIZE = 65_536
+DIGEST_SIZE = 16
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def text_digests(texts: Sequence[str]) -> np.ndarray:
+    """Digest de cada texto, como matriz (N, 16) uint8."""
+    buffer = b"".join(hashlib.sha256(text.encode("utf-8")).digest()[:DIGEST_SIZE] for text in texts)
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(len(texts), DIGEST_SIZE)
+
+
+@dataclass(frozen=True)
+class FeatureManifest:
+    feature_version: str
+    rows: int
+    content_hash: str
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, indent=2)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["FeatureManifest"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(**json.load(f))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+
+
+@dataclass(frozen=True)
+class FeatureSet:
+    """Features de um dataset; os arrays são views somente leitura do disco."""
+
+    name: str
+    embeddings: np.ndarray
+    delta12: np.ndarray
+    content_hash: str
+    feature_version: str
+
+    def __len__(self) -> int:
+        return self.delta12.shape[0]
+
+
+# --- Arquivos .npy que crescem no eixo 0 ---
+
+def _write_rows(path: Path, block: np.ndarray, at_row: int) -> None:
+    """
+    Grava `block` a partir da linha `at_row`, descarta o que vier depois e
+    atualiza o shape no cabeçalho. O `np.save` reserva espaço no cabeçalho
+    para o eixo 0 crescer, então ele é reescrito no lugar.
+    """
+    with open(path, "r+b") as f:
+        version = npy_format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = npy_format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = npy_format.read_array_header_2_0(f)
+        offset = f.tell()
+        row_bytes = shape[1] * dtype.itemsize
+        block = np.ascontiguousarray(block, dtype=dtype)
+
+        f.seek(offset + at_row * row_bytes)
+        f.write(block.tobytes())
+        f.truncate()
+
+        header = {
+            "descr": npy_format.dtype_to_descr(dtype),
+            "fortran_order": fortran_order,
+            "shape": (at_row + block.shape[0], shape[1]),
+        }
+        f.seek(0)
+        if version == (1, 0):
+            npy_format.write_array_header_1_0(f, header)
+        else:
+            npy_format.write_array_header_2_0(f, header)
+        if f.tell() != offset:
+            raise RuntimeError(f"Header of {path} changed size; the feature set must be rebuilt.")
+
+
+def _open_rows(path: Path, rows: int) -> np.ndarray:
+    return np.load(path, mmap_mode="r")[:rows]
+
+
+class FeatureStore:
+    """Diretório com um conjunto de features por dataset."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def path_for(self, name: str) -> Path:
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid feature set name: {name!r}")
+        return self.root / name
+
+    def load(self, name: str) -> Optional[FeatureSet]:
+        """Features gravadas para `name`, sem conferir textos; None se ausentes ou obsoletas."""
+        directory = self.path_for(name)
+        manifest = FeatureManifest.load(directory / "manifest.json")
+        if manifest is None or manifest.feature_version != FEATURE_VERSION:
+            return None
+        return self._open(name, manifest)
+
+    def materialize(self, texts: Sequence[str], name: Optional[str] = None) -> FeatureSet:
+        """
+        Features de `texts`, calculando apenas as linhas que ainda não estão
+        no disco. Sem `name`, o conjunto é identificado pelo hash do conteúdo.
+        """
+        logger = get_logger()
+        digests = text_digests(texts)
+        if name is None:
+            name = f"dataset-{hashlib.sha256(digests.tobytes()).hexdigest()[:16]}"
+        directory = self.path_for(name)
+        manifest_path = directory / "manifest.json"
+
+        start = self._reusable_rows(directory, FeatureManifest.load(manifest_path), digests)
+        content = hashlib.sha256(digests[:start].tobytes())
+        manifest = FeatureManifest(FEATURE_VERSION, start, content.hexdigest())
+        if start == 0:
+            if directory.exists():
+                shutil.rmtree(directory)
+            directory.mkdir(parents=True)
+            empty = get_embeddings([])
+            np.save(directory / "embeddings.npy", empty)
+            np.save(directory / "delta12.npy", project_to_delta12_batch(empty))
+            np.save(directory / "digests.npy", digests[:0])
+            manifest.save(manifest_path)
+
+        if start < len(texts):
+            logger.info(
+                "[feature_store] {}: computing {} new rows ({} already stored).",
+                name, len(texts) - start, start,
+            )
+        for block_start in range(start, len(texts), COMPUTE_BLOCK_SIZE):
+            block_end = min(block_start + COMPUTE_BLOCK_SIZE, len(texts))
+            embeddings = get_embeddings(list(texts[block_start:block_end]))
+            delta12 = project_to_delta12_batch(embeddings)
+            _write_rows(directory / "embeddings.npy", embeddings, block_start)
+            _write_rows(directory / "delta12.npy", delta12, block_start)
+            _write_rows(directory / "digests.npy", digests[block_start:block_end], block_start)
+
+            content.update(digests[block_start:block_end].tobytes())
+            manifest = FeatureManifest(FEATURE_VERSION, block_end, content.hexdigest())
+            manifest.save(manifest_path)
+
+        return self._open(name, manifest)
+
+    def _reusable_rows(
+        self, directory: Path, manifest: Optional[FeatureManifest], digests: np.ndarray
+    ) -> int:
+        """Linhas gravadas que são prefixo exato do dataset atual (0 se nenhuma)."""
+        if manifest is None or manifest.feature_version != FEATURE_VERSION:
+            return 0
+        if manifest.rows > len(digests):
+            return 0
+        try:
+            stored = _open_rows(directory / "digests.npy", manifest.rows)
+        except (FileNotFoundError, ValueError):
+            return 0
+        if stored.shape[0] != manifest.rows or not np.array_equal(stored, digests[:manifest.rows]):
+            return 0
+        return manifest.rows
+
+    def _open(self, name: str, manifest: FeatureManifest) -> FeatureSet:
+        directory = self.path_for(name)
+        return FeatureSet(
+            name=name,
+            embeddings=_open_rows(directory / "embeddings.npy", manifest.rows),
+            delta12=_open_rows(directory / "delta12.npy", manifest.rows),
+            content_hash=manifest.content_hash,
+            feature_version=manifest.feature_version,
+        )
+
+
+def get_feature_store() -> FeatureStore:
+    """Store padrão (`data/features/`, ou `KALDRA_FEATURE_STORE_DIR`)."""
+    settings = get_settings()
+    return FeatureStore(settings.feature_store_dir or DEFAULT_STORE_DIR)
@@ -1,7 +1,94 @@
 """
 KALDRA-SAFEGUARD v0.6 — módulo kindra_drift
 
-Stub inicial do operador simbólico/matemático para o kernel SAFEGUARD.
-A implementação real será adicionada em etapas posteriores.
+Monitor de drift cultural/arquetípico online, alimentado pela pipeline.
+
+- Cada lote analisado gera um resumo por locale e por plano (média e
+  covariância de Δ12, histograma de arquétipos, contagem de labels) onde
+  foi analisado, inclusive nos workers do pool; o processo principal
+  apenas o incorpora ao monitor global (`record_drift`).
+- O drift de cada janela fechada (PSI/KL contra a referência) fica
+  disponível em `/drift` e é entregue aos callbacks registrados com
+  `get_drift_monitor().add_callback(...)`, para alertas em tempo real.
+- A referência é um snapshot das estatísticas acumuladas
+  (`freeze_reference`), salvo em `drift_reference_path` e recarregado na
+  inicialização.
+
+O motor (estatísticas incrementais, PSI/KL, janelas) está em
+`kernel/core/src/kindra_drift.py`.
 """
-# TODO: implementar kindra_drift para o KALDRA-SAFEGUARD.
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from ...core.src.kindra_drift import (
+    DriftKey, DriftMonitor, DriftReference, DriftStats, merge_summaries, summarize_batch,
+)
+from .settings import BiasSettings, get_settings
+from ...core.src.logging_config import get_logger
+
+_MONITOR: Optional[DriftMonitor] = None
+_MONITOR_LOCK = threading.Lock()
+
+
+def _load_reference(settings: BiasSettings) -> Optional[DriftReference]:
+    path = settings.drift_reference_path
+    if not path or not Path(path).exists():
+        return None
+    try:
+        return DriftReference.load(path)
+    except (OSError, ValueError, KeyError) as exc:
+        get_logger().warning("Referência de drift inválida em {}: {}", path, exc)
+        return None
+
+
+def get_drift_monitor(settings: Optional[BiasSettings] = None) -> DriftMonitor:
+    """Retorna o monitor global, criando-o na primeira chamada."""
+    global _MONITOR
+    if settings is None:
+        settings = get_settings()
+
+    with _MONITOR_LOCK:
+        if _MONITOR is None:
+            _MONITOR = DriftMonitor(
+                window_size=settings.drift_window_size,
+                psi_threshold=settings.drift_psi_threshold,
+                kl_threshold=settings.drift_kl_threshold,
+                reference=_load_reference(settings),
+            )
+        return _MONITOR
+
+
+def record_drift(
+    summary: Optional[Dict[DriftKey, DriftStats]], settings: Optional[BiasSettings] = None
+) -> None:
+    """Incorpora o resumo de um lote ao monitor global (se o drift estiver ligado)."""
+    if settings is None:
+        settings = get_settings()
+    if not summary or not settings.drift_enabled:
+        return
+    for report in get_drift_monitor(settings).merge(summary):
+        if report.drifted:
+            get_logger().warning(
+                "Drift detectado em {} (PSI={:.3f}, KL={:.3f})", "{}:{}".format(*report.key),
+                report.psi, report.kl,
+            )
+
+
+def freeze_reference(settings: Optional[BiasSettings] = None) -> DriftReference:
+    """
+    Usa as estatísticas acumuladas até agora como nova referência e a salva
+    em `drift_reference_path`, se configurado.
+    """
+    if settings is None:
+        settings = get_settings()
+    monitor = get_drift_monitor(settings)
+    reference = monitor.snapshot()
+    monitor.set_reference(reference)
+    if settings.drift_reference_path:
+        reference.save(settings.drift_reference_path)
+    return reference
+
@@ -0,0 +1,301 @@
+"""
+KALDRA-SAFEGUARD v0.6 — módulo longdoc
+
+Análise de documentos muito longos (relatórios 10-K, transcrições de vários
+MB) com memória limitada.
+
+O texto é lido em blocos e cortado em janelas de `window_chars` caracteres
+(com sobreposição, cortando em espaços sempre que possível). As janelas são
+analisadas em lotes vetorizados e as distribuições Δ12 são agregadas por uma
+média ponderada pelo tamanho de cada janela; só a soma corrente fica em
+memória, nunca o documento inteiro.
+
+Quando a confiança da média corrente para de mudar (variação menor que
+`stability_tolerance` por `patience` janelas seguidas), a leitura para cedo.
+
+Uso:
+    analyze_document(open("10k.txt", encoding="utf-8"))
+    analyze_document(Path("transcricao.txt"), include_windows=True)
+
+    analyzer = LongDocumentAnalyzer(locale="en-US")
+    for chunk in stream:
+        analyzer.feed(chunk)
+        if analyzer.done:
+            break
+    result = analyzer.finish()
+"""
+
+from __future__ import annotations
+
+import codecs
+from pathlib import Path
+from typing import IO, Iterable, List, Optional, Union
+
+import numpy as np
+
+from ...core.src.embeddings import get_embeddings
+from ...core.src.delta12 import project_to_delta12_batch
+from ...core.src.kindra_3x48 import apply_kindra_batch
+from .tau import apply_tau_policy_batch, estimate_confidence_batch
+from .scorer import compute_bias_scores
+from ...core.src.delta144_mapping import map_to_delta144
+from .model_registry import ModelHandle, get_registry
+from .metrics import record_labels
+from .kindra_drift import record_drift, summarize_batch
+from .settings import BiasSettings, get_settings
+from ...core.src.logging_config import get_logger
+from .pipeline import _DELTA12_META
+from .results import _assemble_result, _empty_result
+
+DocumentSource = Union[str, Path, IO, Iterable[Union[str, bytes]]]
+
+# Tamanho de cada leitura de arquivos e streams
+READ_SIZE = 64 * 1024
+
+# Um corte de janela procura um espaço nos últimos 10% da janela
+_CUT_SEARCH_FRACTION = 0.1
+
+
+class LongDocumentAnalyzer:
+    """
+    Analisador incremental: recebe o texto em blocos (`feed`) e produz um
+    único resultado agregado (`finish`).
+
+    A memória usada é limitada a uma janela em construção, um lote de janelas
+    pendentes e a soma corrente Δ12 (mais os detalhes por janela, se
+    `include_windows=True`).
+    """
+
+    def __init__(
+        self,
+        locale: str = "pt-BR",
+        settings: Optional[BiasSettings] = None,
+        window_chars: Optional[int] = None,
+        overlap_chars: Optional[int] = None,
+        windows_per_batch: int = 64,
+        early_stop: bool = True,
+        stability_tolerance: Optional[float] = None,
+        patience: Optional[int] = None,
+        min_windows: Optional[int] = None,
+        include_windows: bool = False,
+        model: Optional[ModelHandle] = None,
+    ):
+        if settings is None:
+            settings = get_settings()
+        self.settings = settings
+        self.locale = locale
+        self.window_chars = window_chars or settings.longdoc_window_chars
+        self.overlap_chars = settings.longdoc_overlap_chars if overlap_chars is None else overlap_chars
+        if not 0 <= self.overlap_chars < self.window_chars // 2:
+            raise ValueError("overlap_chars must be between 0 and half of window_chars.")
+        self.windows_per_batch = max(1, windows_per_batch)
+        self.early_stop = early_stop
+        self.stability_tolerance = (
+            settings.longdoc_stability_tolerance if stability_tolerance is None else stability_tolerance
+        )
+        self.patience = settings.longdoc_patience if patience is None else patience
+        self.min_windows = self.patience if min_windows is None else min_windows
+        self.include_windows = include_windows
+        # Um único snapshot do modelo para o documento inteiro
+        self.model = model if model is not None else get_registry().current()
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer = ""
+        self._buffer_offset = 0  # posição (em caracteres) do início do buffer
+        self._pending: List[tuple] = []  # (start, text)
+
+        self._weighted_sum = np.zeros(12, dtype=np.float64)
+        self._total_weight = 0.0
+        self._windows = 0
+        self._characters = 0
+        self._last_confidence: Optional[float] = None
+        self._stable_windows = 0
+        self._plan: Optional[int] = None
+        self._window_details: List[dict] = []
+
+        self.done = False
+
+    # --- Entrada ---
+
+    def feed(self, chunk: Union[str, bytes]) -> None:
+        """Adiciona texto (str ou bytes UTF-8) e analisa as janelas completas."""
+        if self.done:
+            return
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        buffer = self._buffer + chunk
+
+        # Janelas são fatiadas por posição; o buffer é cortado uma vez no fim
+        position = 0
+        while not self.done and len(buffer) - position > self.window_chars:
+            cut = self._find_cut(buffer, position)
+            self._pending.append((self._buffer_offset + position, buffer[position:position + cut]))
+            position += max(1, cut - self.overlap_chars)
+            if len(self._pending) >= self.windows_per_batch:
+                self._flush()
+
+        self._buffer = buffer[position:]
+        self._buffer_offset += position
+
+    def _find_cut(self, buffer: str, position: int) -> int:
+        """Tamanho da próxima janela: termina no último espaço perto do limite, se houver."""
+        search_from = position + int(self.window_chars * (1.0 - _CUT_SEARCH_FRACTION))
+        space = buffer.rfind(" ", search_from, position + self.window_chars)
+        return space - position + 1 if space >= 0 else self.window_chars
+
+    # --- Análise ---
+
+    def _flush(self) -> None:
+        """Analisa as janelas pendentes como um lote vetorizado."""
+        pending = [(start, text) for start, text in self._pending if text.strip()]
+        self._pending = []
+        if not pending or self.done:
+            return
+
+        texts = [text for _, text in pending]
+        embeddings = get_embeddings(texts)
+        delta12 = project_to_delta12_batch(embeddings)
+        delta12_modulated, self._plan = apply_kindra_batch(delta12, self.locale)
+        weights = np.fromiter((len(text) for text in texts), dtype=np.float64, count=len(texts))
+
+        # Médias correntes após cada janela, para achar o ponto de estabilidade
+        running_sums = self._weighted_sum + np.cumsum(delta12_modulated * weights[:, None], axis=0)
+        running_weights = self._total_weight + np.cumsum(weights)
+        running_confidence = estimate_confidence_batch(running_sums / running_weights[:, None])
+
+        used = len(texts)
+        for row, confidence in enumerate(running_confidence.tolist()):
+            if self._last_confidence is not None and (
+                abs(confidence - self._last_confidence) < self.stability_tolerance
+            ):
+                self._stable_windows += 1
+            else:
+                self._stable_windows = 0
+            self._last_confidence = confidence
+            if (
+                self.early_stop
+                and self._windows + row + 1 >= self.min_windows
+                and self._stable_windows >= self.patience
+            ):
+                used = row + 1
+                self.done = True
+                break
+
+        self._weighted_sum = running_sums[used - 1]
+        self._total_weight = float(running_weights[used - 1])
+        if self.include_windows:
+            self._record_windows(pending[:used], delta12_modulated[:used])
+        self._windows += used
+        self._characters += int(weights[:used].sum())
+
+    def _record_windows(self, windows: List[tuple], delta12_modulated: np.ndarray) -> None:
+        confidences, conclusive = apply_tau_policy_batch(delta12_modulated, self.settings.tau_threshold)
+        scores, labels = compute_bias_scores(delta12_modulated, model=self.model)
+        archetype_meta = _DELTA12_META.get()
+        dominant = np.argmax(delta12_modulated, axis=1)
+        for row, (start, text) in enumerate(windows):
+            self._window_details.append({
+                "window_index": self._windows + row,
+                "start": start,
+                "length": len(text),
+                "dominant_archetype": archetype_meta[int(dominant[row])]["name"],
+                "confidence": float(confidences[row]),
+                "label": labels[row] if conclusive[row] else "inconclusive",
+                "bias_score": float(scores[row]) if conclusive[row] else None,
+            })
+
+    # --- Resultado ---
+
+    def finish(self) -> dict:
+        """Analisa o restante do texto e devolve o resultado agregado."""
+        if not self.done:
+            self._buffer += self._decoder.decode(b"", final=True)
+            if self._buffer.strip():
+                self._pending.append((self._buffer_offset, self._buffer))
+            self._buffer = ""
+            self._flush()
+
+        if self._windows == 0:
+            result = _empty_result(self.model.version)
+            record_labels(("unknown",), self.locale, self.settings)
+        else:
+            result = self._aggregate()
+
+        result["document"] = {
+            "windows_analyzed": self._windows,
+            "characters_analyzed": self._characters,
+            "window_chars": self.window_chars,
+            "overlap_chars": self.overlap_chars,
+            "stopped_early": self.done,
+        }
+        if self.include_windows:
+            result["windows"] = self._window_details
+        return result
+
+    def _aggregate(self) -> dict:
+        mean_delta12 = (self._weighted_sum / self._total_weight).reshape(1, 12)
+        confidences, conclusive = apply_tau_policy_batch(mean_delta12, self.settings.tau_threshold)
+        confidence = float(confidences[0])
+
+        if conclusive[0]:
+            scores, labels = compute_bias_scores(mean_delta12, model=self.model)
+            bias_score, label = float(scores[0]), labels[0]
+        else:
+            bias_score, label = None, "inconclusive"
+
+        dominant_archetype_name = _DELTA12_META.get()[int(np.argmax(mean_delta12[0]))]["name"]
+        result = _assemble_result(
+            mean_delta12[0], label, bias_score, confidence, self._plan,
+            dominant_archetype_name, map_to_delta144(dominant_archetype_name), self.model.version,
+        )
+        record_labels((label,), self.locale, self.settings)
+        # O documento entra no monitor de drift como um item, pela média agregada
+        if self.settings.drift_enabled:
+            record_drift(summarize_batch(mean_delta12, (label,), self.locale, self._plan), self.settings)
+        get_logger().info(
+            "[analyze_document] Concluído: {} janelas, {} caracteres, parada antecipada={}",
+            self._windows, self._characters, self.done,
+        )
+        return result
+
+
+def _iter_chunks(source: DocumentSource) -> Iterable[Union[str, bytes]]:
+    """Normaliza as fontes aceitas em um iterador de blocos."""
+    if isinstance(source, Path):
+        with open(source, "rb") as f:
+            yield from iter(lambda: f.read(READ_SIZE), b"")
+    elif isinstance(source, str):
+        for start in range(0, len(source), READ_SIZE):
+            yield source[start:start + READ_SIZE]
+    elif hasattr(source, "read"):
+        yield from iter(lambda: source.read(READ_SIZE), source.read(0))
+    else:
+        yield from source
+
+
+def analyze_document(
+    source: DocumentSource,
+    locale: str = "pt-BR",
+    settings: Optional[BiasSettings] = None,
+    **options,
+) -> dict:
+    """
+    Analisa um documento longo em janelas e devolve um resultado agregado.
+
+    Args:
+        source: texto (str), caminho (`Path`), arquivo aberto (texto ou
+            binário) ou iterável de blocos str/bytes.
+        locale: locale aplicado a todas as janelas.
+        options: repassadas a `LongDocumentAnalyzer` (window_chars,
+            overlap_chars, early_stop, include_windows, ...).
+
+    Returns:
+        O mesmo contrato de analyze_text, mais `document` (janelas e
+        caracteres analisados, parada antecipada) e, se pedido, `windows`.
+    """
+    analyzer = LongDocumentAnalyzer(locale=locale, settings=settings, **options)
+    for chunk in _iter_chunks(source):
+        analyzer.feed(chunk)
+        if analyzer.done:
+            break
+    return analyzer.finish()
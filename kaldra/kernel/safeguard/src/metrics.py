@@ -0,0 +1,319 @@
+"""
+KALDRA-SAFEGUARD v0.6 — módulo metrics
+
+Métricas de latência por estágio da pipeline, no formato de exposição de
+texto do Prometheus (servidas em `/metrics`), sem dependências externas.
+
+- Histogramas com buckets fixos, pré-alocados por série: registrar uma
+  observação é um `bisect` e dois incrementos sob um lock.
+- Contadores para volume de análises por label (taxa de inconclusivos) e
+  histogramas de tamanho de lote.
+- Amostragem opcional dos spans de tempo (`metrics_sample_rate`): quando uma
+  chamada não é amostrada, o timer é um no-op.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .settings import BiasSettings, get_settings
+
+KERNEL = "safeguard"
+
+# Segundos: de 50µs (estágios vetorizados) a 10s (lotes grandes)
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Limite de séries por métrica: protege contra locales arbitrários vindos da API
+MAX_SERIES = 1000
+_OVERFLOW_VALUE = "other"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._series: Dict[LabelValues, object] = {}
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def _get_series(self, values: LabelValues):
+        """Série dos labels dados; chamar com o lock adquirido."""
+        series = self._series.get(values)
+        if series is None:
+            if len(self._series) >= MAX_SERIES:
+                values = (_OVERFLOW_VALUE,) * len(self.label_names)
+                series = self._series.get(values)
+            if series is None:
+                series = self._new_series()
+                self._series[values] = series
+        return series
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    @property
+    def family_name(self) -> str:
+        """Nome usado em HELP/TYPE: o mesmo das amostras (formato texto 0.0.4)."""
+        return self.name
+
+    def render(self) -> List[str]:
+        family = self.family_name
+        lines = [f"# HELP {family} {self.documentation}", f"# TYPE {family} {self.kind}"]
+        with self._lock:
+            snapshot = [(values, self._copy(series)) for values, series in self._series.items()]
+        for values, series in sorted(snapshot):
+            lines.extend(self._render_series(values, series))
+        return lines
+
+    def _copy(self, series):
+        return series
+
+    def _render_series(self, values: LabelValues, series) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contador monotônico por conjunto de labels."""
+
+    kind = "counter"
+
+    def _new_series(self):
+        return [0.0]
+
+    def inc(self, *values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._get_series(values)[0] += amount
+
+    def value(self, *values: str) -> float:
+        with self._lock:
+            series = self._series.get(values)
+            return series[0] if series else 0.0
+
+    @property
+    def family_name(self) -> str:
+        # As amostras de um counter terminam em _total; os metadados também
+        return self.name if self.name.endswith("_total") else f"{self.name}_total"
+
+    def _copy(self, series):
+        return list(series)
+
+    def _render_series(self, values, series):
+        labels = _format_labels(self.label_names, values)
+        return [f"{self.family_name}{labels} {_format_number(series[0])}"]
+
+
+class Histogram(_Metric):
+    """
+    Histograma com buckets fixos. Cada série é uma lista pré-alocada de
+    contagens não cumulativas (+Inf no fim), mais soma e contagem.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float]):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self):
+        # [counts por bucket..., +Inf, soma, contagem]
+        return [0] * (len(self.buckets) + 1) + [0.0, 0]
+
+    def observe(self, value: float, *values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._get_series(values)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def observe_many(self, observations: Iterable[Tuple[LabelValues, float]]) -> None:
+        """Registra várias observações adquirindo o lock uma única vez."""
+        buckets = self.buckets
+        with self._lock:
+            for values, value in observations:
+                series = self._get_series(values)
+                series[bisect_left(buckets, value)] += 1
+                series[-2] += value
+                series[-1] += 1
+
+    def count(self, *values: str) -> int:
+        with self._lock:
+            series = self._series.get(values)
+            return series[-1] if series else 0
+
+    def _copy(self, series):
+        return list(series)
+
+    def _render_series(self, values, series):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), series):
+            cumulative += count
+            labels = _format_labels(self.label_names, values, f'le="{_format_number(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, values)
+        lines.append(f"{self.name}_sum{labels} {_format_number(series[-2])}")
+        lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Conjunto de métricas renderizado junto em `/metrics`."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "kaldra_stage_duration_seconds",
+    "Time spent in each analysis pipeline stage (per call, whole batch for analyze_batch).",
+    ("kernel", "stage", "locale", "label"),
+    LATENCY_BUCKETS,
+))
+ANALYSES = REGISTRY.register(Counter(
+    "kaldra_analyses",
+    "Analyzed texts by resulting label (includes inconclusive and unknown).",
+    ("kernel", "locale", "label"),
+))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    "kaldra_batch_size",
+    "Number of texts per analyze_batch call.",
+    ("kernel",),
+    BATCH_SIZE_BUCKETS,
+))
+
+PIPELINE_STAGES = ("embedding", "delta12", "kindra", "tau", "scoring", "delta144", "explanation")
+
+
+class StageTimer:
+    """
+    Mede o tempo de cada estágio entre chamadas a `mark()` e registra tudo
+    de uma vez em `finish()`, quando o label do resultado já é conhecido.
+    """
+
+    __slots__ = ("locale", "_start", "_last", "_spans")
+
+    def __init__(self, locale: str):
+        self.locale = locale
+        self._start = self._last = time.perf_counter()
+        self._spans: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str) -> None:
+        """Atribui a `stage` o tempo decorrido desde o último mark."""
+        now = time.perf_counter()
+        self._spans.append((stage, now - self._last))
+        self._last = now
+
+    def finish(self, label: str) -> None:
+        spans = self._spans
+        spans.append(("total", time.perf_counter() - self._start))
+        locale = self.locale
+        STAGE_SECONDS.observe_many(
+            ((KERNEL, stage, locale, label), seconds) for stage, seconds in spans
+        )
+
+
+class _NullTimer:
+    """Timer usado quando a chamada não é amostrada (ou métricas desligadas)."""
+
+    __slots__ = ()
+
+    def mark(self, stage: str) -> None:
+        pass
+
+    def finish(self, label: str) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def start_timer(locale: str, settings: Optional[BiasSettings] = None):
+    """Novo StageTimer, ou o timer nulo se a chamada não for amostrada."""
+    if settings is None:
+        settings = get_settings()
+    if not settings.metrics_enabled:
+        return NULL_TIMER
+    rate = settings.metrics_sample_rate
+    if rate < 1.0 and random.random() >= rate:
+        return NULL_TIMER
+    return StageTimer(locale)
+
+
+def record_labels(labels, locale, settings: Optional[BiasSettings] = None) -> None:
+    """
+    Conta os resultados por label (sempre, independente da amostragem).
+
+    `locale` é um único locale ou uma sequência com o locale de cada label.
+    """
+    if settings is None:
+        settings = get_settings()
+    if not settings.metrics_enabled:
+        return
+    pairs = ((locale, label) for label in labels) if isinstance(locale, str) else zip(locale, labels)
+    counts: Dict[Tuple[str, str], int] = {}
+    for pair in pairs:
+        counts[pair] = counts.get(pair, 0) + 1
+    for (item_locale, label), count in counts.items():
+        ANALYSES.inc(KERNEL, item_locale, label, amount=count)
+
+
+def record_batch_size(size: int, settings: Optional[BiasSettings] = None) -> None:
+    if settings is None:
+        settings = get_settings()
+    if settings.metrics_enabled:
+        BATCH_SIZE.observe(size, KERNEL)
+
+
+def render_metrics() -> str:
+    """Todas as métricas no formato de texto do Prometheus."""
+    return REGISTRY.render()
@@ -0,0 +1,315 @@
+"""
+KALDRA-SAFEGUARD v0.6 — módulo model_registry
+
+Registro de modelos de scoring versionados, com troca a quente.
+
+Os artefatos são descobertos em `kernel/safeguard/data/` pelo nome
+(`model_v04.joblib`, `model_v04.npz`, `model_v05.joblib`, ...). A versão mais
+alta vence; para a mesma versão, o export compilado (`.npz`, só NumPy) tem
+prioridade sobre o `.joblib`, desde que tenha sido gerado a partir dele: um
+`.npz` cujo `source_digest` não é o digest do `.joblib` atual é ignorado.
+
+Cada lote pega um snapshot (`ModelHandle`) do modelo ativo e o usa do início
+ao fim. `refresh()` carrega uma versão nova em segundo plano e a publica com
+uma única atribuição, então lotes em andamento terminam no modelo antigo e os
+seguintes já usam o novo, sem reiniciar o processo.
+
+Arquivos `.joblib` são carregados com `mmap_mode="r"`: os arrays NumPy do
+modelo ficam mapeados do disco e são compartilhados entre os processos
+workers em vez de copiados em cada um.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .compiled_scorer import CompiledScorer, positive_class_index
+from ...core.src.logging_config import get_logger
+
+DEFAULT_MODEL_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# model_v1.2.npz -> (1, 2). Nomes legados (sem ponto) só existem na série 0:
+# model_v04.joblib -> (0, 4), model_v012 -> (0, 12); model_v10 não é aceito
+# (ambíguo) e deve ser gravado como model_v1.0
+_ARTIFACT_PATTERN = re.compile(r"^model_v(?:(\d+)\.(\d+)|0(\d+))\.(joblib|npz)$")
+
+# Para a mesma versão, o export compilado vem antes
+_FORMAT_PRIORITY = {"npz": 0, "joblib": 1}
+
+HEURISTIC_VERSION = "heuristic-v0.1"
+
+
+@dataclass(frozen=True)
+class ModelArtifact:
+    """Um arquivo de modelo descoberto no diretório de dados."""
+
+    path: Path
+    version: Tuple[int, int]
+    format: str
+
+    @property
+    def version_name(self) -> str:
+        return f"v{self.version[0]}.{self.version[1]}"
+
+
+def parse_artifact_name(path: Union[str, Path]) -> Optional[ModelArtifact]:
+    """Interpreta o nome de um artefato; retorna None se não seguir o padrão."""
+    path = Path(path)
+    match = _ARTIFACT_PATTERN.match(path.name)
+    if match is None:
+        return None
+    major, minor, legacy_minor, fmt = match.groups()
+    if major is None:
+        major, minor = 0, legacy_minor
+    return ModelArtifact(path=path, version=(int(major), int(minor)), format=fmt)
+
+
+def discover_artifacts(model_dir: Union[str, Path] = DEFAULT_MODEL_DIR) -> List[ModelArtifact]:
+    """Lista os artefatos do diretório, do preferido para o menos preferido."""
+    model_dir = Path(model_dir)
+    if not model_dir.is_dir():
+        return []
+    artifacts = [a for a in map(parse_artifact_name, model_dir.iterdir()) if a is not None]
+    return sorted(artifacts, key=lambda a: (-a.version[0], -a.version[1], _FORMAT_PRIORITY[a.format]))
+
+
+def _file_digest(path: Path) -> str:
+    """SHA-256 curto do artefato, para distinguir builds da mesma versão."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+
+
+def _export_source_digest(path: Path) -> Optional[str]:
+    try:
+        with np.load(path, allow_pickle=False) as artifact:
+            return str(artifact["source_digest"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _usable_artifacts(model_dir: Union[str, Path] = DEFAULT_MODEL_DIR) -> List[ModelArtifact]:
+    """
+    `discover_artifacts` sem os exports obsoletos: um `.npz` exportado de
+    outro build do `.joblib` da mesma versão (o `.joblib` foi regravado
+    depois) continuaria servindo o modelo antigo.
+    """
+    artifacts = discover_artifacts(model_dir)
+    sources = {a.version: a.path for a in artifacts if a.format == "joblib"}
+    usable = []
+    for artifact in artifacts:
+        source = sources.get(artifact.version)
+        if artifact.format == "npz" and source is not None:
+            if _export_source_digest(artifact.path) != _file_digest(source):
+                get_logger().warning(
+                    f"Ignoring {artifact.path.name}: it was not exported from the current {source.name}."
+                )
+                continue
+        usable.append(artifact)
+    return usable
+
+
+@dataclass(frozen=True)
+class ModelHandle:
+    """
+    Snapshot imutável de um modelo carregado.
+
+    `version` identifica o build exato (`v0.4:<digest>`) e é o valor reportado
+    em cada resultado e usado nas chaves do cache.
+    """
+
+    version: str
+    model: Any = field(default=None, compare=False, repr=False)
+    path: Optional[Path] = None
+    file_digest: Optional[str] = None
+    positive_index: int = 1
+
+    @property
+    def is_heuristic(self) -> bool:
+        return self.model is None
+
+    def predict_positive(self, X: np.ndarray) -> np.ndarray:
+        """Probabilidade da classe "biased" para uma matriz (N, 12)."""
+        if self.model is None:
+            # --- v0.1 Fallback Logic: Heuristic ---
+            # Kept for robustness if no model file is present
+            if not np.allclose(X.sum(axis=1), 1.0):  # Heuristic assumes softmax output
+                get_logger().warning("Heuristic fallback on non-normalized vector.")
+            return 1.0 - X[:, 0]
+        if isinstance(self.model, CompiledScorer):
+            return self.model.predict_proba_positive(X)
+        return self.model.predict_proba(X)[:, self.positive_index]
+
+
+HEURISTIC_HANDLE = ModelHandle(version=HEURISTIC_VERSION)
+
+# O scorer recebe vetores Δ12; artefatos treinados sobre outras features
+# (ex.: os embeddings brutos, usados pelo treino até a v0.5) são rejeitados
+FEATURE_DIM = 12
+
+
+def _positive_class_index(model: Any) -> int:
+    """Índice da classe positiva em `predict_proba` (ver compiled_scorer.positive_class_index)."""
+    return positive_class_index(getattr(model, "classes_", [0, 1]))
+
+
+def _check_feature_dim(artifact: ModelArtifact, n_features: Optional[int]) -> None:
+    if n_features is not None and n_features != FEATURE_DIM:
+        raise ValueError(
+            f"{artifact.path.name} expects {n_features} features, but the scorer is fed "
+            f"Δ12 vectors ({FEATURE_DIM}); retrain it with train.py."
+        )
+
+
+def load_artifact(artifact: ModelArtifact, mmap: bool = True) -> ModelHandle:
+    """Carrega um artefato e devolve o handle pronto para uso."""
+    logger = get_logger()
+    logger.info(f"Loading scoring model {artifact.version_name} from {artifact.path.name}...")
+
+    file_digest = _file_digest(artifact.path)
+
+    if artifact.format == "npz":
+        model = CompiledScorer.load(artifact.path)
+        _check_feature_dim(artifact, model.coef_t.shape[0])
+        # O export guarda o digest do .joblib de origem: mesma versão reportada
+        digest = model.source_digest or file_digest
+        return ModelHandle(
+            version=f"{artifact.version_name}:{digest}",
+            model=model, path=artifact.path, file_digest=file_digest,
+        )
+
+    import joblib  # sklearn só é importado quando um .joblib é realmente usado
+
+    model = joblib.load(artifact.path, mmap_mode="r" if mmap else None)
+    _check_feature_dim(artifact, getattr(model, "n_features_in_", None))
+    return ModelHandle(
+        version=f"{artifact.version_name}:{file_digest}",
+        model=model, path=artifact.path, file_digest=file_digest,
+        positive_index=_positive_class_index(model),
+    )
+
+
+class ModelRegistry:
+    """
+    Mantém o modelo ativo e troca de versão sem interromper requisições.
+
+    `current()` é uma leitura de atributo, sem lock: a troca publica um
+    novo `ModelHandle` de uma vez, e quem já tem o snapshot anterior
+    continua usando-o até o fim do lote.
+    """
+
+    def __init__(self, model_dir: Union[str, Path] = DEFAULT_MODEL_DIR, mmap: bool = True):
+        self.model_dir = Path(model_dir)
+        self.mmap = mmap
+        self._current: Optional[ModelHandle] = None
+        self._load_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+
+    def _load_best(self, candidates: Optional[List[ModelArtifact]] = None) -> ModelHandle:
+        """Carrega o artefato preferido, caindo para os seguintes em caso de erro."""
+        if candidates is None:
+            candidates = _usable_artifacts(self.model_dir)
+        for artifact in candidates:
+            try:
+                return load_artifact(artifact, mmap=self.mmap)
+            except Exception:
+                get_logger().exception(f"Failed to load scoring model {artifact.path.name}")
+        return HEURISTIC_HANDLE
+
+    def current(self) -> ModelHandle:
+        """Snapshot do modelo ativo (carregado no primeiro acesso)."""
+        handle = self._current
+        if handle is None:
+            with self._load_lock:
+                if self._current is None:
+                    self._current = self._load_best()
+                handle = self._current
+        return handle
+
+    @property
+    def loaded(self) -> bool:
+        return self._current is not None
+
+    def swap(self, handle: ModelHandle) -> ModelHandle:
+        """Publica `handle` como modelo ativo e devolve o anterior."""
+        with self._load_lock:
+            previous, self._current = self._current, handle
+        if previous is None or previous.version != handle.version:
+            get_logger().info(f"Active scoring model is now {handle.version}")
+        return previous
+
+    def refresh(self) -> ModelHandle:
+        """
+        Redescobre os artefatos e troca o modelo se o preferido mudou.
+
+        O carregamento acontece fora do lock; apenas a publicação é atômica.
+        """
+        candidates = _usable_artifacts(self.model_dir)
+        current = self._current
+        if current is not None:
+            if not candidates and current.is_heuristic:
+                return current
+            # Mesmo arquivo com o mesmo conteúdo: nada a recarregar
+            if (
+                candidates
+                and current.path == candidates[0].path
+                and current.file_digest == _file_digest(candidates[0].path)
+            ):
+                return current
+
+        handle = self._load_best(candidates)
+        self.swap(handle)
+        return handle
+
+    def refresh_in_background(self) -> threading.Thread:
+        """Executa `refresh()` em uma thread; uma recarga por vez."""
+        with self._load_lock:
+            thread = self._reload_thread
+            if thread is not None and thread.is_alive():
+                return thread
+            thread = threading.Thread(
+                target=self._refresh_logged, name="kaldra-model-reload", daemon=True
+            )
+            self._reload_thread = thread
+        thread.start()
+        return thread
+
+    def _refresh_logged(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            get_logger().exception("Background scoring model reload failed")
+
+    def describe(self) -> dict:
+        """Modelo ativo e artefatos disponíveis (para a API)."""
+        current = self._current
+        return {
+            "active": current.version if current is not None else None,
+            "available": [
+                {"file": a.path.name, "version": a.version_name, "format": a.format}
+                for a in discover_artifacts(self.model_dir)
+            ],
+        }
+
+
+# --- Registry global ---
+
+_DEFAULT_REGISTRY: Optional[ModelRegistry] = None
+_DEFAULT_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """Retorna o registry global, criado na primeira chamada."""
+    global _DEFAULT_REGISTRY
+    with _DEFAULT_REGISTRY_LOCK:
+        if _DEFAULT_REGISTRY is None:
+            from .settings import get_settings
+
+            model_dir = get_settings().model_dir or DEFAULT_MODEL_DIR
+            _DEFAULT_REGISTRY = ModelRegistry(model_dir)
+        return _DEFAULT_REGISTRY
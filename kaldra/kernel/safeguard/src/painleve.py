@@ -1,7 +1,27 @@
 """
 KALDRA-SAFEGUARD v0.6 — módulo painleve
 
-Stub inicial do operador simbólico/matemático para o kernel SAFEGUARD.
-A implementação real será adicionada em etapas posteriores.
+Análise Painlevé II (crise iminente): o sinal `painleve_curvature` é
+máximo logo abaixo da borda Tracy–Widom, antes de o texto virar anomalia.
+
+Adaptador fino sobre o motor compartilhado (`kernel/core/src/painleve.py`),
+que interpola uma grade pré-calculada em vez de resolver a EDO.
 """
-# TODO: implementar painleve para o KALDRA-SAFEGUARD.
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from ...core.src.painleve import PainleveState, painleve_batch
+
+
+def painleve_state(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> PainleveState:
+    """Posição s, q, q', q'' e curvatura de um lote Δ12 (N, 12)."""
+    return painleve_batch(delta12, coupling=coupling)
+
+
+def curvature_signal(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> np.ndarray:
+    """Apenas o sinal `painleve_curvature` (N,), em [0, 1]."""
+    return painleve_state(delta12, coupling).curvature
@@ -0,0 +1,215 @@
+"""
+KALDRA-SAFEGUARD v0.6 — módulo parallel
+
+Execução de lotes grandes em um pool de processos (ex.: backfills noturnos
+em máquinas com muitos núcleos ociosos).
+
+- O lote é dividido em blocos de tamanho ajustado ao número de workers.
+  Cada worker roda os estágios vetorizados e devolve um BatchResult colunar
+  (arrays NumPy, baratos de serializar); os blocos são concatenados na ordem
+  de entrada.
+- Cada worker prepara modelo e assets uma única vez, no inicializador: com
+  `forkserver`/`spawn` (padrão) o modelo é recarregado do artefato em disco
+  (memory-mapped); com `fork` eles são herdados do processo pai.
+- `fork` só é usado quando pedido explicitamente
+  (`KALDRA_PARALLEL_START_METHOD=fork`): a API já roda threads (logging,
+  micro-batching, threadpool do Starlette) e um fork com locks em uso pode
+  travar o worker.
+- O pool é reaproveitado entre chamadas enquanto o modelo e as
+  configurações não mudarem.
+- Se um worker morre, o pool é recriado e apenas os blocos ainda sem
+  resultado são reenviados; se falhar de novo, eles terminam no processo
+  atual. O lote nunca é perdido.
+"""
+
+from __future__ import annotations
+
+import atexit
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Union
+
+from .results import BatchResult
+from .model_registry import ModelHandle, load_artifact, parse_artifact_name
+from ...core.src.assets import warmup as warmup_assets
+from .settings import BiasSettings
+from ...core.src.logging_config import get_logger
+
+# Blocos pequenos demais pagam mais IPC do que computação
+MIN_CHUNK_SIZE = 256
+MAX_CHUNK_SIZE = 4096
+# Alguns blocos por worker equilibram a carga entre núcleos
+CHUNKS_PER_WORKER = 4
+# Recriações do pool por chamada antes de terminar no processo atual
+MAX_POOL_RESTARTS = 1
+
+# Estado de cada processo worker (preenchido por _init_worker)
+_WORKER_MODEL: Optional[ModelHandle] = None
+_WORKER_SETTINGS: Optional[BiasSettings] = None
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_KEY: Optional[tuple] = None
+_POOL_LOCK = threading.Lock()
+
+
+def resolve_workers(workers: Optional[int], settings: BiasSettings) -> int:
+    """Número efetivo de processos: None usa o setting, 0 ou menos usa todos os núcleos."""
+    if workers is None:
+        workers = settings.parallel_workers
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def chunk_size_for(n_texts: int, workers: int) -> int:
+    """Tamanho de bloco para `n_texts` textos em `workers` processos."""
+    size = math.ceil(n_texts / (workers * CHUNKS_PER_WORKER))
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, size))
+
+
+def _start_method(settings: BiasSettings) -> str:
+    if settings.parallel_start_method:
+        return settings.parallel_start_method
+    # Nunca fork por padrão: o processo pai pode ter várias threads ativas
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _worker_settings(settings: BiasSettings) -> BiasSettings:
+    # Métricas ficam no processo pai (o registry dos workers não é exposto)
+    return replace(settings, metrics_enabled=False, parallel_workers=1)
+
+
+def _init_worker(model_source: Union[ModelHandle, str], settings: BiasSettings) -> None:
+    """Inicializador de cada processo: modelo, configurações e assets, uma vez."""
+    global _WORKER_MODEL, _WORKER_SETTINGS
+    from .pipeline import PIPELINE_ASSETS
+
+    if isinstance(model_source, str):
+        model = load_artifact(parse_artifact_name(model_source))
+    else:
+        model = model_source
+    _WORKER_MODEL = model
+    _WORKER_SETTINGS = _worker_settings(settings)
+    # Com fork os assets já vêm carregados do pai e isto é imediato
+    warmup_assets(PIPELINE_ASSETS)
+
+
+def _analyze_chunk(
+    texts: List[str], locale: Union[str, List[str]], fields: Optional[frozenset], keep_delta12: bool = False
+) -> BatchResult:
+    """Tarefa executada nos workers; `locale` é único ou um por texto do bloco."""
+    from .pipeline import _analyze_columns
+
+    batch, _ = _analyze_columns(texts, locale, _WORKER_SETTINGS, _WORKER_MODEL, fields, keep_delta12)
+    return batch
+
+
+def _get_pool(workers: int, model: ModelHandle, settings: BiasSettings) -> ProcessPoolExecutor:
+    """Pool compartilhado; recriado quando workers, modelo ou configurações mudam."""
+    global _POOL, _POOL_KEY
+    method = _start_method(settings)
+    key = (workers, method, model.version, settings)
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_KEY == key:
+            return _POOL
+        if _POOL is not None:
+            # Chamadas em andamento no pool anterior terminam normalmente
+            _POOL.shutdown(wait=False)
+        # Com fork o handle é herdado sem serialização; nos outros métodos o
+        # worker recarrega o artefato do disco
+        source = model if method == "fork" or model.path is None else str(model.path)
+        _POOL = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(method),
+            initializer=_init_worker,
+            initargs=(source, settings),
+        )
+        _POOL_KEY = key
+        return _POOL
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL, _POOL_KEY = None, None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    """Encerra o pool compartilhado (chamado também na saída do processo)."""
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        pool, _POOL, _POOL_KEY = _POOL, None, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_pool)
+
+
+def analyze_batch_parallel(
+    texts: List[str],
+    locale: Union[str, Sequence[str]],
+    settings: BiasSettings,
+    model: ModelHandle,
+    fields: Optional[frozenset],
+    workers: int,
+    keep_delta12: bool = False,
+) -> BatchResult:
+    """
+    Analisa `texts` em blocos distribuídos entre `workers` processos e
+    devolve um único BatchResult, na ordem de entrada. Com um locale por
+    texto, cada bloco leva a fatia correspondente.
+    """
+    logger = get_logger()
+    size = chunk_size_for(len(texts), workers)
+    starts = range(0, len(texts), size)
+    chunks = [texts[start:start + size] for start in starts]
+    if isinstance(locale, str):
+        chunk_locales = [locale] * len(chunks)
+    else:
+        chunk_locales = [list(locale[start:start + size]) for start in starts]
+    results: Dict[int, BatchResult] = {}
+    pending = list(range(len(chunks)))
+
+    for attempt in range(MAX_POOL_RESTARTS + 1):
+        pool = _get_pool(workers, model, settings)
+        futures = {}
+        try:
+            for index in pending:
+                futures[index] = pool.submit(
+                    _analyze_chunk, chunks[index], chunk_locales[index], fields, keep_delta12
+                )
+        except BrokenProcessPool:
+            pass
+        for index, future in futures.items():
+            try:
+                results[index] = future.result()
+            except BrokenProcessPool:
+                continue
+
+        pending = [index for index in pending if index not in results]
+        if not pending:
+            break
+        logger.error(
+            "[analyze_batch] Worker process died; {} of {} chunks to redo (attempt {}).",
+            len(pending), len(chunks), attempt + 1,
+        )
+        _discard_pool(pool)
+
+    if pending:
+        from .pipeline import _analyze_columns
+
+        worker_settings = _worker_settings(settings)
+        for index in pending:
+            results[index], _ = _analyze_columns(
+                chunks[index], chunk_locales[index], worker_settings, model, fields, keep_delta12
+            )
+
+    return BatchResult.concatenate([results[index] for index in range(len(chunks))])
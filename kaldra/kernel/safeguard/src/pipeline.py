@@ -4,179 +4,420 @@ Pipeline inicial do kernel. Conteúdo será adicionado posteriormente.
 """
 # TODO: implementar pipeline do SAFEGUARD.
 import json
+import time
 import numpy as np
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterable, Optional, List, Sequence, Tuple, Union
 
 # --- Import necessary functions from other modules ---
-from .embeddings import get_embedding
-from .delta12 import project_to_delta12
-from .kindra_3x48 import apply_kindra
-from .scorer import compute_bias_score
-from .tau import apply_tau_policy
-from .explain import build_explanation_layers
-from .delta144_mapping import map_to_delta144
+from ...core.src.embeddings import get_embeddings
+from ...core.src.delta12 import project_to_delta12_batch
+from ...core.src.kindra_3x48 import apply_kindra_batch, apply_kindra_locales
+from .scorer import compute_bias_scores, warmup as warmup_scorer
+from .model_registry import ModelHandle, get_registry
+from .metrics import NULL_TIMER, start_timer, record_labels, record_batch_size
+from .tau import apply_tau_policy_batch
+from .kindra_drift import record_drift, summarize_batch
+from .parallel import analyze_batch_parallel, resolve_workers
+from .results import (
+    RESULT_FIELDS, BatchResult, compute_signals, compute_risk_level, normalize_fields,
+    _DELTA144_FIELDS, _SCORED_FIELDS, _assemble_result, _empty_result, _needs,
+)
+from ...core.src.delta144_mapping import map_to_delta144
 from .settings import get_settings, BiasSettings
-from .logging_config import get_logger
+from ...core.src.logging_config import get_logger, is_enabled, should_log
+from ...core.src.assets import register_asset, warmup as warmup_assets
 
 # --- Pre-load metadata ---
+# Archetype metadata shared with the other kernels
+ARCHETYPES_PATH = Path(__file__).resolve().parents[2] / "core" / "data" / "archetypes" / "delta12_archetypes.json"
+
 def _load_archetype_meta():
     """Loads and sorts the archetype metadata for easy indexing."""
-    data_path = Path(__file__).resolve().parent.parent / "data" / "archetypes" / "delta12_archetypes.json"
-    with open(data_path, "r", encoding="utf-8") as f:
+    with open(ARCHETYPES_PATH, "r", encoding="utf-8") as f:
         data = json.load(f)
     return sorted(data, key=lambda x: x["id"])
 
-DELTA12_META = _load_archetype_meta()
+# Loaded on first use (see core/src/assets.py)
+_DELTA12_META = register_asset("delta12_archetypes", _load_archetype_meta)
 
-# --- Helper Functions for Signals and Risk ---
+def __getattr__(name: str):
+    # Backwards-compatible access to the former module-level DELTA12_META
+    if name == "DELTA12_META":
+        return _DELTA12_META.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def compute_signals(label: str, bias_score: Optional[float], confidence: float) -> dict:
-    """Computes analytical signals based on the core results."""
-    if bias_score is None:
-        intensity = 0.0
-        polarization = 0.0
-    else:
-        intensity = float(bias_score)
-        polarization = float(bias_score * confidence)
-
-    if label == "biased" and bias_score is not None and bias_score >= 0.7:
-        emotion_hint = "raiva"
-    elif label == "biased":
-        emotion_hint = "tensão"
-    elif label == "neutral":
-        emotion_hint = "neutro"
-    else:
-        emotion_hint = "indefinido"
-
-    return {
-        "intensity": intensity,
-        "polarization": polarization,
-        "emotion_hint": emotion_hint,
-        "attack_target": "indefinido" # Placeholder for future versions
-    }
-
-def compute_risk_level(label: str, bias_score: Optional[float], confidence: float) -> str:
-    """Computes a simple risk level based on score and confidence."""
-    if label == "inconclusive" or label == "unknown" or bias_score is None:
-        return "indefinido" if label == "inconclusive" else "low"
-
-    score = bias_score * confidence
-    if score < 0.3:
-        return "baixo"
-    elif 0.3 <= score < 0.6:
-        return "medio"
-    else:
-        return "alto"
+# --- Locales ---
+
+# Label of batch-level metrics (stage timings) when a batch mixes locales
+MIXED_LOCALE = "mixed"
+
+def normalize_locales(locale: Union[str, Sequence[str]], n_texts: int) -> Union[str, List[str]]:
+    """
+    Validates the `locale` argument of the batch entry points.
+
+    A single string applies to the whole batch. A sequence gives one locale
+    per text; it is collapsed back to a string when every item agrees.
+    """
+    if isinstance(locale, str):
+        return locale
+    locales = list(locale)
+    if len(locales) != n_texts:
+        raise ValueError(f"Expected one locale per text ({n_texts}), got {len(locales)}.")
+    if not all(isinstance(item, str) for item in locales):
+        raise ValueError("Every locale must be a string.")
+    if locales and all(item == locales[0] for item in locales):
+        return locales[0]
+    return locales
+
+def batch_locale_label(locale: Union[str, Sequence[str]]) -> str:
+    """Locale label of batch-level metrics: the locale itself, or "mixed"."""
+    return locale if isinstance(locale, str) else MIXED_LOCALE
+
+# --- Warmup ---
+
+# Assets read by analyze_text/analyze_batch, loaded lazily on first use
+PIPELINE_ASSETS = ("delta12_archetypes", "delta144_grid", "kindra_3x48")
+
+def warmup() -> dict:
+    """
+    Loads every asset the pipeline needs, plus the active scoring model.
+
+    Meant for readiness probes, so the first real request does not pay the
+    cold-start cost. Safe to call repeatedly.
+    """
+    timings = warmup_assets(PIPELINE_ASSETS)
+    start = time.perf_counter()
+    model_version = warmup_scorer()
+    timings["scorer"] = time.perf_counter() - start
+    return {"model_version": model_version, "timings": timings}
 
 # --- Main Analysis Pipeline ---
 
-def analyze_text(text: str, locale: str = "pt-BR", settings: Optional[BiasSettings] = None) -> dict:
+def analyze_text(
+    text: str,
+    locale: str = "pt-BR",
+    settings: Optional[BiasSettings] = None,
+    model: Optional[ModelHandle] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> dict:
     """
     Runs the full KALDRA-Bias analysis pipeline on a given text.
+
+    `model` pins the scoring model (a registry snapshot); by default the
+    currently active one is used. The result reports it in `model_version`.
+
+    `fields` restricts the result to the given keys (see RESULT_FIELDS) and
+    skips the stages only needed by the others, e.g. the scorer when no
+    score-derived field is requested ("unscored" in the label metrics).
+    """
+    return _analyze_text(text, locale, settings, model, fields)[0]
+
+def _analyze_text(
+    text: str,
+    locale: str,
+    settings: Optional[BiasSettings],
+    model: Optional[ModelHandle],
+    fields: Optional[Iterable[str]],
+) -> Tuple[dict, str, int, Optional[np.ndarray]]:
+    """
+    analyze_text, also returning the label, plan and modulated Δ12 row
+    (None for an empty text) that fed the metrics and the drift monitor.
     """
     logger = get_logger()
     if settings is None:
         settings = get_settings()
+    if model is None:
+        model = get_registry().current()
+    fields = normalize_fields(fields)
 
     # Handle empty text case
     if not text or not text.strip():
         logger.warning("analyze_text called with empty or whitespace-only text.")
-        return {
-            "bias_score": 0.0,
-            "label": "unknown",
-            "confidence": 0.0,
-            "risk_level": "low",
-            "dominant_archetype": "indefinido",
-            "plan": 3,
-            "archetype_detail": {},
-            "explanation_layers": {
-                "human": "Texto vazio ou inválido.",
-                "technical": "Entrada vazia, retornando resultado seguro.",
-                "symbolic": "Nenhuma análise simbólica aplicável."
-            },
-            "signals": compute_signals("unknown", 0.0, 0.0),
-        }
+        record_labels(("unknown",), locale, settings)
+        return _empty_result(model.version, fields), "unknown", 3, None
 
-    text_length = len(text)
-    logger.debug(
-        "Analyze_text chamado",
-        extra={"event": "analyze_text_start", "locale": locale, "text_length": text_length},
-    )
+    if is_enabled("DEBUG"):
+        logger.debug(
+            "Analyze_text chamado",
+            extra={"event": "analyze_text_start", "locale": locale, "text_length": len(text)},
+        )
+
+    timer = start_timer(locale, settings)
 
-    embedding = get_embedding(text)
-    delta12_vector = project_to_delta12(embedding)
-    delta12_modulated, plan = apply_kindra(delta12_vector, locale)
-    tau_result = apply_tau_policy(delta12_modulated)
-    confidence = tau_result["confidence"]
+    # Array-first path: a (1, 12) matrix flows through every stage
+    embedding = get_embeddings([text])
+    timer.mark("embedding")
+    delta12_vector = project_to_delta12_batch(embedding)
+    timer.mark("delta12")
+    delta12_modulated, plan = apply_kindra_batch(delta12_vector, locale)
+    timer.mark("kindra")
+    confidences, conclusive = apply_tau_policy_batch(delta12_modulated, settings.tau_threshold)
+    confidence = float(confidences[0])
+    timer.mark("tau")
 
-    dominant_index = np.argmax(delta12_modulated)
-    dominant_archetype_name = DELTA12_META[dominant_index]["name"]
-    delta144_info = map_to_delta144(dominant_archetype_name)
+    dominant_index = int(np.argmax(delta12_modulated[0]))
 
-    if tau_result["status"] == "inconclusive":
+    if not conclusive[0]:
         label = "inconclusive"
         bias_score = None
+    elif not _needs(fields, _SCORED_FIELDS):
+        label = "unscored"
+        bias_score = None
     else:
-        bias_score, label = compute_bias_score(delta12_modulated)
+        bias_scores, labels = compute_bias_scores(delta12_modulated, model=model)
+        bias_score, label = float(bias_scores[0]), labels[0]
+        timer.mark("scoring")
+
+    dominant_archetype_name = _DELTA12_META.get()[dominant_index]["name"]
+    delta144_info = None
+    if _needs(fields, _DELTA144_FIELDS):
+        delta144_info = map_to_delta144(dominant_archetype_name)
+        timer.mark("delta144")
+
+    if settings.drift_enabled:
+        record_drift(summarize_batch(delta12_modulated, (label,), locale, plan), settings)
 
-    risk_level = compute_risk_level(label, bias_score, confidence)
-    signals = compute_signals(label, bias_score, confidence)
-    explanation_layers = build_explanation_layers(
-        delta12_modulated, label, bias_score, confidence,
-        dominant_archetype_name, delta144_info, plan
+    result = _assemble_result(
+        delta12_modulated[0], label, bias_score, confidence, plan,
+        dominant_archetype_name, delta144_info, model.version, fields,
     )
+    timer.mark("explanation")
+    timer.finish(label)
+    record_labels((label,), locale, settings)
 
-    logger.info(
-        "Analyze_text concluído",
-        extra={
-            "event": "analyze_text_end", "label": label, "risk_level": risk_level,
-            "plan": plan, "dominant_archetype": dominant_archetype_name,
-            "confidence": float(confidence),
-            "bias_score": float(bias_score) if bias_score is not None else None,
-        },
+    # The extra payload is only built for events that will be emitted
+    if should_log("analyze_text_end"):
+        logger.info(
+            "Analyze_text concluído",
+            extra={
+                "event": "analyze_text_end", "label": label,
+                "risk_level": result.get("risk_level"),
+                "plan": plan, "dominant_archetype": dominant_archetype_name,
+                "confidence": float(confidence),
+                "bias_score": float(bias_score) if bias_score is not None else None,
+            },
+        )
+
+    return result, label, plan, delta12_modulated[0]
+
+def _analyze_columns(
+    texts: list[str],
+    locale: Union[str, List[str]],
+    settings: BiasSettings,
+    model: ModelHandle,
+    fields: Optional[frozenset],
+    keep_delta12: bool = False,
+):
+    """
+    Vectorized stages shared by analyze_batch and analyze_batch_columnar.
+
+    `locale` is one locale for the whole batch or one per text (see
+    normalize_locales). Returns the BatchResult and the stage timer (still
+    open, so callers can time their own output stage).
+    """
+    logger = get_logger()
+    n = len(texts)
+    valid_indices: list[int] = []
+    MAX_LEN_FOR_LOG = 5000
+    # Per-item lines are the bulk of the logging volume: checked once per
+    # batch, sampled per item (event "analyze_batch_item"), formatted lazily
+    log_items = is_enabled("INFO")
+
+    for idx, text in enumerate(texts):
+        if len(text) > MAX_LEN_FOR_LOG:
+            logger.warning(
+                "[analyze_batch] Texto muito longo na posição {} (len={}); processando mesmo assim.",
+                idx, len(text),
+            )
+
+        if log_items and should_log("analyze_batch_item"):
+            logger.info("[analyze_batch] Analisando item {} (len={})", idx, len(text))
+
+        if not text or not text.strip():
+            logger.warning("[analyze_batch] Texto vazio na posição {}; retornando resultado seguro.", idx)
+        else:
+            valid_indices.append(idx)
+
+    # Empty texts keep the safe defaults of _empty_result
+    bias_scores = np.zeros(n)
+    confidences = np.zeros(n)
+    labels = np.full(n, "unknown", dtype=object)
+    plans = np.full(n, 3, dtype=np.int16)
+    archetype_indices = np.full(n, -1, dtype=np.int16)
+    archetype_meta = _DELTA12_META.get()
+    archetype_details: dict = {}
+    drift = None
+    # Modulated Δ12 of every row (zeros for empty texts), only for the cache
+    drift_rows = np.zeros((n, 12), dtype=np.float32) if keep_delta12 and settings.drift_enabled else None
+    timer = NULL_TIMER
+
+    if valid_indices:
+        rows = np.asarray(valid_indices)
+        timer = start_timer(batch_locale_label(locale), settings)
+        embeddings = get_embeddings([texts[idx] for idx in valid_indices])
+        timer.mark("embedding")
+        delta12_matrix = project_to_delta12_batch(embeddings)
+        timer.mark("delta12")
+        if isinstance(locale, str):
+            valid_locales = locale
+            delta12_modulated, plan = apply_kindra_batch(delta12_matrix, locale)
+        else:
+            # Mixed traffic: one gather-and-multiply over the whole matrix
+            valid_locales = [locale[idx] for idx in valid_indices]
+            delta12_modulated, plan = apply_kindra_locales(delta12_matrix, valid_locales)
+        timer.mark("kindra")
+        valid_confidences, conclusive = apply_tau_policy_batch(delta12_modulated, settings.tau_threshold)
+        dominant_indices = np.argmax(delta12_modulated, axis=1)
+        timer.mark("tau")
+
+        # Single predict_proba call for every conclusive row
+        valid_scores = np.full(len(valid_indices), np.nan)
+        valid_labels = np.full(len(valid_indices), "inconclusive", dtype=object)
+        if not _needs(fields, _SCORED_FIELDS):
+            valid_labels[conclusive] = "unscored"
+        elif conclusive.any():
+            conclusive_scores, conclusive_labels = compute_bias_scores(
+                delta12_modulated[conclusive], model=model
+            )
+            valid_scores[conclusive] = conclusive_scores
+            valid_labels[conclusive] = conclusive_labels
+            timer.mark("scoring")
+
+        # At most 12 distinct archetypes: map each one to Δ144 only once
+        if _needs(fields, _DELTA144_FIELDS):
+            for index in np.unique(dominant_indices).tolist():
+                archetype_details[index] = map_to_delta144(archetype_meta[index]["name"])
+            timer.mark("delta144")
+
+        # Summarized here (possibly in a pool worker), merged by the caller
+        if settings.drift_enabled:
+            drift = summarize_batch(delta12_modulated, valid_labels, valid_locales, plan)
+        if drift_rows is not None:
+            drift_rows[rows] = delta12_modulated
+
+        bias_scores[rows] = valid_scores
+        confidences[rows] = valid_confidences
+        labels[rows] = valid_labels
+        plans[rows] = plan
+        archetype_indices[rows] = dominant_indices
+
+    batch = BatchResult.from_labels(
+        labels,
+        bias_scores=bias_scores,
+        confidences=confidences,
+        plans=plans,
+        archetype_indices=archetype_indices,
+        archetype_names=tuple(meta["name"] for meta in archetype_meta),
+        archetype_details=archetype_details,
+        model_version=model.version,
+        fields=fields,
+        drift=drift,
+        delta12=drift_rows,
     )
+    return batch, timer
 
-    return {
-        "bias_score": bias_score, "label": label, "confidence": confidence,
-        "risk_level": risk_level, "dominant_archetype": dominant_archetype_name,
-        "plan": plan, "archetype_detail": delta144_info,
-        "explanation_layers": explanation_layers, "signals": signals,
-    }
+def _run_batch(
+    texts: list[str],
+    locale: Union[str, List[str]],
+    settings: BiasSettings,
+    model: ModelHandle,
+    fields: Optional[frozenset],
+    workers: Optional[int],
+    keep_delta12: bool = False,
+):
+    """In-process analysis, or the process pool for large enough batches."""
+    workers = resolve_workers(workers, settings)
+    if workers > 1 and len(texts) >= settings.parallel_min_batch:
+        timer = start_timer(batch_locale_label(locale), settings)
+        batch = analyze_batch_parallel(texts, locale, settings, model, fields, workers, keep_delta12)
+        return batch, timer
+    return _analyze_columns(texts, locale, settings, model, fields, keep_delta12)
 
-def analyze_batch(
+def analyze_batch_columnar(
     texts: list[str],
-    locale: str = "pt-BR",
+    locale: Union[str, Sequence[str]] = "pt-BR",
     settings: Optional[BiasSettings] = None,
-) -> list[dict]:
+    model: Optional[ModelHandle] = None,
+    fields: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+    keep_delta12: bool = False,
+) -> BatchResult:
     """
-    Executa a análise de viés em lote, reaproveitando analyze_text.
+    Same analysis as analyze_batch, returned as a columnar BatchResult.
+
+    No per-item dict is built: scores, confidences, label codes, plans and
+    archetype indices stay in NumPy arrays, and items are materialized only
+    when iterated (see results.BatchResult).
+
+    `locale` is one locale or one per text, as in analyze_batch.
+
+    `keep_delta12` also returns the modulated Δ12 rows in `batch.delta12`
+    (with drift enabled), which the result cache stores to replay drift on
+    its hits. Off by default: it is ~4x the size of the other columns.
     """
     if settings is None:
         settings = get_settings()
+    if model is None:
+        model = get_registry().current()
+    fields = normalize_fields(fields)
+    locale = normalize_locales(locale, len(texts))
 
-    logger = get_logger()
-    results: list[dict] = []
-    MAX_LEN_FOR_LOG = 5000
+    batch, timer = _run_batch(texts, locale, settings, model, fields, workers, keep_delta12)
+    timer.finish("batch")
+    record_batch_size(len(texts), settings)
+    record_labels(batch.labels, locale, settings)
+    record_drift(batch.drift, settings)
 
-    for idx, text in enumerate(texts):
-        # The check for empty/whitespace string is now handled inside analyze_text
-        stripped = text
+    get_logger().info("[analyze_batch] Concluído. Itens processados: {}", len(batch))
+    return batch
 
-        if len(stripped) > MAX_LEN_FOR_LOG:
-            logger.warning(
-                f"[analyze_batch] Texto muito longo na posição {idx} (len={len(stripped)}); "
-                "processando mesmo assim."
-            )
+def analyze_batch(
+    texts: list[str],
+    locale: Union[str, Sequence[str]] = "pt-BR",
+    settings: Optional[BiasSettings] = None,
+    model: Optional[ModelHandle] = None,
+    fields: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+) -> list[dict]:
+    """
+    Executa a análise de viés em lote de forma vetorizada.
+
+    Os textos válidos passam juntos por cada estágio: matriz de embeddings
+    (N, 384), projeção Δ12 (N, 12), camada τ e uma única chamada ao scorer
+    para as linhas conclusivas. Apenas a montagem do resultado é feita por
+    item, preservando o contrato de analyze_text e a ordem via `input_index`.
+
+    O lote inteiro usa um único snapshot do modelo (`model`, ou o ativo no
+    início da chamada), mesmo que outra versão seja publicada no meio.
 
-        logger.info(f"[analyze_batch] Analisando item {idx} (len={len(stripped)})")
+    `fields` funciona como em analyze_text; `input_index` é sempre incluído.
 
-        result = analyze_text(text=stripped, locale=locale, settings=settings)
+    `locale` vale para o lote inteiro ou, como sequência, para cada texto
+    (tráfego misto pt-BR/en/es): a modulação Kindra continua sendo uma única
+    operação sobre a matriz Δ12 e `plan` sai por item.
+    Para lotes grandes, analyze_batch_columnar evita os dicionários por item.
+
+    Com `workers` > 1 (padrão: `settings.parallel_workers`; 0 usa todos os
+    núcleos), lotes a partir de `settings.parallel_min_batch` textos são
+    divididos entre processos (ver parallel.py); a ordem é preservada.
+    """
+    if settings is None:
+        settings = get_settings()
+    if model is None:
+        model = get_registry().current()
+    fields = normalize_fields(fields)
+    locale = normalize_locales(locale, len(texts))
 
-        if isinstance(result, dict) and "input_index" not in result:
-            result["input_index"] = idx
+    batch, timer = _run_batch(texts, locale, settings, model, fields, workers)
+    results = batch.to_dicts()
+    timer.mark("explanation")
+    # Stage spans cover the whole batch, so they are labelled "batch"
+    timer.finish("batch")
 
-        results.append(result)
+    record_batch_size(len(texts), settings)
+    record_labels(batch.labels, locale, settings)
+    record_drift(batch.drift, settings)
 
-    logger.info(f"[analyze_batch] Concluído. Itens processados: {len(results)}")
+    get_logger().info("[analyze_batch] Concluído. Itens processados: {}", len(results))
     return results
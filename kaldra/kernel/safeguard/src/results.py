@@ -0,0 +1,428 @@
+"""
+KALDRA-SAFEGUARD v0.6 — módulo results
+
+Contrato de saída da análise.
+
+- Funções que montam o resultado por item (sinais, nível de risco, camadas
+  de explicação) e a seleção de campos (`fields=`).
+- `AnalysisResult`: resultado compacto (`__slots__`) de um único texto; o
+  dicionário completo só é montado em `to_dict()`.
+- `BatchResult`: resultado colunar de um lote. Scores, confianças, labels
+  (códigos de categoria), planos e índices de arquétipo ficam em arrays
+  NumPy; os detalhes Δ144 são guardados uma vez por arquétipo. Itens são
+  materializados sob demanda (iteração, `to_dicts`) e o lote exporta para
+  pandas ou Arrow.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .explain import build_explanation_layers
+from .kindra_drift import merge_summaries
+
+# --- Helper Functions for Signals and Risk ---
+
+def compute_signals(label: str, bias_score: Optional[float], confidence: float) -> dict:
+    """Computes analytical signals based on the core results."""
+    if bias_score is None:
+        intensity = 0.0
+        polarization = 0.0
+    else:
+        intensity = float(bias_score)
+        polarization = float(bias_score * confidence)
+
+    if label == "biased" and bias_score is not None and bias_score >= 0.7:
+        emotion_hint = "raiva"
+    elif label == "biased":
+        emotion_hint = "tensão"
+    elif label == "neutral":
+        emotion_hint = "neutro"
+    else:
+        emotion_hint = "indefinido"
+
+    return {
+        "intensity": intensity,
+        "polarization": polarization,
+        "emotion_hint": emotion_hint,
+        "attack_target": "indefinido" # Placeholder for future versions
+    }
+
+def compute_risk_level(label: str, bias_score: Optional[float], confidence: float) -> str:
+    """Computes a simple risk level based on score and confidence."""
+    if label == "inconclusive" or label == "unknown" or bias_score is None:
+        return "indefinido" if label == "inconclusive" else "low"
+
+    score = bias_score * confidence
+    if score < 0.3:
+        return "baixo"
+    elif 0.3 <= score < 0.6:
+        return "medio"
+    else:
+        return "alto"
+
+# --- Field Selection ---
+
+# Every field of the per-item output contract (input_index is added by batches)
+RESULT_FIELDS = (
+    "bias_score", "label", "confidence", "risk_level", "dominant_archetype", "plan",
+    "archetype_detail", "explanation_layers", "signals", "model_version",
+)
+
+# Fields that need the scorer / the Δ144 lookup
+_SCORED_FIELDS = frozenset({"bias_score", "label", "risk_level", "signals", "explanation_layers"})
+_DELTA144_FIELDS = frozenset({"archetype_detail", "explanation_layers"})
+
+def normalize_fields(fields: Optional[Iterable[str]]) -> Optional[frozenset]:
+    """
+    Validates a `fields=` selection. Returns None for "all fields".
+
+    Raises:
+        ValueError: for unknown field names.
+    """
+    if fields is None:
+        return None
+    selected = frozenset(fields)
+    unknown = selected.difference(RESULT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown result fields: {sorted(unknown)}. Valid fields: {list(RESULT_FIELDS)}")
+    return selected
+
+def _needs(fields: Optional[frozenset], stage_fields: frozenset) -> bool:
+    return fields is None or not fields.isdisjoint(stage_fields)
+
+def _empty_result(model_version: str, fields: Optional[frozenset] = None) -> dict:
+    """Safe result returned for empty or whitespace-only texts."""
+    result = {
+        "bias_score": 0.0,
+        "label": "unknown",
+        "confidence": 0.0,
+        "risk_level": "low",
+        "dominant_archetype": "indefinido",
+        "plan": 3,
+        "archetype_detail": {},
+        "explanation_layers": {
+            "human": "Texto vazio ou inválido.",
+            "technical": "Entrada vazia, retornando resultado seguro.",
+            "symbolic": "Nenhuma análise simbólica aplicável."
+        },
+        "signals": compute_signals("unknown", 0.0, 0.0),
+        "model_version": model_version,
+    }
+    if fields is None:
+        return result
+    return {name: value for name, value in result.items() if name in fields}
+
+def _assemble_result(
+    delta12_modulated,
+    label: str,
+    bias_score: Optional[float],
+    confidence: float,
+    plan: int,
+    dominant_archetype_name: str,
+    delta144_info: Optional[dict],
+    model_version: str,
+    fields: Optional[frozenset] = None,
+) -> dict:
+    """
+    Builds the per-item output contract from the core analysis values.
+
+    With `fields`, only the requested entries are computed (risk level,
+    signals and explanation layers are skipped when not asked for).
+    """
+    if fields is None:
+        risk_level = compute_risk_level(label, bias_score, confidence)
+        signals = compute_signals(label, bias_score, confidence)
+        explanation_layers = build_explanation_layers(
+            delta12_modulated, label, bias_score, confidence,
+            dominant_archetype_name, delta144_info, plan
+        )
+
+        return {
+            "bias_score": bias_score, "label": label, "confidence": confidence,
+            "risk_level": risk_level, "dominant_archetype": dominant_archetype_name,
+            "plan": plan, "archetype_detail": delta144_info,
+            "explanation_layers": explanation_layers, "signals": signals,
+            "model_version": model_version,
+        }
+
+    result = {}
+    if "bias_score" in fields:
+        result["bias_score"] = bias_score
+    if "label" in fields:
+        result["label"] = label
+    if "confidence" in fields:
+        result["confidence"] = confidence
+    if "risk_level" in fields:
+        result["risk_level"] = compute_risk_level(label, bias_score, confidence)
+    if "dominant_archetype" in fields:
+        result["dominant_archetype"] = dominant_archetype_name
+    if "plan" in fields:
+        result["plan"] = plan
+    if "archetype_detail" in fields:
+        result["archetype_detail"] = delta144_info
+    if "explanation_layers" in fields:
+        result["explanation_layers"] = build_explanation_layers(
+            delta12_modulated, label, bias_score, confidence,
+            dominant_archetype_name, delta144_info, plan
+        )
+    if "signals" in fields:
+        result["signals"] = compute_signals(label, bias_score, confidence)
+    if "model_version" in fields:
+        result["model_version"] = model_version
+    return result
+
+# --- Compact Results ---
+
+@dataclass(frozen=True, slots=True)
+class AnalysisResult:
+    """
+    Resultado de um texto, sem os campos derivados.
+
+    `archetype_detail` é compartilhado com o mapa Δ144 (não é copiado);
+    risco, sinais e explicações são calculados apenas em `to_dict()`.
+    """
+
+    bias_score: Optional[float]
+    label: str
+    confidence: float
+    plan: int
+    dominant_archetype: str
+    archetype_detail: Optional[dict]
+    model_version: str
+    input_index: Optional[int] = None
+    is_empty: bool = False
+
+    def to_dict(self, fields: Optional[frozenset] = None) -> dict:
+        """O mesmo dicionário devolvido por analyze_text (restrito a `fields`)."""
+        if self.is_empty:
+            result = _empty_result(self.model_version, fields)
+        else:
+            result = _assemble_result(
+                None, self.label, self.bias_score, self.confidence, self.plan,
+                self.dominant_archetype, self.archetype_detail, self.model_version, fields,
+            )
+        if self.input_index is not None:
+            result["input_index"] = self.input_index
+        return result
+
+
+class BatchResult:
+    """
+    Resultado colunar de analyze_batch_columnar.
+
+    Colunas (uma linha por texto de entrada, na ordem original):
+        bias_scores        float64, NaN quando não há score
+        confidences        float64
+        label_codes        int16, índices em `label_categories`
+        plans              int16
+        archetype_indices  int16, -1 para textos vazios
+
+    `fields` guarda a seleção usada na análise e é o padrão de `to_dicts()`.
+    `drift` é o resumo por locale/plano das linhas analisadas (ver
+    kindra_drift), ou None com o monitor de drift desligado. `delta12` só é
+    preenchido a pedido do cache de resultados (`keep_delta12=True` em
+    analyze_batch_columnar): o Δ12 modulado de cada linha, float32 (N, 12),
+    zeros para textos vazios; fora disso é None.
+    """
+
+    __slots__ = (
+        "bias_scores", "confidences", "label_codes", "label_categories", "plans",
+        "archetype_indices", "archetype_names", "archetype_details", "model_version", "fields",
+        "drift", "delta12",
+    )
+
+    def __init__(
+        self,
+        bias_scores: np.ndarray,
+        confidences: np.ndarray,
+        label_codes: np.ndarray,
+        label_categories: Tuple[str, ...],
+        plans: np.ndarray,
+        archetype_indices: np.ndarray,
+        archetype_names: Tuple[str, ...],
+        archetype_details: Dict[int, Optional[dict]],
+        model_version: str,
+        fields: Optional[frozenset] = None,
+        drift: Optional[dict] = None,
+        delta12: Optional[np.ndarray] = None,
+    ):
+        self.bias_scores = bias_scores
+        self.confidences = confidences
+        self.label_codes = label_codes
+        self.label_categories = label_categories
+        self.plans = plans
+        self.archetype_indices = archetype_indices
+        self.archetype_names = archetype_names
+        self.archetype_details = archetype_details
+        self.model_version = model_version
+        self.fields = fields
+        self.drift = drift
+        self.delta12 = delta12
+
+    @classmethod
+    def from_labels(cls, labels: np.ndarray, **columns) -> "BatchResult":
+        """Constrói o lote codificando um array de labels (str) em categorias."""
+        categories, codes = np.unique(np.asarray(labels, dtype=object).astype(str), return_inverse=True)
+        return cls(
+            label_codes=codes.astype(np.int16),
+            label_categories=tuple(categories.tolist()),
+            **columns,
+        )
+
+    @classmethod
+    def concatenate(cls, batches: List["BatchResult"]) -> "BatchResult":
+        """Junta lotes analisados com o mesmo modelo, na ordem dada."""
+        if not batches:
+            raise ValueError("concatenate() needs at least one BatchResult.")
+        first = batches[0]
+        categories = sorted({label for batch in batches for label in batch.label_categories})
+        positions = {label: code for code, label in enumerate(categories)}
+        label_codes = [
+            np.asarray([positions[label] for label in batch.label_categories], dtype=np.int16)[batch.label_codes]
+            for batch in batches
+        ]
+        details: Dict[int, Optional[dict]] = {}
+        for batch in batches:
+            details.update(batch.archetype_details)
+        return cls(
+            bias_scores=np.concatenate([batch.bias_scores for batch in batches]),
+            confidences=np.concatenate([batch.confidences for batch in batches]),
+            label_codes=np.concatenate(label_codes),
+            label_categories=tuple(categories),
+            plans=np.concatenate([batch.plans for batch in batches]),
+            archetype_indices=np.concatenate([batch.archetype_indices for batch in batches]),
+            archetype_names=first.archetype_names,
+            archetype_details=details,
+            model_version=first.model_version,
+            fields=first.fields,
+            drift=merge_summaries(batch.drift for batch in batches if batch.drift) or None,
+            delta12=(
+                np.concatenate([batch.delta12 for batch in batches])
+                if all(batch.delta12 is not None for batch in batches) else None
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.label_codes)
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Labels por linha (array de str)."""
+        return np.asarray(self.label_categories, dtype=object)[self.label_codes]
+
+    @property
+    def dominant_archetypes(self) -> np.ndarray:
+        names = np.asarray(self.archetype_names + ("indefinido",), dtype=object)
+        return names[self.archetype_indices]
+
+    @property
+    def empty_mask(self) -> np.ndarray:
+        return self.archetype_indices < 0
+
+    def label_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.label_codes, minlength=len(self.label_categories))
+        return dict(zip(self.label_categories, counts.tolist()))
+
+    def __getitem__(self, index: int) -> AnalysisResult:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("BatchResult index out of range")
+        return self._item(
+            index, self.label_categories[self.label_codes[index]],
+            float(self.bias_scores[index]), float(self.confidences[index]),
+            int(self.plans[index]), int(self.archetype_indices[index]),
+        )
+
+    def _item(self, index, label, score, confidence, plan, archetype) -> AnalysisResult:
+        if archetype < 0:
+            return AnalysisResult(
+                bias_score=0.0, label=label, confidence=confidence, plan=plan,
+                dominant_archetype="indefinido", archetype_detail={},
+                model_version=self.model_version, input_index=index, is_empty=True,
+            )
+        return AnalysisResult(
+            bias_score=None if score != score else score,  # NaN -> None
+            label=label, confidence=confidence, plan=plan,
+            dominant_archetype=self.archetype_names[archetype],
+            archetype_detail=self.archetype_details.get(archetype),
+            model_version=self.model_version, input_index=index,
+        )
+
+    def __iter__(self) -> Iterator[AnalysisResult]:
+        categories = self.label_categories
+        rows = zip(
+            self.label_codes.tolist(), self.bias_scores.tolist(), self.confidences.tolist(),
+            self.plans.tolist(), self.archetype_indices.tolist(),
+        )
+        for index, (code, score, confidence, plan, archetype) in enumerate(rows):
+            yield self._item(index, categories[code], score, confidence, plan, archetype)
+
+    def to_dicts(self, fields: Optional[frozenset] = None) -> List[dict]:
+        """Os dicionários de analyze_batch (com `input_index`), na ordem de entrada."""
+        if fields is None:
+            fields = self.fields
+        # Monta os dicionários direto das colunas, sem AnalysisResult intermediários
+        categories, names, details = self.label_categories, self.archetype_names, self.archetype_details
+        version = self.model_version
+        rows = zip(
+            self.label_codes.tolist(), self.bias_scores.tolist(), self.confidences.tolist(),
+            self.plans.tolist(), self.archetype_indices.tolist(),
+        )
+        results = []
+        for index, (code, score, confidence, plan, archetype) in enumerate(rows):
+            if archetype < 0:
+                result = _empty_result(version, fields)
+            else:
+                result = _assemble_result(
+                    None, categories[code], None if score != score else score, confidence,
+                    plan, names[archetype], details.get(archetype), version, fields,
+                )
+            result["input_index"] = index
+            results.append(result)
+        return results
+
+    def _columns(self) -> Dict[str, Any]:
+        return {
+            "bias_score": self.bias_scores,
+            "confidence": self.confidences,
+            "plan": self.plans,
+            "archetype_index": self.archetype_indices,
+        }
+
+    def to_pandas(self):
+        """DataFrame com uma linha por texto; `label` e `dominant_archetype` categóricos."""
+        import pandas as pd
+
+        frame = pd.DataFrame(self._columns())
+        frame.insert(0, "label", pd.Categorical.from_codes(self.label_codes, self.label_categories))
+        frame["dominant_archetype"] = pd.Categorical.from_codes(
+            np.where(self.archetype_indices < 0, len(self.archetype_names), self.archetype_indices),
+            self.archetype_names + ("indefinido",),
+        )
+        frame["model_version"] = self.model_version
+        return frame
+
+    def to_arrow(self):
+        """pyarrow.Table equivalente a to_pandas (labels como dictionary arrays)."""
+        try:
+            import pyarrow as pa
+        except ImportError as exc:
+            raise ImportError("BatchResult.to_arrow requires the optional 'pyarrow' package.") from exc
+
+        columns = {name: pa.array(values) for name, values in self._columns().items()}
+        columns["bias_score"] = pa.array(self.bias_scores, mask=np.isnan(self.bias_scores))
+        label = pa.DictionaryArray.from_arrays(
+            pa.array(self.label_codes), pa.array(list(self.label_categories), type=pa.string())
+        )
+        archetype = pa.DictionaryArray.from_arrays(
+            pa.array(np.where(self.archetype_indices < 0, len(self.archetype_names), self.archetype_indices)),
+            pa.array(list(self.archetype_names) + ["indefinido"], type=pa.string()),
+        )
+        return pa.table({"label": label, **columns, "dominant_archetype": archetype}).append_column(
+            "model_version", pa.array([self.model_version] * len(self), type=pa.string())
+        )
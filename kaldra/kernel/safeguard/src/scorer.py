@@ -1,6 +1,62 @@
-"""
-KALDRA-SAFEGUARD v0.6 — módulo scorer
+import numpy as np
+from typing import Optional
 
-Arquivo inicial. A lógica será implementada em versões posteriores.
-"""
-# TODO: implementar scorer.
+from .model_registry import ModelHandle, get_registry
+
+def get_model_version() -> str:
+    """
+    Identifies the model currently used by compute_bias_score(s).
+
+    The version embeds the artifact digest (e.g. `v0.4:<digest>`), so replacing
+    a model file yields a different version string (used e.g. to invalidate
+    cached results). Falls back to `heuristic-v0.1` when no model is available.
+    """
+    return get_registry().current().version
+
+def warmup() -> str:
+    """Loads the active scoring model and returns its version."""
+    return get_model_version()
+
+def compute_bias_score(delta12: list[float] | np.ndarray) -> tuple[float, str]:
+    """
+    Computes a bias score and determines a label from a 12-dimensional vector.
+
+    The model comes from the registry (see model_registry.py): the highest
+    versioned artifact in `data/`, preferring the compiled export, and the
+    v0.1 heuristic when no model can be loaded.
+    """
+    if not isinstance(delta12, (list, np.ndarray)) or len(delta12) != 12:
+        raise ValueError("Input must be a 12-element list or array of floats.")
+
+    scores, labels = compute_bias_scores(np.asarray(delta12, dtype=float).reshape(1, -1))
+    return float(scores[0]), labels[0]
+
+def compute_bias_scores(
+    delta12_matrix: np.ndarray, model: Optional[ModelHandle] = None
+) -> tuple[np.ndarray, list[str]]:
+    """
+    Batch version of `compute_bias_score` for an (N, 12) matrix.
+
+    Scores every row with a single `predict_proba` call. Pass `model` (a
+    snapshot from the registry) to pin a whole batch to one model version
+    even if a new one is swapped in meanwhile.
+
+    Returns:
+        A tuple (bias_scores, labels) with one entry per row.
+    """
+    X = np.asarray(delta12_matrix, dtype=float)
+    if X.ndim != 2 or X.shape[1] != 12:
+        raise ValueError("Input must be an (N, 12) array of floats.")
+
+    if X.shape[0] == 0:
+        return np.empty(0, dtype=float), []
+
+    if model is None:
+        model = get_registry().current()
+
+    bias_scores = np.asarray(model.predict_positive(X), dtype=float)
+
+    # Determine the labels based on the final scores
+    labels = np.where(bias_scores >= 0.5, "biased", "neutral").tolist()
+
+    return bias_scores, labels
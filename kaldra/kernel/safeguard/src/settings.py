@@ -1,6 +1,134 @@
 """
 KALDRA-SAFEGUARD v0.6 — módulo settings
 
-Arquivo inicial. A lógica será implementada em versões posteriores.
+Configurações globais do kernel. Os valores padrão podem ser sobrescritos
+por variáveis de ambiente com prefixo `KALDRA_` (ex.: `KALDRA_TAU_THRESHOLD`).
 """
-# TODO: implementar settings.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+# Campos que alteram o resultado da análise (entram no fingerprint do cache).
+ANALYSIS_FIELDS = ("tau_threshold",)
+
+
+@dataclass(frozen=True)
+class BiasSettings:
+    """
+    Configuração imutável do kernel.
+
+    - tau_threshold: limiar de confiança da camada τ.
+    - cache_*: cache de resultados de analyze_text/analyze_batch.
+    - microbatch_*: agrupamento de chamadas concorrentes em /bias/detect.
+    - stream_chunk_size: itens por bloco em /bias/batch_detect/stream.
+    - model_dir: diretório dos artefatos de modelo (padrão: `data/`).
+    - metrics_*: métricas de latência por estágio (fração amostrada em
+      `metrics_sample_rate`; contadores não são amostrados).
+    - longdoc_*: janelas e parada antecipada de analyze_document.
+    - parallel_*: execução de lotes grandes em um pool de processos
+      (`parallel_workers` 1 desliga, 0 usa todos os núcleos; lotes menores
+      que `parallel_min_batch` continuam no processo atual;
+      `parallel_start_method` padrão: forkserver, ou spawn; fork só se
+      configurado explicitamente).
+    - feature_store_dir: diretório do feature store de treino/avaliação
+      (padrão: `data/features/`).
+    - drift_*: monitor de drift online (janelas de `drift_window_size`
+      itens por locale/plano, comparadas com a referência salva em
+      `drift_reference_path`).
+    """
+
+    tau_threshold: float = 0.4
+
+    cache_enabled: bool = False
+    cache_max_entries: int = 50_000
+    cache_ttl_seconds: float = 3600.0
+    cache_path: Optional[str] = None
+
+    microbatch_window_ms: float = 5.0
+    microbatch_max_size: int = 64
+    microbatch_workers: int = 2
+
+    stream_chunk_size: int = 256
+
+    model_dir: Optional[str] = None
+
+    metrics_enabled: bool = True
+    metrics_sample_rate: float = 1.0
+
+    longdoc_window_chars: int = 4000
+    longdoc_overlap_chars: int = 200
+    longdoc_stability_tolerance: float = 0.005
+    longdoc_patience: int = 8
+
+    parallel_workers: int = 1
+    parallel_min_batch: int = 4096
+    parallel_start_method: Optional[str] = None
+
+    feature_store_dir: Optional[str] = None
+
+    drift_enabled: bool = True
+    drift_window_size: int = 1000
+    drift_psi_threshold: float = 0.2
+    drift_kl_threshold: float = 0.1
+    drift_reference_path: Optional[str] = None
+
+    def fingerprint(self) -> str:
+        """Hash estável dos campos que influenciam o resultado da análise."""
+        relevant = {name: asdict(self)[name] for name in ANALYSIS_FIELDS}
+        payload = json.dumps(relevant, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env(name: str, default: Any, cast: Callable[[str], Any]) -> Any:
+    """Lê `KALDRA_<NAME>` do ambiente, caindo no default se ausente."""
+    raw = os.environ.get(f"KALDRA_{name}")
+    if raw is None or raw == "":
+        return default
+    return cast(raw)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> BiasSettings:
+    """
+    Retorna as configurações globais (carregadas uma única vez).
+    """
+    defaults = BiasSettings()
+    return BiasSettings(
+        tau_threshold=_env("TAU_THRESHOLD", defaults.tau_threshold, float),
+        cache_enabled=_env("CACHE_ENABLED", defaults.cache_enabled, _parse_bool),
+        cache_max_entries=_env("CACHE_MAX_ENTRIES", defaults.cache_max_entries, int),
+        cache_ttl_seconds=_env("CACHE_TTL_SECONDS", defaults.cache_ttl_seconds, float),
+        cache_path=_env("CACHE_PATH", defaults.cache_path, str),
+        microbatch_window_ms=_env("MICROBATCH_WINDOW_MS", defaults.microbatch_window_ms, float),
+        microbatch_max_size=_env("MICROBATCH_MAX_SIZE", defaults.microbatch_max_size, int),
+        microbatch_workers=_env("MICROBATCH_WORKERS", defaults.microbatch_workers, int),
+        stream_chunk_size=_env("STREAM_CHUNK_SIZE", defaults.stream_chunk_size, int),
+        model_dir=_env("MODEL_DIR", defaults.model_dir, str),
+        metrics_enabled=_env("METRICS_ENABLED", defaults.metrics_enabled, _parse_bool),
+        metrics_sample_rate=_env("METRICS_SAMPLE_RATE", defaults.metrics_sample_rate, float),
+        longdoc_window_chars=_env("LONGDOC_WINDOW_CHARS", defaults.longdoc_window_chars, int),
+        longdoc_overlap_chars=_env("LONGDOC_OVERLAP_CHARS", defaults.longdoc_overlap_chars, int),
+        longdoc_stability_tolerance=_env(
+            "LONGDOC_STABILITY_TOLERANCE", defaults.longdoc_stability_tolerance, float
+        ),
+        longdoc_patience=_env("LONGDOC_PATIENCE", defaults.longdoc_patience, int),
+        parallel_workers=_env("PARALLEL_WORKERS", defaults.parallel_workers, int),
+        parallel_min_batch=_env("PARALLEL_MIN_BATCH", defaults.parallel_min_batch, int),
+        parallel_start_method=_env("PARALLEL_START_METHOD", defaults.parallel_start_method, str),
+        feature_store_dir=_env("FEATURE_STORE_DIR", defaults.feature_store_dir, str),
+        drift_enabled=_env("DRIFT_ENABLED", defaults.drift_enabled, _parse_bool),
+        drift_window_size=_env("DRIFT_WINDOW_SIZE", defaults.drift_window_size, int),
+        drift_psi_threshold=_env("DRIFT_PSI_THRESHOLD", defaults.drift_psi_threshold, float),
+        drift_kl_threshold=_env("DRIFT_KL_THRESHOLD", defaults.drift_kl_threshold, float),
+        drift_reference_path=_env("DRIFT_REFERENCE_PATH", defaults.drift_reference_path, str),
+    )
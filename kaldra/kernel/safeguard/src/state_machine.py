@@ -1,7 +1,39 @@
 """
 KALDRA-SAFEGUARD v0.6 — módulo state_machine
 
-Stub inicial do operador simbólico/matemático para o kernel SAFEGUARD.
-A implementação real será adicionada em etapas posteriores.
+Máquina narrativa de estados simbólicos: classifica a condição da narrativa
+de cada fonte acompanhada (coerente, em tensão, em crise, em reordenação),
+que evolui via 3 → 6 → 9 a cada texto analisado.
+
+Apenas estados e transições são definidos aqui; as fontes são mantidas e
+avançadas em lote pelo motor compartilhado (`kernel/core/src/state_machine.py`).
 """
-# TODO: implementar state_machine para o KALDRA-SAFEGUARD.
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Union
+
+from ...core.src.state_machine import StateMachine, StateMachineSpec
+
+STATES = ("COHERENT", "TENSION", "CRISIS", "REORDERING")
+
+TRANSITIONS = {
+    3: {"TENSION": "COHERENT", "CRISIS": "REORDERING", "REORDERING": "COHERENT"},
+    6: {"COHERENT": "TENSION"},
+    9: {state: "CRISIS" for state in STATES},
+}
+
+MIN_DWELL = {"CRISIS": 1}
+
+SPEC = StateMachineSpec.from_transitions(STATES, TRANSITIONS, MIN_DWELL)
+
+
+def new_state_machine() -> StateMachine:
+    """Máquina vazia; entidades novas começam em COHERENT."""
+    return StateMachine(SPEC)
+
+
+def load_state_machine(path: Union[str, Path]) -> StateMachine:
+    """Restaura um snapshot salvo com `StateMachine.save`."""
+    return StateMachine.load(path, SPEC)
@@ -5,9 +5,9 @@ Arquivo inicial. A lógica será implementada em versões posteriores.
 """
 # TODO: implementar tau.
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Tuple, Union
 
-def estimate_confidence(delta12: List[float]) -> float:
+def estimate_confidence(delta12: Union[List[float], np.ndarray]) -> float:
     """
     A simple heuristic for estimating confidence based on the distribution of the
     delta12 vector. The core idea is that a more concentrated (less uniform)
@@ -16,10 +16,10 @@ def estimate_confidence(delta12: List[float]) -> float:
     The confidence is calculated as the difference between the maximum value and
     the mean value of the vector, roughly normalized to the [0, 1] range.
     """
-    if not delta12:
+    arr = np.asarray(delta12, dtype=float)
+    if arr.size == 0:
         return 0.0
 
-    arr = np.array(delta12, dtype=float)
     max_val = float(arr.max())
     mean_val = float(arr.mean())
 
@@ -32,7 +32,7 @@ def estimate_confidence(delta12: List[float]) -> float:
 
     return confidence
 
-def apply_tau_policy(delta12: List[float], tau_threshold: float = 0.4) -> Dict:
+def apply_tau_policy(delta12: Union[List[float], np.ndarray], tau_threshold: float = 0.4) -> Dict:
     """
     Applies the τ-layer (doubt policy) to the analysis.
 
@@ -62,3 +62,27 @@ def apply_tau_policy(delta12: List[float], tau_threshold: float = 0.4) -> Dict:
         "status": "proceed",
         "confidence": confidence
     }
+
+def estimate_confidence_batch(delta12: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `estimate_confidence` over a (N, 12) matrix of delta12 rows.
+    """
+    arr = np.asarray(delta12, dtype=float)
+    if arr.size == 0:
+        return np.zeros(arr.shape[0] if arr.ndim == 2 else 0, dtype=float)
+
+    raw_confidence = arr.max(axis=1) - arr.mean(axis=1)
+    return np.clip(raw_confidence * 10.0, 0.0, 1.0)
+
+def apply_tau_policy_batch(
+    delta12: np.ndarray, tau_threshold: float = 0.4
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applies the τ-layer to a whole batch at once.
+
+    Returns:
+        A tuple (confidence, conclusive) of arrays with one entry per row;
+        `conclusive` is True where the row would get status 'proceed'.
+    """
+    confidence = estimate_confidence_batch(delta12)
+    return confidence, confidence >= tau_threshold
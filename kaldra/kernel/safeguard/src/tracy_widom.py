@@ -1,7 +1,37 @@
 """
 KALDRA-SAFEGUARD v0.6 — módulo tracy_widom
 
-Stub inicial do operador simbólico/matemático para o kernel SAFEGUARD.
-A implementação real será adicionada em etapas posteriores.
+Detecção de explosões narrativas (edge-of-chaos): um autovalor dominante
+da matriz de acoplamento acima da borda Tracy–Widom indica estouro
+narrativo.
+
+Adaptador fino sobre o motor compartilhado (`kernel/core/src/tracy_widom.py`).
 """
-# TODO: implementar tracy_widom para o KALDRA-SAFEGUARD.
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from ...core.src.tracy_widom import TWAnomaly, tracy_widom_batch
+
+# Acoplamentos reais simétricos: ensemble ortogonal (β=1)
+BETA = 1
+# Textos com p-valor abaixo deste nível são sinalizados
+SIGNIFICANCE = 0.01
+
+
+def anomaly_tw(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> TWAnomaly:
+    """Estatística TW, p-valor e sinal `anomaly_TW` de um lote Δ12 (N, 12)."""
+    return tracy_widom_batch(delta12, coupling=coupling, beta=BETA)
+
+
+def anomaly_signal(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> np.ndarray:
+    """Apenas o sinal `anomaly_TW` (N,), em [0, 1]."""
+    return anomaly_tw(delta12, coupling).anomaly
+
+
+def anomaly_flags(delta12: np.ndarray, coupling: Optional[np.ndarray] = None) -> np.ndarray:
+    """Máscara (N,) dos itens com p-valor TW abaixo de SIGNIFICANCE."""
+    return anomaly_tw(delta12, coupling).flags(SIGNIFICANCE)
@@ -1,95 +1,580 @@
 """
 KALDRA-SAFEGUARD v0.6 — módulo train
 
-Arquivo inicial. A lógica será implementada em versões posteriores.
+Treino do modelo de scoring sobre os vetores Δ12 do feature store.
+
+Features: até a v0.5 o treino usava os embeddings brutos (384 dimensões),
+mas o scorer sempre recebeu Δ12 (N, 12) na inferência, então um modelo
+treinado assim falhava em todo `predict_proba`. O treino usa agora os
+mesmos vetores Δ12 da inferência, o que muda o modelo produzido: as
+métricas de um artefato novo não são comparáveis às de um treinado sobre
+embeddings, e o registry recusa artefatos com outra dimensão
+(`model_registry.FEATURE_DIM`).
+
+Modos (`python -m kaldra.kernel.safeguard.src.train --mode ...`):
+
+- single: um ajuste com C=1.0, class_weight="balanced" e calibração
+  sigmoid (o treino da v0.4); grava `model_v04.joblib`.
+- search: busca em grade (ou aleatória, com `--n-iter`) sobre C,
+  class_weight e método de calibração (sigmoid / isotonic). Os folds são
+  sorteados uma vez e reutilizados por todos os candidatos; em cada fold o
+  caminho de regularização é percorrido com warm start; os pares
+  (class_weight, fold) rodam em paralelo em todos os núcleos. A calibração
+  é escolhida sobre os scores out-of-fold, sem novos ajustes.
+- incremental: SGD logístico com `partial_fit`, lendo o feature store em
+  blocos; todos os candidatos de alpha/class_weight são treinados na mesma
+  passada. Para datasets que não cabem em memória.
+
+Os modos search e incremental gravam um artefato versionado
+(`model_vX.Y.joblib`, mais o export `.npz` quando a calibração é sigmoid)
+com as métricas em `model_vX.Y.metrics.json`; o registry o adota no próximo
+refresh.
 """
-# TODO: implementar train.
-import pandas as pd
-import joblib
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.calibration import CalibratedClassifierCV
-from sklearn.metrics import accuracy_score, f1_score, matthews_corrcoef
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import joblib
 import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import (
+    accuracy_score, brier_score_loss, f1_score, log_loss, matthews_corrcoef,
+)
+from sklearn.model_selection import StratifiedKFold, train_test_split
 
-from .embeddings import get_embedding
+from .compiled_scorer import compile_joblib_model
+from .feature_store import FeatureSet, get_feature_store
+from .model_registry import DEFAULT_MODEL_DIR, discover_artifacts
+from .settings import get_settings
 
 # --- Define Paths ---
 BIAS_KERNEL_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BIAS_KERNEL_DIR / "data"
-DATASET_PATH = DATA_DIR / "datasets" / "bias_dataset_v04.csv"
+DATASET_PATH = DATA_DIR / "dataset" / "bias_dataset_v04.csv"
 MODEL_SAVE_PATH = DATA_DIR / "model_v04.joblib"
 
-def train_calibrated_model_v04():
+RANDOM_STATE = 42
+VALIDATION_SIZE = 0.2
+
+# --- Search space ---
+SEARCH_C_GRID = tuple(float(c) for c in np.logspace(-3, 2, 11))
+SEARCH_CLASS_WEIGHTS = (None, "balanced")
+CALIBRATION_METHODS = ("sigmoid", "isotonic")
+N_FOLDS = 3
+
+# --- Incremental (partial_fit) training ---
+INCREMENTAL_ALPHAS = (1e-5, 1e-4, 1e-3, 1e-2)
+INCREMENTAL_EPOCHS = 5
+INCREMENTAL_BLOCK_SIZE = 65_536
+# Held-out rows are gathered in memory for calibration and validation
+MAX_HOLDOUT_ROWS = 200_000
+# Smallest held-out sample that still gives both halves a few rows
+MIN_HOLDOUT_ROWS = 20
+
+
+def _holdout_size(n_labelled: int) -> int:
+    return min(int(n_labelled * VALIDATION_SIZE), MAX_HOLDOUT_ROWS)
+
+
+def load_training_data(dataset_path: Union[str, Path] = DATASET_PATH) -> Tuple[FeatureSet, np.ndarray]:
+    """
+    Features of the whole dataset from the feature store, plus its labels.
+
+    Labels are 1 ("biased"), 0 ("neutral") or -1 (anything else, not used
+    for supervised training). Rows already materialized are memory-mapped;
+    only appended rows are computed.
+    """
+    dataset_path = Path(dataset_path)
+    df = pd.read_csv(dataset_path)
+    texts = df['text'].fillna('').astype(str).tolist()
+    features = get_feature_store().materialize(texts, name=dataset_path.stem)
+
+    labels = np.full(len(df), -1, dtype=np.int8)
+    labels[(df['label'] == 'neutral').to_numpy()] = 0
+    labels[(df['label'] == 'biased').to_numpy()] = 1
+    return features, labels
+
+
+def evaluate_model(model, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    """Validation metrics of a fitted probabilistic classifier."""
+    proba = model.predict_proba(X)[:, list(model.classes_).index(1)]
+    y_pred = (proba >= 0.5).astype(int)
+    return {
+        "accuracy": float(accuracy_score(y, y_pred)),
+        "f1": float(f1_score(y, y_pred, zero_division=0)),
+        "mcc": float(matthews_corrcoef(y, y_pred)),
+        "log_loss": float(log_loss(y, proba, labels=[0, 1])),
+        "brier": float(brier_score_loss(y, proba)),
+    }
+
+
+def _print_metrics(metrics: Dict[str, float]) -> None:
+    for name, value in metrics.items():
+        print(f"Validation {name + ':':<10} {value:.4f}")
+
+
+# --- Single fit (v0.4) ---
+
+def train_calibrated_model_v04(dataset_path: Union[str, Path] = DATASET_PATH):
     """
     Main function to train, calibrate, and save the v0.4 model.
     """
     print("--- Starting Kaldra-Bias v0.4 Model Training ---")
 
-    # 1. Load the new dataset
+    # 1. Load the dataset and its features (the scorer is applied to Δ12
+    # vectors at inference time, so the model is trained on the same features)
     try:
-        df = pd.read_csv(DATASET_PATH)
-        print(f"Loaded dataset: {DATASET_PATH} ({len(df)} rows)")
+        features, labels = load_training_data(dataset_path)
     except FileNotFoundError:
-        print(f"Error: Dataset not found at {DATASET_PATH}. Aborting.")
+        print(f"Error: Dataset not found at {dataset_path}. Aborting.")
         return
+    supervised = labels >= 0
+    print(f"Loaded {len(features)} rows, {int(supervised.sum())} for supervised training.")
 
-    # 2. Preprocess data
-    df_supervised = df[df['label'].isin(['biased', 'neutral'])].copy()
-    print(f"Filtered for supervised training: {len(df_supervised)} rows")
-
-    df_supervised['label_binary'] = df_supervised['label'].apply(lambda x: 1 if x == 'biased' else 0)
+    X = features.delta12[supervised]
+    y = labels[supervised].astype(int)
 
-    # 3. Generate embeddings (features)
-    print("Generating text embeddings...")
-    X = np.array([get_embedding(text) for text in df_supervised['text']])
-    y = df_supervised['label_binary'].values
-    print("Embeddings generated.")
-
-    # 4. Split data into training and validation sets
+    # 2. Split data into training and validation sets
     X_train, X_val, y_train, y_val = train_test_split(
         X, y,
-        test_size=0.2,
-        random_state=42,
+        test_size=VALIDATION_SIZE,
+        random_state=RANDOM_STATE,
         stratify=y
     )
     print(f"Data split: {len(X_train)} training samples, {len(X_val)} validation samples.")
 
-    # 5. Train the base Logistic Regression model
-    print("Training base Logistic Regression model...")
+    # 3. Train and calibrate (Platt scaling). CalibratedClassifierCV fits its
+    # own copy of the base model on each fold, so it is not fitted beforehand.
+    print("Training calibrated Logistic Regression model...")
     model = LogisticRegression(
         class_weight="balanced",
         max_iter=500,
         C=1.0,
-        random_state=42
+        random_state=RANDOM_STATE
     )
-    model.fit(X_train, y_train)
-    print("Base model training complete.")
-
-    # 6. Calibrate the model using Platt scaling (sigmoid)
-    print("Calibrating model probabilities...")
     calibrated_model = CalibratedClassifierCV(model, method="sigmoid", cv=3)
     calibrated_model.fit(X_train, y_train)
     print("Calibration complete.")
 
-    # 7. Evaluate the calibrated model on the validation set
+    # 4. Evaluate the calibrated model on the validation set
     print("\n--- Evaluating Calibrated Model on Validation Set ---")
-    y_pred = calibrated_model.predict(X_val)
-
-    accuracy = accuracy_score(y_val, y_pred)
-    f1 = f1_score(y_val, y_pred, zero_division=0)
-    mcc = matthews_corrcoef(y_val, y_pred)
-
-    print(f"Validation Accuracy: {accuracy:.4f}")
-    print(f"Validation F1-Score: {f1:.4f}")
-    print(f"Validation MCC:      {mcc:.4f}")
+    _print_metrics(evaluate_model(calibrated_model, X_val, y_val))
     print("--------------------------------------------------")
 
-    # 8. Save the final calibrated model
+    # 5. Save the final calibrated model
     joblib.dump(calibrated_model, MODEL_SAVE_PATH)
     print(f"\nCalibrated model v0.4 successfully saved to: {MODEL_SAVE_PATH}")
+    # The registry prefers the compiled export of the same version, so it is
+    # regenerated from the new joblib instead of left pointing at the old one
+    compiled_path = compile_joblib_model(MODEL_SAVE_PATH)
+    print(f"Compiled scorer saved to: {compiled_path}")
     print("--- Training Process Finished ---")
 
+
+# --- Hyperparameter and calibration search ---
+
+@dataclass(frozen=True)
+class Candidate:
+    """One point of the search space with its cross-validated scores."""
+
+    C: float
+    class_weight: Optional[str]
+    method: str
+    log_loss: float
+    brier: float
+
+
+def _fold_decision_path(
+    X: np.ndarray,
+    y: np.ndarray,
+    train_index: np.ndarray,
+    test_index: np.ndarray,
+    Cs: Sequence[float],
+    class_weight: Optional[str],
+) -> np.ndarray:
+    """
+    Held-out decision scores of one fold along the regularization path,
+    shape (len(Cs), len(test_index)).
+
+    Cs are visited in increasing order and every fit warm-starts from the
+    previous solution, so the whole path costs little more than one fit.
+    """
+    X_train, y_train, X_test = X[train_index], y[train_index], X[test_index]
+    model = LogisticRegression(
+        class_weight=class_weight, max_iter=500, warm_start=True, random_state=RANDOM_STATE
+    )
+    path = np.empty((len(Cs), len(test_index)))
+    for i, C in enumerate(Cs):
+        model.set_params(C=C)
+        model.fit(X_train, y_train)
+        path[i] = model.decision_function(X_test)
+    return path
+
+
+def _fit_calibrator(decision: np.ndarray, y: np.ndarray, method: str):
+    if method == "isotonic":
+        return IsotonicRegression(out_of_bounds="clip", y_min=0.0, y_max=1.0).fit(decision, y)
+    return LogisticRegression(C=1e6).fit(decision.reshape(-1, 1), y)
+
+
+def _calibrated_proba(calibrator, decision: np.ndarray) -> np.ndarray:
+    if isinstance(calibrator, IsotonicRegression):
+        return calibrator.predict(decision)
+    return calibrator.predict_proba(decision.reshape(-1, 1))[:, 1]
+
+
+def _score_calibrations(
+    decision: np.ndarray,
+    y: np.ndarray,
+    folds: Sequence[Tuple[np.ndarray, np.ndarray]],
+    methods: Sequence[str],
+) -> Dict[str, Tuple[float, float]]:
+    """
+    (log loss, Brier) of each calibration method on out-of-fold scores: the
+    calibrator of each fold is fitted on the scores of the other folds.
+    """
+    scores = {}
+    for method in methods:
+        proba = np.empty(len(y))
+        for _, test_index in folds:
+            others = np.ones(len(y), dtype=bool)
+            others[test_index] = False
+            calibrator = _fit_calibrator(decision[others], y[others], method)
+            proba[test_index] = _calibrated_proba(calibrator, decision[test_index])
+        scores[method] = (float(log_loss(y, proba, labels=[0, 1])), float(brier_score_loss(y, proba)))
+    return scores
+
+
+def _search_space(
+    Cs: Sequence[float], class_weights: Sequence[Optional[str]], n_iter: Optional[int]
+) -> Dict[Optional[str], List[float]]:
+    """(C, class_weight) pairs to try, grouped by class_weight with sorted Cs."""
+    pairs = list(itertools.product(sorted(Cs), class_weights))
+    if n_iter is not None and n_iter < len(pairs):
+        rng = np.random.default_rng(RANDOM_STATE)
+        pairs = [pairs[i] for i in sorted(rng.choice(len(pairs), size=n_iter, replace=False))]
+    space: Dict[Optional[str], List[float]] = {}
+    for C, class_weight in pairs:
+        space.setdefault(class_weight, []).append(C)
+    return space
+
+
+def search_calibrated_model(
+    X: np.ndarray,
+    y: np.ndarray,
+    Cs: Sequence[float] = SEARCH_C_GRID,
+    class_weights: Sequence[Optional[str]] = SEARCH_CLASS_WEIGHTS,
+    methods: Sequence[str] = CALIBRATION_METHODS,
+    n_folds: int = N_FOLDS,
+    n_iter: Optional[int] = None,
+    n_jobs: int = -1,
+) -> Tuple[CalibratedClassifierCV, List[Candidate]]:
+    """
+    Searches C, class_weight and calibration method and fits the best
+    configuration.
+
+    Returns the fitted CalibratedClassifierCV (one calibrated model per fold,
+    on the same fold splits used by the search) and every candidate, best
+    first (lowest out-of-fold log loss).
+    """
+    folds = list(StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=RANDOM_STATE).split(X, y))
+    space = _search_space(Cs, class_weights, n_iter)
+    tasks = [(class_weight, fold) for class_weight in space for fold in range(len(folds))]
+
+    paths = Parallel(n_jobs=n_jobs)(
+        delayed(_fold_decision_path)(X, y, *folds[fold], space[class_weight], class_weight)
+        for class_weight, fold in tasks
+    )
+
+    # Out-of-fold decision scores: every training row is held out exactly once
+    decisions = {class_weight: np.empty((len(grid), len(y))) for class_weight, grid in space.items()}
+    for (class_weight, fold), path in zip(tasks, paths):
+        decisions[class_weight][:, folds[fold][1]] = path
+
+    points = [(class_weight, i) for class_weight, grid in space.items() for i in range(len(grid))]
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_score_calibrations)(decisions[class_weight][i], y, folds, methods)
+        for class_weight, i in points
+    )
+
+    candidates = [
+        Candidate(space[class_weight][i], class_weight, method, *point_scores[method])
+        for (class_weight, i), point_scores in zip(points, scores)
+        for method in methods
+    ]
+    candidates.sort(key=lambda c: (c.log_loss, c.brier))
+    best = candidates[0]
+
+    model = CalibratedClassifierCV(
+        LogisticRegression(
+            C=best.C, class_weight=best.class_weight, max_iter=500, random_state=RANDOM_STATE
+        ),
+        method=best.method,
+        cv=folds,
+        n_jobs=n_jobs,
+    )
+    model.fit(X, y)
+    return model, candidates
+
+
+# --- Incremental training ---
+
+def _balanced_weights(labels: np.ndarray) -> np.ndarray:
+    """Per-class weights of class_weight="balanced", from label counts."""
+    counts = np.bincount(labels, minlength=2).astype(float)
+    return counts.sum() / (2 * np.maximum(counts, 1.0))
+
+
+def _prefit_calibrator(model, method: str) -> CalibratedClassifierCV:
+    """
+    Calibrator for an already-fitted model: `FrozenEstimator` on
+    scikit-learn >= 1.6, `cv="prefit"` (removed in 1.8) on older versions.
+    """
+    try:
+        from sklearn.frozen import FrozenEstimator
+    except ImportError:
+        return CalibratedClassifierCV(model, method=method, cv="prefit")
+    return CalibratedClassifierCV(FrozenEstimator(model), method=method)
+
+
+def train_incremental_model(
+    features: FeatureSet,
+    labels: np.ndarray,
+    alphas: Sequence[float] = INCREMENTAL_ALPHAS,
+    class_weights: Sequence[Optional[str]] = SEARCH_CLASS_WEIGHTS,
+    method: str = "sigmoid",
+    epochs: int = INCREMENTAL_EPOCHS,
+    block_size: int = INCREMENTAL_BLOCK_SIZE,
+) -> Tuple[CalibratedClassifierCV, List[Candidate], Dict[str, float]]:
+    """
+    Logistic SGD trained with `partial_fit` over blocks of the memory-mapped
+    Δ12 matrix, so only one block is in memory at a time.
+
+    A random held-out sample (at most MAX_HOLDOUT_ROWS rows) is excluded
+    from training; half of it calibrates the candidates and picks the best,
+    the other half gives the reported validation metrics. Candidates are
+    ranked by log loss, with `C` holding the SGD alpha.
+
+    Raises ValueError when the dataset is too small for that split (fewer
+    than MIN_HOLDOUT_ROWS held-out rows) or a split misses one of the classes.
+    """
+    rng = np.random.default_rng(RANDOM_STATE)
+    labelled = np.flatnonzero(labels >= 0)
+    n_holdout = _holdout_size(len(labelled))
+    if n_holdout < MIN_HOLDOUT_ROWS:
+        raise ValueError(
+            f"Incremental training needs at least {int(np.ceil(MIN_HOLDOUT_ROWS / VALIDATION_SIZE))} "
+            f"labelled rows ({len(labelled)} found); use --mode single or search for small datasets."
+        )
+    holdout = np.sort(rng.choice(labelled, size=n_holdout, replace=False))
+    train_mask = labels >= 0
+    train_mask[holdout] = False
+    half = len(holdout) // 2
+    order = rng.permutation(len(holdout))
+    calibration, validation = order[:half], order[half:]
+    for split, rows in (("training", np.flatnonzero(train_mask)), ("calibration", holdout[calibration])):
+        if len(np.unique(labels[rows])) < 2:
+            raise ValueError(f"The {split} split has a single class; add labelled rows of both classes.")
+
+    weights = _balanced_weights(labels[train_mask])
+    models = {
+        (alpha, class_weight): SGDClassifier(loss="log_loss", alpha=alpha, random_state=RANDOM_STATE)
+        for alpha in alphas for class_weight in class_weights
+    }
+    block_starts = np.arange(0, len(labels), block_size)
+    for epoch in range(epochs):
+        for start in rng.permutation(block_starts):
+            rows = slice(start, start + block_size)
+            mask = train_mask[rows]
+            if not mask.any():
+                continue
+            X_block = np.asarray(features.delta12[rows])[mask]
+            y_block = labels[rows][mask].astype(int)
+            for (_, class_weight), model in models.items():
+                sample_weight = weights[y_block] if class_weight == "balanced" else None
+                model.partial_fit(X_block, y_block, classes=[0, 1], sample_weight=sample_weight)
+        print(f"Epoch {epoch + 1}/{epochs} complete.")
+
+    X_holdout = np.asarray(features.delta12[holdout])
+    y_holdout = labels[holdout].astype(int)
+
+    calibrated = {}
+    candidates = []
+    for (alpha, class_weight), model in models.items():
+        calibrated_model = _prefit_calibrator(model, method)
+        calibrated_model.fit(X_holdout[calibration], y_holdout[calibration])
+        proba = calibrated_model.predict_proba(X_holdout[calibration])[:, 1]
+        calibrated[(alpha, class_weight)] = calibrated_model
+        candidates.append(Candidate(
+            alpha, class_weight, method,
+            float(log_loss(y_holdout[calibration], proba, labels=[0, 1])),
+            float(brier_score_loss(y_holdout[calibration], proba)),
+        ))
+    candidates.sort(key=lambda c: (c.log_loss, c.brier))
+    best = calibrated[(candidates[0].C, candidates[0].class_weight)]
+    metrics = evaluate_model(best, X_holdout[validation], y_holdout[validation])
+    return best, candidates, metrics
+
+
+# --- Versioned artifacts ---
+
+def next_artifact_version(model_dir: Union[str, Path]) -> Tuple[int, int]:
+    """Version after the highest artifact in `model_dir` (minor bump)."""
+    artifacts = discover_artifacts(model_dir)
+    if not artifacts:
+        return (0, 1)
+    major, minor = artifacts[0].version
+    return (major, minor + 1)
+
+
+def save_versioned_artifact(model, report: dict, model_dir: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Saves `model` as the next `model_vX.Y.joblib` in `model_dir`, with its
+    compiled `.npz` export when possible and `report` in
+    `model_vX.Y.metrics.json`.
+
+    The joblib file is written under a temporary name and renamed, so a
+    registry refresh never sees a partial artifact.
+    """
+    model_dir = Path(model_dir or get_settings().model_dir or DEFAULT_MODEL_DIR)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    major, minor = next_artifact_version(model_dir)
+    path = model_dir / f"model_v{major}.{minor}.joblib"
+
+    tmp = path.with_name(path.name + ".tmp")
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+
+    report = dict(report, version=f"v{major}.{minor}", artifact=path.name)
+    try:
+        report["compiled_artifact"] = compile_joblib_model(path).name
+    except ValueError as exc:
+        # Isotonic calibration has no closed form; the registry uses the joblib
+        report["compiled_artifact"] = None
+        print(f"Compiled export skipped: {exc}")
+
+    with open(path.with_name(f"model_v{major}.{minor}.metrics.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def _report(mode: str, features: FeatureSet, params: dict, n_train: int, n_validation: int,
+            metrics: Dict[str, float], candidates: List[Candidate], elapsed: float) -> dict:
+    return {
+        "mode": mode,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "training_seconds": round(elapsed, 3),
+        "dataset": features.name,
+        "content_hash": features.content_hash,
+        "feature_version": features.feature_version,
+        "n_train": n_train,
+        "n_validation": n_validation,
+        "params": params,
+        "validation": metrics,
+        "search": [asdict(candidate) for candidate in candidates],
+    }
+
+
+def run_search(
+    dataset_path: Union[str, Path] = DATASET_PATH,
+    model_dir: Optional[Union[str, Path]] = None,
+    n_iter: Optional[int] = None,
+    n_jobs: int = -1,
+) -> Path:
+    """Search mode: searches, validates and saves a versioned artifact."""
+    started = time.perf_counter()
+    features, labels = load_training_data(dataset_path)
+    supervised = labels >= 0
+    X = features.delta12[supervised]
+    y = labels[supervised].astype(int)
+    X_train, X_val, y_train, y_val = train_test_split(
+        X, y, test_size=VALIDATION_SIZE, random_state=RANDOM_STATE, stratify=y
+    )
+    print(f"Searching on {len(X_train)} samples ({len(X_val)} held out for validation)...")
+
+    model, candidates = search_calibrated_model(X_train, y_train, n_iter=n_iter, n_jobs=n_jobs)
+    best = candidates[0]
+    print(f"Best: C={best.C:.4g}, class_weight={best.class_weight}, method={best.method} "
+          f"(CV log loss {best.log_loss:.4f}, {len(candidates)} candidates)")
+    metrics = evaluate_model(model, X_val, y_val)
+    _print_metrics(metrics)
+
+    params = {"C": best.C, "class_weight": best.class_weight, "method": best.method, "n_folds": N_FOLDS}
+    report = _report("search", features, params, len(X_train), len(X_val), metrics, candidates,
+                     time.perf_counter() - started)
+    path = save_versioned_artifact(model, report, model_dir)
+    print(f"Model saved to: {path}")
+    return path
+
+
+def run_incremental(
+    dataset_path: Union[str, Path] = DATASET_PATH,
+    model_dir: Optional[Union[str, Path]] = None,
+    epochs: int = INCREMENTAL_EPOCHS,
+    block_size: int = INCREMENTAL_BLOCK_SIZE,
+) -> Path:
+    """Incremental mode: partial_fit training, validation and a versioned artifact."""
+    started = time.perf_counter()
+    features, labels = load_training_data(dataset_path)
+    print(f"Training incrementally on {int((labels >= 0).sum())} labelled rows...")
+
+    model, candidates, metrics = train_incremental_model(features, labels, epochs=epochs, block_size=block_size)
+    best = candidates[0]
+    print(f"Best: alpha={best.C:.4g}, class_weight={best.class_weight} (log loss {best.log_loss:.4f})")
+    _print_metrics(metrics)
+
+    params = {"alpha": best.C, "class_weight": best.class_weight, "method": best.method,
+              "epochs": epochs, "block_size": block_size}
+    n_labelled = int((labels >= 0).sum())
+    n_holdout = _holdout_size(n_labelled)
+    report = _report("incremental", features, params, n_labelled - n_holdout,
+                     n_holdout - n_holdout // 2, metrics, candidates, time.perf_counter() - started)
+    path = save_versioned_artifact(model, report, model_dir)
+    print(f"Model saved to: {path}")
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Train the Kaldra-Bias scoring model.")
+    parser.add_argument("--mode", choices=("single", "search", "incremental"), default="single")
+    parser.add_argument("--dataset", type=Path, default=DATASET_PATH)
+    parser.add_argument("--model-dir", type=Path, default=None,
+                        help="where versioned artifacts are saved (default: the registry directory)")
+    parser.add_argument("--n-iter", type=int, default=None,
+                        help="random search over this many (C, class_weight) pairs instead of the full grid")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--epochs", type=int, default=INCREMENTAL_EPOCHS)
+    parser.add_argument("--block-size", type=int, default=INCREMENTAL_BLOCK_SIZE)
+    args = parser.parse_args(argv)
+
+    if not args.dataset.exists():
+        print(f"Error: Dataset not found at {args.dataset}. Aborting.")
+        return 1
+    if args.mode == "single":
+        train_calibrated_model_v04(args.dataset)
+    elif args.mode == "search":
+        run_search(args.dataset, args.model_dir, n_iter=args.n_iter, n_jobs=args.n_jobs)
+    else:
+        try:
+            run_incremental(args.dataset, args.model_dir, epochs=args.epochs, block_size=args.block_size)
+        except ValueError as exc:
+            print(f"Error: {exc} Aborting.")
+            return 1
+    return 0
+
+
 if __name__ == "__main__":
-    train_calibrated_model_v04()
+    sys.exit(main())
@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+# Add the bench directory to the Python path (bench_pipeline is a script).
+sys.path.append(str(Path(__file__).resolve().parents[1] / "bench"))
+
+from bench_pipeline import compare, measure
+
+
+def _report(**medians):
+    return {"benchmarks": {name: {"median_us": value} for name, value in medians.items()}}
+
+
+def test_compare_flags_only_regressions_past_threshold():
+    baseline = _report(fast=100.0, slow=100.0, faster=100.0)
+    current = _report(fast=115.0, slow=130.0, faster=50.0)
+
+    assert compare(baseline, current, threshold=0.20) == ["slow"]
+    assert compare(baseline, current, threshold=0.50) == []
+
+
+def test_measure_reports_per_call_statistics():
+    stats = measure(lambda: sum(range(100)), repeat=3)
+
+    assert stats["samples"] == 3
+    assert 0 < stats["min_us"] <= stats["median_us"] <= stats["p95_us"]
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.bulk import BulkError, CheckpointState, default_checkpoint_path, main, run_bulk
+from kaldra.kernel.safeguard.src.pipeline import analyze_batch
+
+
+def _corpus(tmp_path, rows=230):
+    frame = pd.DataFrame({
+        "id": range(rows),
+        "text": [f"Linha {i} do corpus,\ncom quebra de linha." if i % 50 else "" for i in range(rows)],
+    })
+    path = tmp_path / "corpus.csv"
+    frame.to_csv(path, index=False)
+    return frame, path
+
+
+def test_bulk_csv_matches_batch_pipeline(tmp_path):
+    frame, source = _corpus(tmp_path)
+    output = tmp_path / "scored.csv"
+
+    assert main([str(source), str(output), "--chunk-size", "64", "--keep-columns", "id"]) == 0
+
+    scored = pd.read_csv(output)
+    expected = analyze_batch(frame["text"].fillna("").tolist())
+    assert scored["row"].tolist() == list(range(len(frame)))
+    assert scored["id"].tolist() == frame["id"].tolist()
+    assert scored["label"].tolist() == [result["label"] for result in expected]
+
+
+def test_interrupted_job_resumes_without_duplicates(tmp_path):
+    frame, source = _corpus(tmp_path)
+    output = tmp_path / "scored.csv"
+
+    first = run_bulk(source, output, chunk_size=64, max_rows=100, progress=None)
+    assert first.rows_done == 100
+    # Output written after the last checkpoint must be discarded on resume
+    with open(output, "a", encoding="utf-8") as f:
+        f.write("999,partial,row\n")
+
+    final = run_bulk(source, output, chunk_size=64, progress=None)
+    scored = pd.read_csv(output)
+
+    assert final.rows_done == len(frame)
+    assert CheckpointState.load(default_checkpoint_path(output)).rows_done == len(frame)
+    assert scored["row"].tolist() == list(range(len(frame)))
+
+
+@pytest.mark.parametrize("changed", [{"keep_columns": ["id"]}, {"locale": "en"}])
+def test_resume_rejects_a_checkpoint_from_different_arguments(tmp_path, changed):
+    _, source = _corpus(tmp_path)
+    output = tmp_path / "scored.csv"
+    run_bulk(source, output, chunk_size=64, max_rows=100, progress=None)
+
+    with pytest.raises(BulkError, match=next(iter(changed))):
+        run_bulk(source, output, chunk_size=64, progress=None, **changed)
+
+
+@pytest.mark.parametrize("arguments", [{"text_column": "body"}, {"keep_columns": ["id", "date"]}])
+def test_missing_columns_raise_a_bulk_error(tmp_path, arguments):
+    _, source = _corpus(tmp_path)
+    jsonl = tmp_path / "corpus.jsonl"
+    pd.read_csv(source).to_json(jsonl, orient="records", lines=True)
+
+    for path in (source, jsonl):
+        with pytest.raises(BulkError, match="has no column"):
+            run_bulk(path, tmp_path / "scored.csv", chunk_size=64, restart=True, progress=None, **arguments)
+
+
+def test_tsv_output_is_tab_separated(tmp_path):
+    frame, source = _corpus(tmp_path, rows=20)
+    output = tmp_path / "scored.tsv"
+
+    run_bulk(source, output, keep_columns=["id"], progress=None)
+
+    scored = pd.read_csv(output, sep="\t")
+    assert scored["id"].tolist() == frame["id"].tolist()
+    assert "label" in scored.columns
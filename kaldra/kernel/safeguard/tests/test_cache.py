@@ -0,0 +1,104 @@
+import sys
+from pathlib import Path
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src.cache import ResultCache, cached_analyze_text, cached_analyze_batch
+from kaldra.kernel.safeguard.src.pipeline import analyze_text
+from kaldra.kernel.safeguard.src.model_registry import ModelHandle, get_registry
+
+
+def test_cached_analyze_text_hits_on_repeat():
+    cache = ResultCache(max_entries=10)
+    first = cached_analyze_text("Texto repetido para o cache.", cache=cache)
+    second = cached_analyze_text("Texto repetido para o cache.", cache=cache)
+
+    assert first == second
+    assert first == analyze_text("Texto repetido para o cache.")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResultCache(max_entries=2, ttl_seconds=None)
+    cache.put("a", {"label": "neutral"})
+    cache.put("b", {"label": "neutral"})
+    cache.get("a")
+    cache.put("c", {"label": "neutral"})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+    expiring = ResultCache(max_entries=2, ttl_seconds=-1)
+    expiring.put("a", {"label": "neutral"})
+    assert expiring.get("a") is None
+
+
+def test_cached_batch_keeps_order_and_deduplicates(tmp_path):
+    cache = ResultCache(max_entries=10, path=str(tmp_path / "cache.sqlite"))
+    texts = ["Texto A.", "Texto B.", "Texto A.", ""]
+    results = cached_analyze_batch(texts, cache=cache)
+
+    assert [res["input_index"] for res in results] == [0, 1, 2, 3]
+    assert results[0]["label"] == results[2]["label"]
+    assert cache.stats()["size"] == 3
+
+    # Disk tier survives a new in-memory cache
+    reopened = ResultCache(max_entries=10, path=str(tmp_path / "cache.sqlite"))
+    cached_analyze_batch(texts, cache=reopened)
+    assert reopened.stats()["disk_hits"] == 3
+
+
+def test_model_change_invalidates_entries():
+    cache = ResultCache(max_entries=10)
+    cached_analyze_text("Texto versionado.", cache=cache)
+
+    registry = get_registry()
+    previous = registry.swap(ModelHandle(version="v9.9:outro"))
+    try:
+        result = cached_analyze_text("Texto versionado.", cache=cache)
+    finally:
+        registry.swap(previous)
+    assert cache.stats()["misses"] == 2
+    assert result["model_version"] == "v9.9:outro"
+
+
+def test_disk_tier_writes_a_batch_once_and_stays_bounded(tmp_path):
+    cache = ResultCache(max_entries=5, ttl_seconds=None, path=str(tmp_path / "cache.sqlite"))
+    statements = []
+    cache._db.set_trace_callback(statements.append)
+
+    cache.put_many((f"k{i}", {"label": "neutral"}) for i in range(8))
+
+    assert sum(statement.startswith("BEGIN") for statement in statements) == 1
+    (size,) = cache._db.execute("SELECT COUNT(*) FROM results").fetchone()
+    assert size == 5
+    reopened = ResultCache(max_entries=5, ttl_seconds=None, path=str(tmp_path / "cache.sqlite"))
+    assert reopened.get("k0") is None
+    assert reopened.get("k7") == {"label": "neutral"}
+
+
+def test_disk_size_is_tracked_without_a_count_per_write(tmp_path):
+    cache = ResultCache(max_entries=100, ttl_seconds=None, path=str(tmp_path / "cache.sqlite"))
+    statements = []
+    cache._db.set_trace_callback(statements.append)
+
+    for start in range(0, 30, 5):
+        # Lotes sobrepostos: metade das chaves já está no disco
+        cache.put_many((f"k{i}", {"label": "neutral"}) for i in range(start, start + 10))
+
+    assert not [statement for statement in statements if statement == "SELECT COUNT(*) FROM results"]
+    (size,) = cache._db.execute("SELECT COUNT(*) FROM results").fetchone()
+    assert cache._disk_size == size == 35
+
+
+def test_asset_change_invalidates_entries(monkeypatch):
+    from kaldra.kernel.safeguard.src import cache as cache_module
+    from kaldra.kernel.safeguard.src.settings import get_settings
+
+    key = cache_module.make_cache_key("Texto.", "pt-BR", get_settings(), "v1")
+    monkeypatch.setattr(cache_module._ASSETS_DIGEST, "get", lambda: "outros-assets")
+    assert cache_module.make_cache_key("Texto.", "pt-BR", get_settings(), "v1") != key
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+# Generous budget: the point is that importing does no model/data loading,
+# which used to cost several hundred milliseconds (sklearn + joblib + JSONs).
+IMPORT_BUDGET_SECONDS = 2.0
+
+
+def _run_fresh_interpreter(code: str) -> str:
+    """Runs `code` in a new interpreter, so nothing is already imported."""
+    completed = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        cwd=str(PROJECT_ROOT_PARENT),
+        timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr
+    return completed.stdout.strip()
+
+
+def test_pipeline_import_does_not_load_assets():
+    output = _run_fresh_interpreter(
+        f"""
+        import sys, time
+        sys.path.insert(0, {str(PROJECT_ROOT_PARENT)!r})
+        start = time.perf_counter()
+        from kaldra.kernel.safeguard.src import pipeline
+        elapsed = time.perf_counter() - start
+        from kaldra.kernel.core.src.assets import loaded_assets
+        print(elapsed, "sklearn" in sys.modules, len(loaded_assets()))
+        """
+    )
+    elapsed, sklearn_imported, loaded = output.split()
+
+    assert sklearn_imported == "False"
+    assert loaded == "0"
+    assert float(elapsed) < IMPORT_BUDGET_SECONDS
+
+
+def test_warmup_loads_pipeline_assets():
+    from kaldra.kernel.safeguard.src.pipeline import PIPELINE_ASSETS, warmup
+    from kaldra.kernel.core.src.assets import loaded_assets
+
+    report = warmup()
+
+    assert set(PIPELINE_ASSETS) <= set(loaded_assets())
+    assert set(PIPELINE_ASSETS) <= set(report["timings"])
+    assert report["model_version"]
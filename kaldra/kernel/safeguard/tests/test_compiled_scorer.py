@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src.compiled_scorer import (
+    CompiledScorer,
+    compile_joblib_model,
+    export_compiled_scorer,
+)
+
+sklearn = pytest.importorskip("sklearn")
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.linear_model import LogisticRegression
+
+MODEL_V04_PATH = Path(__file__).resolve().parents[1] / "data" / "model_v04.joblib"
+
+
+def _training_data(n_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.dirichlet(np.ones(12), size=n_rows)
+    y = (X[:, 0] + 0.1 * rng.standard_normal(n_rows) < 1 / 12).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize("ensemble", [True, False])
+def test_compiled_scorer_matches_sklearn(tmp_path, ensemble):
+    X, y = _training_data()
+    model = CalibratedClassifierCV(
+        LogisticRegression(max_iter=500), method="sigmoid", cv=3, ensemble=ensemble
+    ).fit(X, y)
+
+    scorer = CompiledScorer.load(export_compiled_scorer(model, tmp_path / "model.npz"))
+    X_new, _ = _training_data(n_rows=1000, seed=1)
+
+    np.testing.assert_allclose(
+        scorer.predict_proba(X_new), model.predict_proba(X_new), rtol=1e-10, atol=1e-12
+    )
+
+
+def test_positive_class_follows_the_stored_labels(tmp_path):
+    X, y = _training_data()
+    # "biased" sorts first, so it is classes_[0]
+    labels = np.where(y == 1, "biased", "neutral")
+    model = CalibratedClassifierCV(LogisticRegression(max_iter=500), method="sigmoid", cv=3).fit(X, labels)
+
+    scorer = CompiledScorer.load(export_compiled_scorer(model, tmp_path / "model.npz"))
+    X_new, _ = _training_data(n_rows=200, seed=1)
+
+    np.testing.assert_allclose(
+        scorer.predict_proba_positive(X_new), model.predict_proba(X_new)[:, 0], rtol=1e-10, atol=1e-12
+    )
+    with pytest.raises(ValueError):
+        export_compiled_scorer(
+            CalibratedClassifierCV(LogisticRegression(), method="sigmoid", cv=3).fit(X, np.where(y, "a", "b")),
+            tmp_path / "unknown.npz",
+        )
+    assert not (tmp_path / "unknown.npz").exists()
+
+
+def test_isotonic_calibration_is_rejected(tmp_path):
+    X, y = _training_data()
+    model = CalibratedClassifierCV(LogisticRegression(max_iter=500), method="isotonic", cv=3).fit(X, y)
+
+    with pytest.raises(ValueError):
+        export_compiled_scorer(model, tmp_path / "model.npz")
+
+
+def test_compiled_scorer_matches_shipped_model_v04(tmp_path):
+    joblib = pytest.importorskip("joblib")
+    try:
+        model = joblib.load(MODEL_V04_PATH)
+    except Exception:
+        pytest.skip("model_v04.joblib is not available in this checkout")
+
+    scorer = CompiledScorer.load(compile_joblib_model(MODEL_V04_PATH, tmp_path / "model_v04.npz"))
+    X, _ = _training_data(n_rows=500, seed=2)
+
+    np.testing.assert_allclose(
+        scorer.predict_proba(X), model.predict_proba(X), rtol=1e-10, atol=1e-12
+    )
@@ -0,0 +1,58 @@
+import importlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.core.src import delta144_dynamic as d144
+from kaldra.kernel.core.src.tracy_widom import coupling_matrices
+
+
+def test_field_is_a_symmetric_float32_tensor():
+    delta12 = np.random.default_rng(0).dirichlet(np.ones(12), size=32)
+    field = d144.coupling_field(delta12)
+
+    assert field.shape == (32, 12, 12) and field.dtype == np.float32
+    np.testing.assert_array_equal(field, field.transpose(0, 2, 1))
+    np.testing.assert_allclose(field, coupling_matrices(delta12), rtol=1e-5, atol=1e-6)
+    assert not d144.coupling_field(np.full((1, 12), 1 / 12)).any()
+
+
+@pytest.mark.parametrize("k", [1, 8, 78])
+def test_topk_keeps_the_strongest_cells(k):
+    delta12 = np.random.default_rng(1).dirichlet(np.full(12, 0.3), size=50)
+    dense = d144.coupling_field(delta12)
+    sparse = d144.delta144_topk(delta12, k)
+
+    assert sparse.values.shape == (50, k) and sparse.values.dtype == np.float32
+    assert np.all(sparse.rows <= sparse.cols)
+    np.testing.assert_allclose(sparse.values, dense[np.arange(50)[:, None], sparse.rows, sparse.cols], rtol=1e-6)
+    strength = np.abs(sparse.values)
+    assert np.all(np.diff(strength, axis=1) <= 0)
+
+    # Nothing left out of the upper triangle is stronger than the weakest kept cell
+    rows, cols = np.triu_indices(12)
+    upper = np.abs(dense[:, rows, cols])
+    assert np.all(np.sort(upper, axis=1)[:, -k] <= strength[:, -1] + 1e-6)
+    if k == 78:
+        np.testing.assert_allclose(sparse.to_dense(), dense, rtol=1e-6)
+
+
+def test_topk_rejects_invalid_k():
+    with pytest.raises(ValueError):
+        d144.delta144_topk(np.full((1, 12), 1 / 12), k=0)
+
+
+@pytest.mark.parametrize("kernel", ["alpha", "geo", "product", "safeguard"])
+def test_kernel_adapters_share_the_core_operator(kernel):
+    adapter = importlib.import_module(f"kaldra.kernel.{kernel}.src.delta144_dynamic")
+    delta12 = np.random.default_rng(2).dirichlet(np.ones(12), size=4)
+
+    couplings = adapter.delta144_couplings(delta12)
+    assert couplings.k == adapter.TOP_K
+    np.testing.assert_array_equal(couplings.cells, d144.delta144_topk(delta12, adapter.TOP_K).cells)
@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.eval import eval_kaldra_bias as ev
+from kaldra.kernel.safeguard.src.pipeline import analyze_batch
+from kaldra.kernel.safeguard.src.feature_store import FeatureStore
+
+
+def _naive_point(y, confidence, scores, tau, threshold):
+    conclusive = confidence >= tau
+    pred = scores[conclusive] >= threshold
+    truth = y[conclusive]
+    tp, fp = np.sum(pred & truth), np.sum(pred & ~truth)
+    fn, tn = np.sum(~pred & truth), np.sum(~pred & ~truth)
+    denominator = np.sqrt(float((tp + fp) * (tp + fn) * (tn + fp) * (tn + fn)))
+    return {
+        "accuracy": (tp + tn) / conclusive.sum() if conclusive.any() else 0.0,
+        "precision": tp / (tp + fp) if tp + fp else 0.0,
+        "recall": tp / (tp + fn) if tp + fn else 0.0,
+        "coverage": conclusive.mean(),
+        "mcc": (tp * tn - fp * fn) / denominator if denominator else 0.0,
+    }
+
+
+def test_sweep_matches_per_point_computation():
+    rng = np.random.default_rng(1)
+    y = rng.random(300) < 0.4
+    confidence, scores = rng.random(300), np.clip(y * 0.3 + rng.random(300) * 0.7, 0, 1)
+    taus, thresholds = ev.parse_range("0:0.9:0.1"), ev.parse_range("0.2,0.5,0.8")
+
+    grid = ev.sweep(y, confidence, scores, taus, thresholds)
+
+    for t, tau in enumerate(taus):
+        for d, threshold in enumerate(thresholds):
+            expected = _naive_point(y, confidence, scores, tau, threshold)
+            for name in ev.METRICS:
+                assert np.isclose(grid[name][t, d], expected[name])
+
+
+def test_bootstrap_intervals_bracket_the_estimate():
+    rng = np.random.default_rng(2)
+    y = rng.random(200) < 0.5
+    confidence, scores = rng.random(200), np.where(y, 0.7, 0.3) + rng.normal(0, 0.2, 200)
+    taus, thresholds = [0.0, 0.3], [0.4, 0.5]
+
+    grid = ev.sweep(y, confidence, scores, taus, thresholds)
+    intervals = ev.bootstrap_sweep(y, confidence, scores, taus, thresholds, n_resamples=300, block_size=64)
+
+    for name in ev.METRICS:
+        assert intervals[name]["low"].shape == (2, 2)
+        assert np.all(intervals[name]["low"] <= grid[name] + 1e-9)
+        assert np.all(grid[name] <= intervals[name]["high"] + 1e-9)
+
+
+def test_evaluation_keeps_duplicated_texts_aligned(tmp_path, monkeypatch):
+    monkeypatch.setattr(ev, "get_feature_store", lambda: FeatureStore(tmp_path / "features"))
+    texts = ["Mulheres são muito emotivas.", "O relatório saiu hoje."] * 3
+    gold = tmp_path / "gold.csv"
+    preds = tmp_path / "preds.csv"
+    pd.DataFrame({"text": texts, "label": ["biased", "neutral"] * 3}).to_csv(gold, index=False)
+
+    grid = ev.run_evaluation(gold, preds, taus=np.array([0.4]), thresholds=np.array([0.5]), n_resamples=0)
+    predictions = pd.read_csv(preds)
+
+    assert len(grid) == 1
+    assert len(predictions) == len(texts)
+    assert predictions["pred_label"].tolist() == [r["label"] for r in analyze_batch(texts)]
+    assert (tmp_path / "features" / "gold" / "manifest.json").exists()
+
+
+def test_empty_texts_are_unknown_and_never_conclusive(tmp_path, monkeypatch):
+    monkeypatch.setattr(ev, "get_feature_store", lambda: FeatureStore(tmp_path / "features"))
+    texts = ["Mulheres são muito emotivas.", "", "O relatório saiu hoje.", "   "]
+    gold = tmp_path / "gold.csv"
+    preds = tmp_path / "preds.csv"
+    pd.DataFrame({"text": texts, "label": ["biased", "biased", "neutral", "neutral"]}).to_csv(gold, index=False)
+
+    grid = ev.run_evaluation(gold, preds, taus=np.array([0.0]), thresholds=np.array([0.5]), n_resamples=0)
+    predictions = pd.read_csv(preds)
+
+    assert predictions["pred_label"].tolist() == [r["label"] for r in analyze_batch(texts)]
+    assert predictions["pred_label"].tolist()[1::2] == ["unknown", "unknown"]
+    # Even at tau=0 only the two non-empty texts are conclusive
+    assert grid.loc[grid["tau"] == 0.0, "coverage"].tolist() == [0.5]
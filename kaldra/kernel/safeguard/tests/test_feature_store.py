@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src import feature_store
+from kaldra.kernel.safeguard.src.feature_store import FeatureStore
+from kaldra.kernel.core.src.embeddings import get_embeddings
+from kaldra.kernel.core.src.delta12 import project_to_delta12_batch
+
+TEXTS = [f"Texto rotulado número {i}." for i in range(10)]
+
+
+def test_materialize_matches_pipeline_features_and_is_memory_mapped(tmp_path):
+    features = FeatureStore(tmp_path).materialize(TEXTS, name="gold")
+
+    assert len(features) == len(TEXTS)
+    assert isinstance(features.embeddings, np.memmap)
+    assert not features.delta12.flags.writeable
+    np.testing.assert_array_equal(features.embeddings, get_embeddings(TEXTS))
+    np.testing.assert_allclose(features.delta12, project_to_delta12_batch(get_embeddings(TEXTS)))
+
+
+def test_appended_rows_are_the_only_ones_computed(tmp_path, monkeypatch):
+    store = FeatureStore(tmp_path)
+    first = store.materialize(TEXTS[:6], name="gold")
+
+    computed = []
+    original = feature_store.get_embeddings
+    monkeypatch.setattr(feature_store, "get_embeddings", lambda texts: computed.append(len(texts)) or original(texts))
+    monkeypatch.setattr(feature_store, "COMPUTE_BLOCK_SIZE", 3)
+    grown = store.materialize(TEXTS, name="gold")
+
+    assert computed == [3, 1]
+    np.testing.assert_array_equal(grown.embeddings, get_embeddings(TEXTS))
+    assert grown.content_hash != first.content_hash
+
+    computed.clear()
+    assert store.materialize(TEXTS, name="gold").content_hash == grown.content_hash
+    assert computed == []
+
+
+def test_changed_rows_rebuild_the_feature_set(tmp_path):
+    store = FeatureStore(tmp_path)
+    store.materialize(TEXTS, name="gold")
+    edited = ["Outro texto."] + TEXTS[1:5]
+
+    features = store.materialize(edited, name="gold")
+
+    np.testing.assert_array_equal(features.embeddings, get_embeddings(edited))
+    assert len(store.load("gold")) == len(edited)
@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src import pipeline
+from kaldra.kernel.safeguard.src.cache import ResultCache, cached_analyze_text
+from kaldra.kernel.safeguard.src.pipeline import analyze_text, analyze_batch
+
+
+def test_selected_fields_match_full_result():
+    text = "Esse grupo sempre destrói tudo o que toca."
+    full = analyze_text(text)
+    selected = analyze_text(text, fields=["label", "bias_score", "explanation_layers"])
+
+    assert set(selected) == {"label", "bias_score", "explanation_layers"}
+    assert selected == {key: full[key] for key in selected}
+
+
+def test_unrequested_stages_are_skipped(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("stage should have been skipped")
+
+    monkeypatch.setattr(pipeline, "compute_bias_scores", fail)
+    monkeypatch.setattr(pipeline, "map_to_delta144", fail)
+
+    result = analyze_text("Texto só com o arquétipo.", fields=["dominant_archetype", "confidence"])
+    results = analyze_batch(["Primeiro texto.", ""], fields=["dominant_archetype"])
+
+    assert set(result) == {"dominant_archetype", "confidence"}
+    assert [set(item) for item in results] == [{"dominant_archetype", "input_index"}] * 2
+
+
+def test_cache_key_includes_fields():
+    cache = ResultCache(max_entries=10)
+    partial = cached_analyze_text("Texto com seleção.", cache=cache, fields=["label"])
+    full = cached_analyze_text("Texto com seleção.", cache=cache)
+
+    assert set(partial) == {"label"}
+    assert len(full) > 1
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError):
+        analyze_text("Texto qualquer.", fields=["label", "nao_existe"])
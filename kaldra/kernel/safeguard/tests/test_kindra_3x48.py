@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.core.src.kindra_3x48 import KindraIndex, apply_kindra_batch, apply_kindra_locales
+from kaldra.kernel.safeguard.src.pipeline import analyze_batch, analyze_text
+
+LOCALES_MAP = {
+    "pt-BR": {"culture": "latam_sul", "plan": 6},
+    "en": {"culture": "anglo", "plan": 3},
+    "es": {"culture": "latam_norte", "plan": 9},
+}
+
+
+def test_index_modulates_each_row_with_its_plan():
+    weights = {"plan_3": [], "plan_6": [2.0] + [1.0] * 11, "plan_9": [1.0] * 11 + [3.0]}
+    index = KindraIndex(LOCALES_MAP, weights)
+    delta12 = np.random.default_rng(0).dirichlet(np.ones(12), size=5)
+    locales = ["pt-BR", "en", "es", "fr", "pt-BR"]
+
+    rows = index.rows_for(locales)
+    modulated = index.modulate(delta12, rows)
+
+    np.testing.assert_array_equal(index.plans[rows], [6, 3, 9, 3, 6])
+    np.testing.assert_allclose(modulated.sum(axis=1), 1.0)
+    expected = delta12[0] * np.asarray(weights["plan_6"])
+    np.testing.assert_allclose(modulated[0], expected / expected.sum())
+    np.testing.assert_allclose(modulated[1], delta12[1])
+    assert not index.neutral
+
+
+def test_per_item_locales_match_single_locale_batches():
+    delta12 = np.random.default_rng(1).dirichlet(np.ones(12), size=4)
+    locales = ["pt-BR", "en", "es", "pt-BR"]
+
+    modulated, plans = apply_kindra_locales(delta12, locales)
+    for row, locale in enumerate(locales):
+        single, plan = apply_kindra_batch(delta12[row:row + 1], locale)
+        np.testing.assert_array_equal(modulated[row], single[0])
+        assert plans[row] == plan
+
+    with pytest.raises(ValueError):
+        apply_kindra_locales(delta12, locales[:2])
+
+
+def test_analyze_batch_accepts_one_locale_per_text():
+    texts = ["Texto em português.", "", "An English text.", "Un texto en español."]
+    locales = ["pt-BR", "en", "en", "es"]
+
+    results = analyze_batch(texts, locale=locales)
+
+    for text, locale, result in zip(texts, locales, results):
+        if text:
+            single = analyze_text(text, locale=locale)
+            assert result["plan"] == single["plan"]
+            assert result["bias_score"] == single["bias_score"]
+    assert [res["plan"] for res in results] == [6, 3, 3, 9]
+
+    with pytest.raises(ValueError):
+        analyze_batch(texts, locale=locales[:3])
@@ -0,0 +1,135 @@
+import importlib
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.core.src import kindra_drift as kd
+from kaldra.kernel.safeguard.src import kindra_drift as safeguard_drift
+from kaldra.kernel.safeguard.src.cache import ResultCache, cached_analyze_batch, cached_analyze_text
+from kaldra.kernel.safeguard.src.longdoc import analyze_document
+from kaldra.kernel.safeguard.src.pipeline import analyze_batch, analyze_batch_columnar
+from kaldra.kernel.safeguard.src.settings import get_settings
+
+
+def _batch(n_rows, concentration, seed):
+    rng = np.random.default_rng(seed)
+    delta12 = rng.dirichlet(concentration, size=n_rows)
+    labels = np.where(rng.random(n_rows) < 0.2, "inconclusive", "neutral")
+    return delta12, labels
+
+
+def test_merged_batches_match_the_full_statistics():
+    delta12, labels = _batch(300, np.ones(12), 0)
+    locales = np.where(np.arange(300) % 3 == 0, "en", "pt-BR")
+    plans = np.where(locales == "en", 3, 6)
+
+    summary = kd.merge_summaries(
+        kd.summarize_batch(delta12[start:start + 70], labels[start:start + 70],
+                           locales[start:start + 70], plans[start:start + 70])
+        for start in range(0, 300, 70)
+    )
+
+    english = locales == "en"
+    stats = summary[("locale", "en")]
+    assert stats.count == english.sum()
+    np.testing.assert_allclose(stats.mean, delta12[english].mean(axis=0))
+    np.testing.assert_allclose(stats.covariance, np.cov(delta12[english], rowvar=False))
+    np.testing.assert_array_equal(stats.archetype_counts, np.bincount(delta12[english].argmax(1), minlength=12))
+    assert stats.inconclusive_rate == pytest.approx(np.mean(labels[english] == "inconclusive"))
+    assert summary[("plan", "6")].count == (~english).sum()
+
+
+def test_windows_report_drift_against_the_reference(tmp_path):
+    reference_rows, reference_labels = _batch(2000, np.ones(12), 1)
+    monitor = kd.DriftMonitor(window_size=500)
+    monitor.observe(reference_rows, reference_labels, "pt-BR", 6)
+    path = monitor.snapshot().save(tmp_path / "reference.json")
+
+    reports = []
+    monitor = kd.DriftMonitor(window_size=500, reference=kd.DriftReference.load(path))
+    monitor.add_callback(reports.append)
+
+    stable, stable_labels = _batch(500, np.ones(12), 2)
+    monitor.observe(stable, stable_labels, "pt-BR", 6)
+    shifted_concentration = np.ones(12)
+    shifted_concentration[4] = 8.0
+    shifted, shifted_labels = _batch(500, shifted_concentration, 3)
+    monitor.observe(shifted, shifted_labels, "pt-BR", 6)
+
+    locale_reports = [report for report in reports if report.key == ("locale", "pt-BR")]
+    assert [report.drifted for report in locale_reports] == [False, True]
+    assert locale_reports[0].psi < 0.05 < locale_reports[1].psi
+    assert monitor.describe()["drifted"] == ["locale:pt-BR", "plan:6"]
+
+
+def test_pipeline_feeds_the_global_monitor(monkeypatch):
+    settings = replace(get_settings(), drift_window_size=2)
+    monitor = kd.DriftMonitor(window_size=2)
+    monkeypatch.setattr(safeguard_drift, "_MONITOR", monitor)
+
+    analyze_batch(["Um texto.", "", "Another text.", "Otro texto."],
+                  locale=["pt-BR", "en", "en", "es"], settings=settings)
+
+    keys = monitor.describe()["keys"]
+    assert keys["locale:pt-BR"]["count"] == 1
+    assert keys["locale:en"]["count"] == 1
+    assert keys["plan:9"]["count"] == 1
+
+
+def test_cache_hits_and_long_documents_feed_the_monitor(monkeypatch):
+    monitor = kd.DriftMonitor(window_size=100)
+    monkeypatch.setattr(safeguard_drift, "_MONITOR", monitor)
+    cache = ResultCache()
+    texts = ["Um texto.", "Outro texto.", "Um texto.", ""]
+
+    cached_analyze_batch(texts, cache=cache)
+    cached_analyze_batch(texts, cache=cache)
+    assert "_summary" not in cached_analyze_text("Um texto.", cache=cache)
+    first = monitor.describe()["keys"]["locale:pt-BR"]
+    analyze_document("Um documento longo. " * 200, locale="en", window_chars=500, early_stop=False)
+
+    keys = monitor.describe()["keys"]
+    # 3 non-empty texts per batch (the repeated one included), plus one hit
+    assert first["count"] == 7
+    assert keys["locale:en"]["count"] == 1
+
+
+def test_batch_results_keep_delta12_rows_only_on_request():
+    texts = ["Um texto.", "", "Outro texto."]
+    assert analyze_batch_columnar(texts).delta12 is None
+
+    rows = analyze_batch_columnar(texts, keep_delta12=True).delta12
+    assert rows.shape == (3, 12) and rows.dtype == np.float32
+    assert not rows[1].any()
+
+
+def test_failing_callbacks_are_logged(monkeypatch):
+    logged = []
+
+    class _Logger:
+        def exception(self, message, *args):
+            logged.append(message.format(*args))
+
+    monkeypatch.setattr(kd, "get_logger", _Logger)
+    monitor = kd.DriftMonitor(window_size=1)
+    monitor.add_callback(lambda report: 1 / 0)
+    delta12, labels = _batch(4, np.ones(12), seed=0)
+
+    monitor.observe(delta12, labels, "pt-BR", 3)
+    assert logged == ["Drift callback failed for locale:pt-BR", "Drift callback failed for plan:3"]
+
+
+@pytest.mark.parametrize("module", ["alpha.src.kindra_drift", "geo.src.kindra_geo_drift", "product.src.kindra_product_drift"])
+def test_kernel_adapters_build_core_monitors(module):
+    adapter = importlib.import_module(f"kaldra.kernel.{module}")
+    monitor = adapter.new_drift_monitor()
+
+    assert isinstance(monitor, kd.DriftMonitor)
+    assert monitor.window_size == adapter.WINDOW_SIZE
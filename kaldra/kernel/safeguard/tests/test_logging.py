@@ -0,0 +1,78 @@
+import io
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.core.src.logging_config import (
+    configure_logging, dropped_log_count, flush_logs, get_logger, is_enabled, should_log,
+)
+from kaldra.kernel.safeguard.src.pipeline import analyze_batch
+
+
+@pytest.fixture
+def restore_logging():
+    yield
+    configure_logging()
+
+
+def test_json_lines_are_written_by_the_background_sink(restore_logging):
+    stream = io.StringIO()
+    configure_logging(fmt="json", enqueue=True, sink=stream)
+
+    get_logger().info("Evento {}", 1, extra={"event": "teste", "label": "neutral"})
+    flush_logs()
+
+    record = json.loads(stream.getvalue().splitlines()[0])
+    assert record["message"] == "Evento 1"
+    assert record["event"] == "teste"
+    assert record["label"] == "neutral"
+    assert record["level"] == "INFO"
+
+
+def test_full_queue_drops_and_counts_messages(restore_logging):
+    release = threading.Event()
+
+    class SlowStream(io.StringIO):
+        def write(self, data):
+            release.wait(5.0)
+            return super().write(data)
+
+    stream = SlowStream()
+    configure_logging(fmt="json", enqueue=True, sink=stream, queue_size=2)
+    for i in range(20):
+        get_logger().info("Evento {}", i)
+
+    dropped = dropped_log_count()
+    release.set()
+    flush_logs()
+
+    assert dropped > 0
+    assert len(stream.getvalue().splitlines()) + dropped == 20
+
+
+def test_level_and_sampling_checks(restore_logging):
+    configure_logging(level="WARNING", sink=io.StringIO())
+    assert not is_enabled("INFO")
+    assert is_enabled("ERROR")
+
+    configure_logging(level="INFO", sink=io.StringIO(), sample_rates={"ruidoso": 0.0})
+    assert not should_log("ruidoso")
+    assert should_log("outro_evento")
+
+
+def test_batch_item_lines_follow_sampling(restore_logging):
+    stream = io.StringIO()
+    configure_logging(fmt="json", enqueue=False, sink=stream, sample_rates={"analyze_batch_item": 0.0})
+
+    analyze_batch(["Um texto.", "Outro texto."])
+
+    messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+    assert not any("Analisando item" in message for message in messages)
+    assert any("Concluído" in message for message in messages)
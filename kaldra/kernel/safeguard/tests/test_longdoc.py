@@ -0,0 +1,61 @@
+import io
+import sys
+from pathlib import Path
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src.longdoc import LongDocumentAnalyzer, analyze_document
+
+SENTENCES = [
+    "A empresa reportou crescimento de receita no trimestre.",
+    "Os riscos regulatórios aumentaram em mercados emergentes.",
+    "A diretoria reafirmou o compromisso com a transparência.",
+    "Analistas questionaram a sustentabilidade das margens.",
+]
+DOCUMENT = " ".join(SENTENCES[i % len(SENTENCES)] + f" Parágrafo {i}." for i in range(3000))
+
+
+def test_document_result_contract_and_window_coverage():
+    result = analyze_document(DOCUMENT, window_chars=2000, overlap_chars=100, early_stop=False)
+
+    assert result["label"] in ("biased", "neutral", "inconclusive")
+    assert result["model_version"]
+    document = result["document"]
+    assert document["stopped_early"] is False
+    assert document["windows_analyzed"] >= len(DOCUMENT) // 2000
+    assert document["characters_analyzed"] >= len(DOCUMENT)
+
+
+def test_chunked_bytes_match_whole_string():
+    options = dict(window_chars=1500, overlap_chars=0, early_stop=False, include_windows=True)
+    whole = analyze_document(DOCUMENT, **options)
+
+    # Blocos pequenos e ímpares cortam caracteres UTF-8 multibyte ao meio
+    data = DOCUMENT.encode("utf-8")
+    chunks = (data[i:i + 777] for i in range(0, len(data), 777))
+    chunked = analyze_document(chunks, **options)
+
+    assert chunked["document"] == whole["document"]
+    assert [w["start"] for w in chunked["windows"]] == [w["start"] for w in whole["windows"]]
+    assert chunked["confidence"] == whole["confidence"]
+
+
+def test_early_stop_reads_only_part_of_the_document():
+    result = analyze_document(
+        io.StringIO(DOCUMENT), window_chars=1000, overlap_chars=0,
+        stability_tolerance=0.05, patience=3,
+    )
+
+    assert result["document"]["stopped_early"] is True
+    assert result["document"]["characters_analyzed"] < len(DOCUMENT)
+
+
+def test_empty_document_returns_safe_result():
+    analyzer = LongDocumentAnalyzer()
+    analyzer.feed("   ")
+    result = analyzer.finish()
+
+    assert result["label"] == "unknown"
+    assert result["document"]["windows_analyzed"] == 0
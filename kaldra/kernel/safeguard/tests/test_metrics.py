@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src import metrics
+from kaldra.kernel.safeguard.src.metrics import Histogram, render_metrics
+from kaldra.kernel.safeguard.src.pipeline import analyze_text, analyze_batch
+from kaldra.kernel.safeguard.src.settings import BiasSettings
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("test_seconds", "Test histogram.", ("stage",), (0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        hist.observe(value, "embedding")
+
+    lines = hist.render()
+    assert 'test_seconds_bucket{stage="embedding",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="embedding",le="1"} 3' in lines
+    assert 'test_seconds_bucket{stage="embedding",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{stage="embedding"} 4' in lines
+
+
+def test_pipeline_records_every_stage():
+    metrics.REGISTRY.clear()
+    result = analyze_text("Texto para medir cada estágio.", locale="pt-BR")
+    analyze_batch(["Primeiro texto.", "", "Terceiro texto."], locale="pt-BR")
+
+    for stage in metrics.PIPELINE_STAGES[:4] + ("delta144", "explanation", "total"):
+        assert metrics.STAGE_SECONDS.count("safeguard", stage, "pt-BR", result["label"]) == 1
+        assert metrics.STAGE_SECONDS.count("safeguard", stage, "pt-BR", "batch") == 1
+    assert metrics.ANALYSES.value("safeguard", "pt-BR", "unknown") == 1
+    assert metrics.BATCH_SIZE.count("safeguard") == 1
+    assert "kaldra_stage_duration_seconds_bucket" in render_metrics()
+
+
+def test_unsampled_calls_still_count_labels():
+    metrics.REGISTRY.clear()
+    settings = BiasSettings(metrics_sample_rate=0.0)
+    result = analyze_text("Texto fora da amostra.", settings=settings)
+
+    assert metrics.STAGE_SECONDS.count("safeguard", "total", "pt-BR", result["label"]) == 0
+    assert metrics.ANALYSES.value("safeguard", "pt-BR", result["label"]) == 1
+
+
+def test_counter_metadata_uses_the_sample_family_name():
+    counter = metrics.Counter("test_events", "Test events.", ("kind",))
+    counter.inc("a")
+    lines = counter.render()
+
+    assert lines[:2] == ["# HELP test_events_total Test events.", "# TYPE test_events_total counter"]
+    assert 'test_events_total{kind="a"} 1' in lines
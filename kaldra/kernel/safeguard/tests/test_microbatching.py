@@ -0,0 +1,39 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.api import batching
+from kaldra.kernel.safeguard.api.batching import MicroBatcher
+from kaldra.kernel.safeguard.src.pipeline import analyze_text
+
+
+def test_concurrent_submissions_are_batched(monkeypatch):
+    batch_sizes = []
+    original = batching.cached_analyze_batch
+
+    def spy(texts, **kwargs):
+        batch_sizes.append(len(texts))
+        return original(texts, **kwargs)
+
+    monkeypatch.setattr(batching, "cached_analyze_batch", spy)
+    texts = [f"Texto concorrente número {i}." for i in range(40)]
+
+    async def run():
+        batcher = MicroBatcher(window_ms=20.0, max_batch_size=16)
+        try:
+            return await asyncio.gather(*[batcher.submit(text) for text in texts])
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert sum(batch_sizes) == len(texts)
+    assert len(batch_sizes) < len(texts)
+    assert max(batch_sizes) <= 16
+    for text, result in zip(texts, results):
+        assert "input_index" not in result
+        assert result == analyze_text(text)
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src.compiled_scorer import FORMAT_VERSION
+from kaldra.kernel.safeguard.src.model_registry import (
+    HEURISTIC_VERSION, ModelRegistry, discover_artifacts, parse_artifact_name,
+)
+from kaldra.kernel.safeguard.src.pipeline import analyze_batch
+
+
+def _write_compiled(path: Path, bias: float, digest: str) -> None:
+    """Minimal compiled-scorer artifact: one fold, constant-ish output."""
+    np.savez(
+        path,
+        format_version=np.array(FORMAT_VERSION),
+        coef=np.zeros((1, 12)),
+        intercept=np.array([bias]),
+        sigmoid_a=np.array([-1.0]),
+        sigmoid_b=np.array([0.0]),
+        classes=np.array([0, 1]),
+        source_digest=np.array(digest),
+    )
+
+
+def test_discovery_prefers_newest_version_and_compiled_export(tmp_path):
+    for name in ("model_v02.joblib", "model_v04.joblib", "model_v04.npz", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+
+    names = [a.path.name for a in discover_artifacts(tmp_path)]
+    assert names == ["model_v04.npz", "model_v04.joblib", "model_v02.joblib"]
+
+
+def test_legacy_names_are_only_read_as_zero_minor_versions():
+    assert parse_artifact_name("model_v04.joblib").version == (0, 4)
+    assert parse_artifact_name("model_v012.npz").version == (0, 12)
+    assert parse_artifact_name("model_v1.10.joblib").version == (1, 10)
+    assert parse_artifact_name("model_v10.joblib") is None
+
+
+def test_hot_swap_keeps_snapshot_for_inflight_batches(tmp_path):
+    _write_compiled(tmp_path / "model_v04.npz", bias=-5.0, digest="old")
+    registry = ModelRegistry(tmp_path)
+    old = registry.current()
+    assert old.version == "v0.4:old"
+
+    _write_compiled(tmp_path / "model_v05.npz", bias=5.0, digest="new")
+    assert registry.current() is old  # nothing changes until a refresh
+    registry.refresh_in_background().join()
+    assert registry.current().version == "v0.5:new"
+
+    texts = ["Um texto qualquer para o lote.", ""]
+    assert {r["model_version"] for r in analyze_batch(texts, model=old)} == {"v0.4:old"}
+    assert {r["model_version"] for r in analyze_batch(texts, model=registry.current())} == {"v0.5:new"}
+
+
+def test_refresh_without_changes_keeps_current_handle(tmp_path):
+    _write_compiled(tmp_path / "model_v04.npz", bias=0.0, digest="same")
+    registry = ModelRegistry(tmp_path)
+    handle = registry.current()
+    assert registry.refresh() is handle
+
+
+def test_unloadable_artifact_falls_back_to_heuristic(tmp_path):
+    (tmp_path / "model_v09.npz").write_bytes(b"not a model")
+    registry = ModelRegistry(tmp_path)
+    assert registry.current().version == HEURISTIC_VERSION
+
+
+def test_model_trained_on_other_features_is_rejected(tmp_path):
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+
+    # Trained on raw embeddings, as train.py did before v0.6
+    X = np.random.default_rng(0).normal(size=(40, 384))
+    y = (X[:, 0] > 0).astype(int)
+    joblib.dump(LogisticRegression().fit(X, y), tmp_path / "model_v04.joblib")
+
+    assert ModelRegistry(tmp_path).current().version == HEURISTIC_VERSION
+
+
+def test_stale_compiled_export_is_ignored(tmp_path):
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+
+    X = np.random.default_rng(0).dirichlet(np.ones(12), size=40)
+    y = (X[:, 0] > X[:, 1]).astype(int)
+    joblib.dump(LogisticRegression().fit(X, y), tmp_path / "model_v04.joblib")
+    # Export left over from an earlier build of model_v04.joblib
+    _write_compiled(tmp_path / "model_v04.npz", bias=-5.0, digest="old")
+
+    handle = ModelRegistry(tmp_path).current()
+    assert handle.path.name == "model_v04.joblib"
+    assert not handle.version.endswith(":old")
@@ -0,0 +1,53 @@
+import importlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.core.src import painleve as pl
+from kaldra.kernel.core.src.tracy_widom import tw_cdf, tracy_widom_batch
+
+
+def test_grid_reproduces_the_hastings_mcleod_solution():
+    q, dq, d2q = pl.hastings_mcleod(np.array([0.0, -3.21, 2.5]))
+
+    # Known values at s = 0
+    assert q[0] == pytest.approx(0.36706155154807, abs=1e-9)
+    assert dq[0] == pytest.approx(-0.29537210548, abs=1e-8)
+    np.testing.assert_allclose(d2q, np.array([0.0, -3.21, 2.5]) * q + 2 * q ** 3)
+
+    # F_2(s) = exp(-∫ (x - s) q(x)² dx) agrees with the Tracy–Widom tables
+    x = np.linspace(-2.0, 12.0, 14001)
+    q_x = pl.hastings_mcleod(x)[0]
+    assert np.exp(-np.trapezoid((x + 2.0) * q_x ** 2, x)) == pytest.approx(tw_cdf(-2.0, beta=2), rel=1e-5)
+
+
+def test_evaluation_is_smooth_across_the_grid_ends():
+    grid = pl.get_grid()
+    for edge in (grid.start, grid.stop):
+        q, dq, _ = pl.hastings_mcleod(np.array([edge - 1e-9, edge + 1e-9]))
+        assert q[0] == pytest.approx(q[1], rel=1e-6)
+        assert dq[0] == pytest.approx(dq[1], rel=1e-6)
+
+
+def test_curvature_peaks_just_below_the_edge():
+    s = np.linspace(-30.0, 15.0, 4501)
+    curvature = pl.painleve_curvature(s)
+
+    assert np.all((curvature >= 0) & (curvature <= 1))
+    assert -1.5 < s[np.argmax(curvature)] < 0.0
+    assert curvature[-1] < 1e-6
+
+
+@pytest.mark.parametrize("kernel", ["alpha", "geo", "product", "safeguard"])
+def test_kernel_adapters_share_the_core_engine(kernel):
+    adapter = importlib.import_module(f"kaldra.kernel.{kernel}.src.painleve")
+    delta12 = np.random.default_rng(5).dirichlet(np.ones(12), size=16)
+
+    statistic = tracy_widom_batch(delta12, beta=2).statistic
+    np.testing.assert_allclose(adapter.curvature_signal(delta12), pl.painleve_curvature(statistic))
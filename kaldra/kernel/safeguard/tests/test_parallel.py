@@ -0,0 +1,61 @@
+import os
+import sys
+from pathlib import Path
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src import parallel
+from kaldra.kernel.safeguard.src.pipeline import analyze_batch, analyze_batch_columnar
+from kaldra.kernel.safeguard.src.settings import BiasSettings
+
+SETTINGS = BiasSettings(parallel_min_batch=1)
+TEXTS = [f"Texto paralelo número {i}." if i % 97 else "" for i in range(700)]
+
+
+def test_chunk_size_is_bounded():
+    assert parallel.chunk_size_for(100, 32) == parallel.MIN_CHUNK_SIZE
+    assert parallel.chunk_size_for(10_000_000, 4) == parallel.MAX_CHUNK_SIZE
+    assert parallel.chunk_size_for(64_000, 8) == 2000
+
+
+def test_fork_is_never_the_default_start_method():
+    assert parallel._start_method(SETTINGS) in ("forkserver", "spawn")
+    assert parallel._start_method(BiasSettings(parallel_start_method="fork")) == "fork"
+
+
+def test_parallel_batch_matches_serial_order():
+    serial = analyze_batch(TEXTS, settings=SETTINGS, workers=1)
+    try:
+        parallel_results = analyze_batch(TEXTS, settings=SETTINGS, workers=2)
+    finally:
+        parallel.shutdown_pool()
+
+    assert parallel_results == serial
+
+
+def test_worker_crash_does_not_lose_the_batch(monkeypatch, tmp_path):
+    marker = tmp_path / "crashed"
+    original = parallel._analyze_chunk
+
+    def crash_once(*args):
+        # The first chunk to run kills its worker process; retries succeed
+        if not marker.exists():
+            marker.touch()
+            os._exit(1)
+        return original(*args)
+
+    # Pickled by reference as parallel._analyze_chunk, resolved to the patch
+    crash_once.__module__, crash_once.__qualname__ = original.__module__, original.__qualname__
+    parallel.shutdown_pool()
+    monkeypatch.setattr(parallel, "_analyze_chunk", crash_once)
+    # The patch only reaches the workers through an explicit fork
+    fork_settings = BiasSettings(parallel_min_batch=1, parallel_start_method="fork")
+    try:
+        batch = analyze_batch_columnar(TEXTS, settings=fork_settings, workers=2)
+    finally:
+        parallel.shutdown_pool()
+
+    assert marker.exists()
+    assert batch.to_dicts() == analyze_batch(TEXTS, settings=SETTINGS)
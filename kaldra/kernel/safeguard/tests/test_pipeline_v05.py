@@ -6,7 +6,7 @@ from pathlib import Path
 PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
 sys.path.append(str(PROJECT_ROOT_PARENT))
 
-from kaldra.kernel.bias.src.pipeline import analyze_text, analyze_batch
+from kaldra.kernel.safeguard.src.pipeline import analyze_text, analyze_batch
 
 
 EXPECTED_KEYS = {
@@ -78,3 +78,25 @@ def test_analyze_text_very_long_does_not_crash():
     result = analyze_text(long_text, locale="pt-BR")
     assert_result_structure(result) # is_batch_item is False by default
     assert result["plan"] in (3, 6, 9)
+
+def test_analyze_batch_matches_analyze_text():
+    texts = [
+        "Este é um texto neutro sobre políticas públicas.",
+        "",
+        "Este é um texto com opinião forte e polarizada, atacando um grupo específico.",
+        "   ",
+        "Texto emocional sobre identidade e pertencimento.",
+    ]
+    results = analyze_batch(texts, locale="pt-BR")
+    assert [res["input_index"] for res in results] == list(range(len(texts)))
+
+    for text, batch_result in zip(texts, results):
+        single_result = analyze_text(text, locale="pt-BR")
+        assert batch_result["label"] == single_result["label"]
+        assert batch_result["plan"] == single_result["plan"]
+        assert batch_result["dominant_archetype"] == single_result["dominant_archetype"]
+        assert batch_result["confidence"] == pytest.approx(single_result["confidence"])
+        if single_result["bias_score"] is None:
+            assert batch_result["bias_score"] is None
+        else:
+            assert batch_result["bias_score"] == pytest.approx(single_result["bias_score"])
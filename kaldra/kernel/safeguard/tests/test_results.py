@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src.pipeline import analyze_text, analyze_batch, analyze_batch_columnar
+from kaldra.kernel.safeguard.src.results import AnalysisResult
+
+TEXTS = [
+    "Esse grupo sempre destrói tudo o que toca.",
+    "",
+    "O relatório trimestral foi publicado hoje.",
+    "Pessoas desse bairro não sabem se comportar.",
+]
+
+
+def test_columnar_batch_matches_dict_batch():
+    batch = analyze_batch_columnar(TEXTS)
+
+    assert len(batch) == len(TEXTS)
+    assert batch.to_dicts() == analyze_batch(TEXTS)
+    assert batch.empty_mask.tolist() == [False, True, False, False]
+    assert sum(batch.label_counts().values()) == len(TEXTS)
+
+
+def test_items_are_slotted_and_expand_lazily():
+    batch = analyze_batch_columnar(TEXTS)
+    item = batch[0]
+
+    assert isinstance(item, AnalysisResult)
+    assert not hasattr(item, "__dict__")
+    expected = analyze_text(TEXTS[0])
+    expected["input_index"] = 0
+    assert item.to_dict() == expected
+    assert [result.label for result in batch] == batch.labels.tolist()
+
+
+def test_exports_keep_one_row_per_text():
+    batch = analyze_batch_columnar(TEXTS, fields=["label"])
+    frame = batch.to_pandas()
+
+    assert list(frame["label"]) == batch.labels.tolist()
+    assert frame["dominant_archetype"].iloc[1] == "indefinido"
+    assert np.isnan(frame["bias_score"][~batch.empty_mask]).all()
+    assert batch.to_dicts()[0] == {"label": batch.labels[0], "input_index": 0}
+
+
+def test_arrow_export():
+    pytest.importorskip("pyarrow")
+    table = analyze_batch_columnar(TEXTS).to_arrow()
+
+    assert table.num_rows == len(TEXTS)
+    assert table.column("label").type.value_type == "string"
@@ -0,0 +1,106 @@
+import importlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.core.src import state_machine as sm
+
+SPEC = sm.StateMachineSpec.from_transitions(
+    ("CALM", "TENSE", "CRISIS"),
+    {3: {"TENSE": "CALM", "CRISIS": "TENSE"}, 6: {"CALM": "TENSE"}, 9: {"CALM": "CRISIS", "TENSE": "CRISIS"}},
+    min_dwell={"CRISIS": 2},
+)
+
+
+def _sequential(spec, entity_ids, phases):
+    """Reference implementation: one observation at a time."""
+    state, dwell, out = {}, {}, []
+    for entity_id, phase in zip(entity_ids, phases):
+        current = state.get(entity_id, 0)
+        proposed = spec.transitions[PHASE_ROW[phase], current]
+        if proposed != current and dwell.get(entity_id, 0) >= spec.min_dwell[current]:
+            state[entity_id], dwell[entity_id] = proposed, 0
+        else:
+            state[entity_id], dwell[entity_id] = current, dwell.get(entity_id, 0) + 1
+        out.append(state[entity_id])
+    return out
+
+
+PHASE_ROW = {3: 0, 6: 1, 9: 2}
+
+
+def test_batches_with_repeated_entities_match_sequential_updates():
+    rng = np.random.default_rng(0)
+    machine = sm.StateMachine(SPEC, capacity=4)
+    history_ids, history_phases = [], []
+    for _ in range(5):
+        entity_ids = [f"e{i}" for i in rng.integers(0, 40, size=120)]
+        phases = rng.choice(sm.PHASES, size=120, p=[0.5, 0.3, 0.2])
+        states, _ = machine.step(entity_ids, phases)
+        history_ids += entity_ids
+        history_phases += phases.tolist()
+
+        expected = _sequential(SPEC, history_ids, history_phases)[-120:]
+        np.testing.assert_array_equal(states, expected)
+    assert sum(machine.counts().values()) == len(machine)
+
+
+def test_min_dwell_holds_entities_in_crisis():
+    machine = sm.StateMachine(SPEC)
+    machine.step(["x"], [9])
+    for expected in ("CRISIS", "CRISIS", "TENSE"):
+        machine.step(["x"], [3])
+        assert machine.state_names(["x"]) == [expected]
+    assert machine.state_names(["unknown"]) == [None]
+
+    with pytest.raises(ValueError):
+        machine.step(["x"], [5])
+
+
+def test_snapshot_round_trip(tmp_path):
+    machine = sm.StateMachine(SPEC)
+    entity_ids = [f"ticker-{i}" for i in range(500)]
+    machine.step(entity_ids, np.tile([3, 6, 9, 6], 125))
+    path = machine.save(tmp_path / "states.npz")
+
+    restored = sm.StateMachine.load(path, SPEC)
+    np.testing.assert_array_equal(restored.states_of(entity_ids), machine.states_of(entity_ids))
+    phases = np.full(500, 3)
+    np.testing.assert_array_equal(restored.step(entity_ids, phases)[0], machine.step(entity_ids, phases)[0])
+
+    other = sm.StateMachineSpec.from_transitions(("A", "B"), {})
+    with pytest.raises(ValueError):
+        sm.StateMachine.load(path, other)
+
+
+def test_phases_follow_the_tracy_widom_and_painleve_signals():
+    uniform = np.full((1, 12), 1 / 12)
+    peaked = np.full((1, 12), 0.001)
+    peaked[0, 0] = 1 - 0.011
+    phases = sm.phases_from_delta12(np.vstack([uniform, peaked]))
+
+    assert phases.tolist()[1] == 9
+    assert set(phases.tolist()) <= set(sm.PHASES)
+    np.testing.assert_array_equal(sm.phases_from_signals(np.array([0.5, 0.5, 0.001]), np.array([0.1, 0.99, 0.1])), [3, 6, 9])
+
+
+@pytest.mark.parametrize("module", [
+    "alpha.src.state_machine", "geo.src.geo_state_machine",
+    "product.src.product_state_machine", "safeguard.src.state_machine",
+])
+def test_kernel_specs_run_on_the_core_engine(module):
+    adapter = importlib.import_module(f"kaldra.kernel.{module}")
+    machine = adapter.new_state_machine()
+    delta12 = np.random.default_rng(1).dirichlet(np.ones(12), size=20)
+
+    states, _ = machine.step_delta12([f"id{i % 5}" for i in range(20)], delta12)
+    assert states.shape == (20,)
+    assert machine.spec.states == adapter.STATES
+    assert len(machine) == 5
+    assert sum(machine.counts().values()) == 5
@@ -0,0 +1,46 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.api.streaming import iter_ndjson_lines, stream_batch_results
+
+
+def test_ndjson_stream_keeps_order_and_flags_bad_lines():
+    lines = [json.dumps({"text": f"Texto {i}.", "locale": "en"}) for i in range(7)]
+    lines.insert(3, "{not json")
+    payload = ("\n".join(lines) + "\n").encode("utf-8")
+
+    async def body():
+        # Split the body at arbitrary byte boundaries
+        for start in range(0, len(payload), 13):
+            yield payload[start:start + 13]
+
+    async def run():
+        return [part async for part in stream_batch_results(body(), chunk_size=3)]
+
+    parts = asyncio.run(run())
+    results = [json.loads(line) for part in parts for line in part.decode("utf-8").splitlines()]
+
+    assert len(parts) == 3
+    assert [res["input_index"] for res in results] == list(range(8))
+    assert results[3]["skipped"] is True
+    assert results[3]["reason"] == "invalid_json"
+    assert all(res["plan"] == 3 for i, res in enumerate(results) if i != 3)
+
+
+def test_oversize_lines_are_flagged_even_when_they_arrive_whole():
+    async def body():
+        # A whole oversize line inside one chunk, then one spread over chunks
+        yield b"ok\n" + b"x" * 20 + b"\nfine\n"
+        yield b"y" * 12
+        yield b"y" * 12 + b"\nlast"
+
+    async def run():
+        return [line async for line in iter_ndjson_lines(body(), max_line_bytes=10)]
+
+    assert asyncio.run(run()) == [b"ok", None, b"fine", None, b"last"]
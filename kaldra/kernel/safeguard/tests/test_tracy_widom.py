@@ -0,0 +1,58 @@
+import importlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.core.src import tracy_widom as tw
+
+
+@pytest.mark.parametrize("beta", [1, 2])
+def test_tables_reproduce_the_tracy_widom_moments(beta):
+    s = np.linspace(-11.0, 9.0, 20001)
+    density = np.gradient(tw.tw_cdf(s, beta), s)
+    mean = np.trapezoid(s * density, s)
+    variance = np.trapezoid((s - mean) ** 2 * density, s)
+
+    expected_mean, expected_variance = tw.TW_MOMENTS[beta]
+    assert mean == pytest.approx(expected_mean, abs=1e-4)
+    assert variance == pytest.approx(expected_variance, abs=1e-4)
+
+
+def test_tables_match_the_fredholm_determinant_and_the_tail():
+    for beta in (1, 2):
+        for s in (-2.5, 0.0, 3.3):
+            exact = tw.tw_log_cdf_exact(s, beta)
+            assert tw.tw_cdf(s, beta) == pytest.approx(np.exp(exact), rel=1e-6)
+            assert tw.tw_sf(s, beta) == pytest.approx(-np.expm1(exact), rel=1e-3)
+    tail = tw.tw_sf(np.array([9.0, 11.0, 13.0]), 1)
+    assert np.all(np.diff(tail) < 0) and np.all(tail > 0)
+
+
+def test_batch_matches_per_document_eigenvalues():
+    delta12 = np.random.default_rng(3).dirichlet(np.ones(12), size=64)
+    result = tw.tracy_widom_batch(delta12)
+
+    expected = [np.linalg.eigvalsh(m).max() for m in tw.coupling_matrices(delta12)]
+    np.testing.assert_allclose(result.lambda_max, expected)
+    assert np.all((result.p_value >= 0) & (result.p_value <= 1))
+
+    uniform = np.full((1, 12), 1 / 12)
+    peaked = np.full((1, 12), 0.001)
+    peaked[0, 0] = 1 - 0.011
+    anomaly = tw.tracy_widom_batch(np.vstack([uniform, peaked])).anomaly
+    assert anomaly[0] < 0.01 and anomaly[1] > 1 - 1e-9
+
+
+@pytest.mark.parametrize("kernel", ["alpha", "geo", "product", "safeguard"])
+def test_kernel_adapters_share_the_core_engine(kernel):
+    adapter = importlib.import_module(f"kaldra.kernel.{kernel}.src.tracy_widom")
+    delta12 = np.random.default_rng(4).dirichlet(np.ones(12), size=8)
+
+    np.testing.assert_allclose(adapter.anomaly_signal(delta12), tw.tracy_widom_batch(delta12).anomaly)
+    assert adapter.anomaly_flags(delta12).shape == (8,)
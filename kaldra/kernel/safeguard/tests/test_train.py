@@ -0,0 +1,83 @@
+import json
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root's parent directory to the Python path.
+PROJECT_ROOT_PARENT = Path(__file__).resolve().parents[4]
+sys.path.append(str(PROJECT_ROOT_PARENT))
+
+from kaldra.kernel.safeguard.src import train
+from kaldra.kernel.safeguard.src.feature_store import FeatureStore
+from kaldra.kernel.safeguard.src.model_registry import ModelRegistry
+
+
+def _training_data(n_rows=240, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.dirichlet(np.ones(12), size=n_rows)
+    y = (X[:, 0] + rng.normal(0, 0.03, n_rows) < 1 / 12).astype(int)
+    return X, y
+
+
+def test_search_ranks_every_candidate_and_fits_the_best():
+    X, y = _training_data()
+
+    model, candidates = train.search_calibrated_model(
+        X, y, Cs=[0.1, 1.0, 10.0], class_weights=[None, "balanced"], n_jobs=1
+    )
+
+    assert len(candidates) == 3 * 2 * len(train.CALIBRATION_METHODS)
+    assert [c.log_loss for c in candidates] == sorted(c.log_loss for c in candidates)
+    best = candidates[0]
+    assert model.method == best.method
+    assert model.estimator.C == best.C
+    assert len(model.calibrated_classifiers_) == train.N_FOLDS
+    assert train.evaluate_model(model, X, y)["accuracy"] > 0.8
+
+
+def test_random_search_samples_the_grid():
+    space = train._search_space([0.01, 0.1, 1.0, 10.0], [None, "balanced"], n_iter=3)
+
+    assert sum(len(grid) for grid in space.values()) == 3
+    assert all(grid == sorted(grid) for grid in space.values())
+
+
+def test_incremental_training_rejects_a_too_small_dataset(tmp_path):
+    X, y = _training_data(n_rows=40)
+    texts = [f"texto {i}" for i in range(len(y))]
+    features = replace(FeatureStore(tmp_path / "features").materialize(texts, name="small"), delta12=X)
+
+    with pytest.raises(ValueError, match="at least 100 labelled rows"):
+        train.train_incremental_model(features, y.astype(np.int8), epochs=1)
+
+
+def test_incremental_training_saves_a_versioned_artifact(tmp_path):
+    X, y = _training_data(n_rows=400)
+    texts = [f"texto {i}" for i in range(len(y))]
+    features = FeatureStore(tmp_path / "features").materialize(texts, name="synthetic")
+    # Replace the hashed features with learnable ones of the same layout
+    features = replace(features, delta12=X)
+    labels = y.astype(np.int8)
+    labels[::10] = -1
+
+    model, candidates, metrics = train.train_incremental_model(
+        features, labels, alphas=[1e-4, 1e-3], class_weights=[None], epochs=3, block_size=64
+    )
+    assert len(candidates) == 2
+    assert metrics["accuracy"] > 0.7
+
+    model_dir = tmp_path / "models"
+    model_dir.mkdir()
+    (model_dir / "model_v04.joblib").write_bytes(b"")
+    path = train.save_versioned_artifact(model, {"validation": metrics}, model_dir)
+
+    assert path.name == "model_v0.5.joblib"
+    report = json.loads((model_dir / "model_v0.5.metrics.json").read_text())
+    assert report["version"] == "v0.5"
+    assert report["compiled_artifact"] == "model_v0.5.npz"
+    handle = ModelRegistry(model_dir).current()
+    assert handle.version.startswith("v0.5:")
+    np.testing.assert_allclose(handle.predict_positive(X[:20]), model.predict_proba(X[:20])[:, 1])